@@ -17,12 +17,145 @@ In addition, you should have the following subfolders
 
 Moving any of these folders or files will prevent the game from working properly
 
+The game can also be simulated without a window, for balancing and regression
+runs, and games can be recorded and played again. See headless.py, replay.py
+and the --help option for how.
+
 Author: Walker M. White (wmw2)
 Date:   November 20, 2019
 """
+import os
+import argparse
+import sys
+
+# The game reads its own command line options, so Kivy must not
+os.environ['KIVY_NO_ARGS'] = '1'
+
 from consts import *
 from app import *
+import headless
+import replay
+import rewind
+import autopilot
+import batch
+import sweep
+import farm
+import fuzz
+import stress
+
+
+def parse_args():
+    """
+    Returns the parsed command line arguments
+
+    The positional arguments become the GameConfig of the game (see
+    config_from_args in consts.py).
+    """
+    parser = argparse.ArgumentParser(prog='invaders',
+        description='Alien Invaders')
+    parser.add_argument('rows', nargs='?', type=int,
+        help='the number of rows of aliens (1..10)')
+    parser.add_argument('perrow', nargs='?', type=int,
+        help='the number of aliens in each row (1..15)')
+    parser.add_argument('speed', nargs='?', type=float,
+        help='the number of seconds between alien steps (0..3)')
+    parser.add_argument('--headless', action='store_true',
+        help='simulate the game without a window and print the results')
+    parser.add_argument('--frames', type=int, default=None,
+        help='the largest number of frames to simulate (headless only; '
+        'default %d, or the whole recording with --replay)' % headless.FRAMES)
+    parser.add_argument('--seed', type=int, default=None,
+        help='the seed for the random numbers, to replay the same game')
+    parser.add_argument('--input', default='sweep',
+        help='a built-in input script (%s) or a script file (headless only)'
+        % ', '.join(sorted(headless.SCRIPTS)))
+    parser.add_argument('--dt', type=float, default=TIMESTEP,
+        help='the seconds per simulated frame (headless only)')
+    parser.add_argument('--record', metavar='FILE', default=None,
+        help='record the input of the game to a file')
+    parser.add_argument('--replay', metavar='FILE', default=None,
+        help='play a recorded game again (headless only)')
+    parser.add_argument('--hashes', action='store_true',
+        help='add a state hash for every frame to the recording')
+    parser.add_argument('--verify', metavar='DIRECTORY', default=None,
+        help='play every recording in DIRECTORY again and check the hashes')
+    parser.add_argument('--jobs', type=int, default=None,
+        help='the number of processes for --verify, --sweep, --worker '
+        'and --fuzz (default: one per core)')
+    parser.add_argument('--batch', metavar='N', type=int, default=None,
+        help='play N games at once with the same input and print the totals')
+    parser.add_argument('--sweep', metavar='FILE', default=None,
+        help='play many games for every cell of the --grid and write the '
+        'results to FILE (.csv or .npz)')
+    parser.add_argument('--grid', metavar='NAME=VALUES', type=sweep.axis,
+        action='append', help='values to sweep, such as speed=0.5,1; NAME is '
+        'one of %s (may be repeated)' % ', '.join(sweep.PARAMETERS))
+    parser.add_argument('--games', type=int, default=sweep.GAMES,
+        help='the number of games in each cell of a sweep (default %d)'
+        % sweep.GAMES)
+    parser.add_argument('--serve', metavar='[HOST:]PORT', type=farm.address,
+        default=None, help='hand out the tasks of the --sweep to workers '
+        'that connect to this address (a bare PORT listens on %s only; '
+        'there is no authentication)' % farm.FARM_HOST)
+    parser.add_argument('--worker', metavar='HOST:PORT', type=farm.address,
+        default=None, help='play tasks for the coordinator at this address')
+    parser.add_argument('--autopilot', action='store_true',
+        help='let a bot play game after game for --frames frames and print '
+        'the frame times (headless only)')
+    parser.add_argument('--fuzz', metavar='CASES', type=int, default=None,
+        help='play CASES waves with random settings and input, checking the '
+        'invariants every frame (--frames per case, default %d)'
+        % fuzz.FUZZ_FRAMES)
+    parser.add_argument('--stress', metavar='ALIENS', type=stress.sizes,
+        default=None, help='play waves of ALIENS aliens (such as 500,1000,'
+        '4000; up to %d) and print the time of every phase of a frame '
+        '(--frames per size, default %d)' % (stress.capacity(),
+        stress.STRESS_FRAMES))
+    parser.add_argument('--bolts', type=int, default=stress.STRESS_BOLTS,
+        help='the number of alien bolts on screen at once with --stress '
+        '(default %d)' % stress.STRESS_BOLTS)
+    parser.add_argument('--rewind', metavar='SECONDS', type=float, default=None,
+        help="keep the last SECONDS of play; hold '%s' to rewind (a rewound "
+        "game does not replay from --record)" % REWIND_KEY)
+    return parser.parse_args()
+
 
 # Application code
 if __name__ == '__main__':
-    Invaders(width=GAME_WIDTH,height=GAME_HEIGHT).run()
+    args = parse_args()
+    config = config_from_args(args.rows, args.perrow, args.speed)
+    recorder = None if args.record is None else \
+        replay.Recorder(args.record, hashes=args.hashes)
+    try:
+        if args.worker is not None or \
+        (args.sweep is not None and args.serve is not None):
+            farm.main(args, config)
+        elif args.sweep is not None:
+            sweep.main(args, config)
+        elif args.batch is not None:
+            batch.main(args, config)
+        elif args.stress is not None:
+            stress.main(args, config)
+        elif args.fuzz is not None:
+            sys.exit(1 if fuzz.main(args) > 0 else 0)
+        elif args.verify is not None:
+            sys.exit(1 if replay.main(args) > 0 else 0)
+        elif args.headless and args.replay is not None:
+            replay.main(args)
+        elif args.headless and args.autopilot:
+            autopilot.main(args, recorder, config)
+        elif args.headless:
+            headless.main(args, recorder, config)
+        else:
+            game = Invaders(width=GAME_WIDTH,height=GAME_HEIGHT,
+                timestep=TIMESTEP,max_steps=MAX_STEPS,retained=True,
+                atlas=True)
+            game.setConfig(config)
+            game.setSeed(args.seed)
+            game.setRecorder(recorder)
+            if args.rewind is not None:
+                game.setRewind(rewind.Rewind(args.rewind))
+            game.run()
+    finally:
+        if recorder is not None:
+            recorder.close()
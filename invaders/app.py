@@ -13,6 +13,8 @@ Jose Vizueth jdv72
 from consts import *
 from game2d import *
 from wave import *
+import numpy as np
+import zlib
 
 
 # PRIMARY RULE: Invaders can only access attributes in wave.py via getters/setters
@@ -73,8 +75,119 @@ class Invaders(GameApp):
     #Attribute lastkeys: the number of keys pressed last frame
     #Invariant: laskeys is an int >= 0
 
+    #Attribute _seed: the seed for the random numbers of the whole game
+    #Invariant: _seed is an int >= 0, a numpy SeedSequence, or None (for a
+    #different game every time). It is set with setSeed before the game starts.
+    _seed = None
+
+    #Attribute _seeds: the source of the seeds for each new wave
+    #Invariant: _seeds is a numpy SeedSequence made from _seed
+
+    #Attribute _recorder: the recorder of the input of the game (see replay.py)
+    #Invariant: _recorder is a Recorder object, or None to not record
+    _recorder = None
+
+    #Attribute _rewind: the recent history of the game (see rewind.py)
+    #Invariant: _rewind is a Rewind object, or None to not keep a history
+    _rewind = None
+
+    #Attribute _config: the settings of every wave of the game
+    #Invariant: _config is a GameConfig object
+    _config = DEFAULT_CONFIG
+
+    #Attribute _scenery: the wave whose scenery is in the LAYER_SCENERY layer
+    #of the view
+    #Invariant: _scenery is a Wave object, or None if the layer is empty
+
     # DO NOT MAKE A NEW INITIALIZER!
 
+    # GETTERS (used to run the game without a window, see headless.py)
+    def getState(self):
+        """
+        Returns the current state of the game
+
+        The state is one of STATE_INACTIVE, STATE_NEWWAVE, STATE_ACTIVE,
+        STATE_PAUSED, STATE_CONTINUE, or STATE_COMPLETE.
+        """
+        return self._state
+
+    def getWave(self):
+        """
+        Returns the current wave, or None if no wave has started
+        """
+        return self._wave
+
+    def getHash(self):
+        """
+        Returns a CRC-32 of the state of the game
+
+        This is the hash of the current wave (see Wave.getHash), combined with
+        the state of the game.  Two runs with the same seed and input should
+        have the same hash at every frame.
+        """
+        crc = 0 if self._wave is None else self._wave.getHash()
+        return zlib.crc32(bytes((self._state,)), crc)
+
+    def getConfig(self):
+        """
+        Returns the settings of every wave of the game
+        """
+        return self._config
+
+    def setConfig(self, config):
+        """
+        Sets the settings of every wave of the game (see GameConfig)
+
+        This must be called before the game starts.
+
+        Parameter config: the settings of the waves
+        Precondition: config is a GameConfig object
+        """
+        self._config = config
+
+    def setSeed(self, seed):
+        """
+        Sets the seed for the random numbers of the game
+
+        Two games with the same seed and the same input play out exactly the
+        same way. Every wave gets its own random generator, spawned from this
+        seed.  This must be called before the game starts.
+
+        Parameter seed: the seed for the game
+        Precondition: seed is an int >= 0, a numpy SeedSequence, or None (for
+        a different game every time)
+        """
+        self._seed = seed
+
+    def setRecorder(self, recorder):
+        """
+        Sets the recorder for the input of the game
+
+        The recorder gets the seed when the game starts, and the keys held
+        down and the time step at the start of every update.  If it is
+        hashing, it also gets the state hash at the end of every update.
+        Closing the recorder is up to the caller. This must be called before
+        the game starts.
+
+        Parameter recorder: the recorder for the game
+        Precondition: recorder is a Recorder object, or None to not record
+        """
+        self._recorder = recorder
+
+    def setRewind(self, rewind):
+        """
+        Sets the rewind buffer for the game
+
+        When there is a buffer, the wave is saved to it before every update,
+        and holding REWIND_KEY during play steps the game back one frame per
+        update.  A recording of a game that was rewound cannot be played
+        again, as the recording does not hold the rewinds.
+
+        Parameter rewind: the rewind buffer for the game
+        Precondition: rewind is a Rewind object, or None to not keep a history
+        """
+        self._rewind = rewind
+
     # THREE MAIN GAMEAPP METHODS
     def start(self):
         """
@@ -93,7 +206,16 @@ class Invaders(GameApp):
         #change the font of the words
         self._state = STATE_INACTIVE
         self._wave = None
+        self._seeds = np.random.SeedSequence(self._seed) \
+        if not isinstance(self._seed, np.random.SeedSequence) else self._seed
+        if self._recorder is not None:
+            self._recorder.begin(self._seeds, self._config)
         self._lastkeys = 0
+        self._scenery = None
+        if self.view is not None:
+            for (name, depth, static) in LAYERS:
+                if not self.view.hasLayer(name):
+                    self.view.addLayer(name, depth, static)
         if self._state == STATE_INACTIVE:
             self._text = GLabel(text = "Press \'s\' to play", font_size=24, \
             x = (GAME_WIDTH/2), y = (GAME_HEIGHT/2))
@@ -151,11 +273,16 @@ class Invaders(GameApp):
         Parameter dt: The time in seconds since last update
         Precondition: dt is a number (int or float)
         """
+        if self._recorder is not None:
+            self._recorder.record(self.input.keys, dt)
         self._determineState()
         if self._state == STATE_NEWWAVE:
             self._setupNewWave()
         if self._state == STATE_ACTIVE:
-            self._setupActiveWave(dt)
+            if self._rewind is not None and self.input.is_key_down(REWIND_KEY):
+                self._scrub()
+            else:
+                self._setupActiveWave(dt)
         if self._state == STATE_PAUSED:
             if self._wave.getLives() > 0:
                 self._text = GLabel(text = "Press \'s\' to continue", \
@@ -166,6 +293,8 @@ class Invaders(GameApp):
                 self._state = STATE_COMPLETE
         if self._state == STATE_COMPLETE:
             self._endscene()
+        if self._recorder is not None and self._recorder.isHashing():
+            self._recorder.recordHash(self.getHash())
 
     def draw(self):
         """
@@ -180,12 +309,21 @@ class Invaders(GameApp):
         getters for these attributes or you need to add a draw method to
         class Wave.  We suggest the latter.  See the example subcontroller.py
         from class.
+
+        The message is drawn in the LAYER_HUD layer, over the wave.  The
+        scenery layer of the view is static, so it is invalidated whenever the
+        wave drawn changes.
         """
-        try:
-            self._text.draw(self.view)
-        except:
-            GLabel().draw(self.view)
-        if self._state == STATE_ACTIVE or self._state == STATE_PAUSED:
+        shown = self._wave if self._state in (STATE_ACTIVE, STATE_PAUSED) \
+        else None
+        if shown is not self._scenery:
+            self.view.invalidate(LAYER_SCENERY)
+            self._scenery = shown
+        if self._text is not None:
+            self._text.draw(self.view, LAYER_HUD)
+        if self._state == STATE_ACTIVE:
+            self._wave.draw(self.view, self.alpha)
+        elif self._state == STATE_PAUSED:
             self._wave.draw(self.view)
 
     # HELPER METHODS FOR THE STATES GO HERE
@@ -194,7 +332,7 @@ class Invaders(GameApp):
         helps set up a new wave
         """
         self._text = None
-        self._wave = Wave()
+        self._wave = Wave(seed = self._seeds.spawn(1)[0], config = self._config)
         self._state = STATE_ACTIVE
 
     def _setupActiveWave(self, dt):
@@ -207,17 +345,33 @@ class Invaders(GameApp):
         if self._wave.aliensLost():
             if self._wave.getAlienSpeed() > 0:
                 self._wave = Wave(self._wave.getAlienSpeed() - 0.1,
-                self._wave.getLives())
-                print(str(self._wave.getAlienSpeed()))
+                self._wave.getLives(), seed = self._seeds.spawn(1)[0],
+                config = self._config)
             else:
                 self._state = STATE_COMPLETE
         if self._wave.aliensWon():
             self._state = STATE_COMPLETE
         self._text = None
+        if self._rewind is not None:
+            self._rewind.push(self._wave, dt)
         self._wave.update(self.input, dt)
         if self._wave.getEnd():
             self._state = STATE_PAUSED
 
+    def _scrub(self):
+        """
+        steps the game back one frame, using the rewind buffer
+
+        The wave is returned to the newest saved frame, which is the state
+        before the frame on screen, and that frame is then dropped, so holding
+        the key keeps going back.  That frame may belong to an
+        earlier wave.  Nothing happens once the buffer is empty.
+        """
+        frame = self._rewind.pop()
+        if frame is not None:
+            self._wave = frame[0]
+            self._wave.restore(frame[1])
+
     def _determineState(self):
         """
         determines the state
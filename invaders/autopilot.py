@@ -0,0 +1,411 @@
+"""
+Lookahead autopilot for Alien Invaders
+
+This module plays the game without a person, for soak tests: long sessions that
+reach the later, faster waves and keep the screen busy, so that frame times and
+memory can be watched over time.  Random input dies too quickly for that.
+
+The autopilot is an input object, like ScriptInput, so the game cannot tell it
+from a keyboard.  Before every frame it looks at the current wave, and for each
+move in MOVES it plays a short future on the wave itself: the move for
+AUTOPILOT_HOLD frames, then standing still, for AUTOPILOT_DEPTH frames in all.
+It goes back with Wave.snapshot and Wave.restore afterwards, and then holds
+down the keys of the move with the best future.  The futures use the wave's
+own random generator, so the autopilot knows where the aliens will fire; that
+makes it strong, which is the point.
+
+Thinking stops after AUTOPILOT_BUDGET seconds, keeping the best move found so
+far, so the futures never cost more than a fixed time per frame.  The value of
+each (state, move) pair is kept in a cache.  The full state (see Wave.getHash)
+holds timers and the random generator, so it almost never comes around again.
+The cache is instead keyed by a coarse state that does: the position,
+direction and living cells of the aliens, the ship to the nearest
+AUTOPILOT_SHIP pixels, and the bolts to cells of AUTOPILOT_CELL pixels.  States
+with the same coarse state share a value, so a cached value is an estimate, but
+many of the futures come from the cache (the soak test prints how many).
+
+Run a soak test from the command line with
+
+    python invaders --headless --autopilot --frames 216000 --seed 7
+
+which plays game after game for the given number of frames, and prints the
+frame times and the memory used.
+
+Jose Vizueth jdv72
+10/18/2026
+"""
+from consts import *
+from app import *
+from headless import ScriptInput, outcome, FRAMES
+from env import REWARD_KILL, REWARD_LIFE, REWARD_WIN, REWARD_LOSS
+import numpy as np
+import collections
+import time
+import sys
+
+try:
+    import resource
+except ImportError:     # Not on Windows
+    resource = None
+
+# the moves the autopilot picks from; it always fires when it can
+MOVES = (('spacebar',), ('left', 'spacebar'), ('right', 'spacebar'))
+# the number of frames in each future
+AUTOPILOT_DEPTH = 40
+# the number of frames a move is held in a future, before standing still
+AUTOPILOT_HOLD = 8
+# the most seconds spent looking ahead before each frame
+AUTOPILOT_BUDGET = 0.008
+# the most (state, move) values kept in the cache
+AUTOPILOT_CACHE = 4096
+# the pixels of ship position that share a cache entry
+AUTOPILOT_SHIP = 8
+# the size in pixels of the square cells that bolts are put in for the cache
+AUTOPILOT_CELL = 32
+# the value lost at the end of a future for each pixel from the nearest column
+AUTOPILOT_AIM = 1/GAME_WIDTH
+
+
+class Autopilot(ScriptInput):
+    """
+    A class that stands in for GInput and plays the game by looking ahead.
+
+    The keys are picked by advance, which must be called before every update
+    of the game (as headless.simulate does).  The 's' key is always held down,
+    so the game starts, and every new ship appears, as soon as it can.
+    """
+    # HIDDEN ATTRIBUTES:
+    # Attribute _app: the game being played
+    # Invariant: _app is an Invaders object started with this input
+    #
+    # Attribute _future: the input of the futures
+    # Invariant: _future is a ScriptInput object
+    #
+    # Attribute _depth: the number of frames in each future
+    # Invariant: _depth is an int > 0
+    #
+    # Attribute _budget: the most seconds spent looking ahead before a frame
+    # Invariant: _budget is a float >= 0
+    #
+    # Attribute _cache: the values of (coarse state, move) pairs, oldest first
+    # Invariant: _cache is an OrderedDict with at most AUTOPILOT_CACHE items
+    #
+    # Attribute _move: the position in MOVES of the move being held
+    # Invariant: _move is an int in 0..len(MOVES)-1
+    #
+    # Attribute _thinking: the seconds spent looking ahead so far
+    # Invariant: _thinking is a float >= 0
+    #
+    # Attribute _futures: the number of futures played so far
+    # Invariant: _futures is an int >= 0
+    #
+    # Attribute _hits: the number of futures found in the cache so far
+    # Invariant: _hits is an int >= 0
+
+    # GETTERS
+    def getThinking(self):
+        """
+        Returns the seconds spent looking ahead so far
+        """
+        return self._thinking
+
+    def getFutures(self):
+        """
+        Returns the number of futures played so far
+        """
+        return self._futures
+
+    def getHits(self):
+        """
+        Returns the number of futures found in the cache so far
+        """
+        return self._hits
+
+    # INITIALIZER
+    def __init__(self, app, dt = TIMESTEP, depth = AUTOPILOT_DEPTH,
+    budget = AUTOPILOT_BUDGET):
+        """
+        Initializes an autopilot for a game
+
+        Give the autopilot to app.start_headless as the input of the game.
+
+        Parameter app: the game to play
+        Precondition: app is an Invaders object
+
+        Parameter dt: the time in seconds of each animation frame
+        Precondition: dt is a float > 0
+
+        Parameter depth: the number of frames in each future
+        Precondition: depth is an int > 0
+
+        Parameter budget: the most seconds spent looking ahead before a frame
+        Precondition: budget is a float >= 0
+        """
+        super().__init__((), dt)
+        self._app = app
+        self._future = ScriptInput((), dt)
+        self._depth = depth
+        self._budget = budget
+        self._cache = collections.OrderedDict()
+        self._move = 0
+        self._thinking = 0
+        self._futures = 0
+        self._hits = 0
+
+    def advance(self, frame):
+        """
+        Picks the keys to hold down for the next update of the game
+
+        Parameter frame: the current animation frame (unused)
+        Precondition: frame is an int >= 0
+        """
+        start = time.perf_counter()
+        wave = self._app.getWave()
+        if self._app.getState() == STATE_ACTIVE and wave is not None and \
+        wave.getShipX() is not None and not wave.isShipHit():
+            self._move = self._choose(wave, start + self._budget)
+        self.setKeys(('s',) + MOVES[self._move])
+        self._thinking += time.perf_counter() - start
+
+    # HELPER METHODS
+    def _choose(self, wave, stop):
+        """
+        Returns the position in MOVES of the move with the best future
+
+        The move being held is looked at first, so that it is kept if there is
+        no time to look at any other.
+
+        Parameter wave: the wave being played
+        Precondition: wave is a Wave object with a ship that is not hit
+
+        Parameter stop: the value of time.perf_counter to stop thinking at
+        Precondition: stop is a float
+        """
+        state = None
+        key = self._coarse(wave)
+        best = None
+        value = None
+        for i in [self._move] + \
+        [j for j in range(len(MOVES)) if j != self._move]:
+            if (key, i) in self._cache:
+                self._cache.move_to_end((key, i))
+                self._hits += 1
+                future = self._cache[(key, i)]
+            elif time.perf_counter() < stop or best is None:
+                if state is None:
+                    state = wave.snapshot()
+                future = self._play(wave, MOVES[i])
+                wave.restore(state)
+                self._cache[(key, i)] = future
+                if len(self._cache) > AUTOPILOT_CACHE:
+                    self._cache.popitem(last=False)
+                self._futures += 1
+            else:
+                continue
+            if best is None or future > value:
+                best = i
+                value = future
+        return best
+
+    def _coarse(self, wave):
+        """
+        Returns the coarse state of a wave, the key of the cache
+
+        The coarse state is a tuple of the position and direction of the
+        aliens, the bytes of their living cells, the ship position divided by
+        AUTOPILOT_SHIP, and the sorted (column, row, player) cells of the
+        bolts on a grid of AUTOPILOT_CELL pixels.
+
+        Parameter wave: the wave being played
+        Precondition: wave is a Wave object with a ship
+        """
+        (x, y, vy, player) = wave.getBoltViews()
+        cols = (x // AUTOPILOT_CELL).astype(int).tolist()
+        rows = (y // AUTOPILOT_CELL).astype(int).tolist()
+        bolts = tuple(sorted(zip(cols, rows, player.tolist())))
+        return (wave.getAlienOrigin(), wave.getAliveView().tobytes(),
+            int(wave.getShipX() // AUTOPILOT_SHIP), bolts)
+
+    def _play(self, wave, keys):
+        """
+        Returns the value of a future where keys are held down
+
+        The keys are held for AUTOPILOT_HOLD frames, and then only the fire key
+        (the first move) is held.  The value is REWARD_KILL for each alien
+        killed, plus REWARD_WIN or REWARD_LOSS if the wave ends, or
+        REWARD_LIFE if the ship is hit, less AUTOPILOT_AIM for each pixel
+        between the ship and the nearest column of aliens at the end.  The
+        wave is left at the end of the future.
+
+        Parameter wave: the wave to play
+        Precondition: wave is a Wave object with a ship that is not hit
+
+        Parameter keys: the keys to hold down
+        Precondition: keys is a tuple of strings
+        """
+        self._future.setKeys(keys)
+        aliens = wave.getAlienCount()
+        dt = self.getDt()
+        for frame in range(self._depth):
+            if frame == AUTOPILOT_HOLD:
+                self._future.setKeys(MOVES[0])
+            wave.update(self._future, dt)
+            if wave.isShipHit() or wave.getShipX() is None:
+                return REWARD_LIFE + REWARD_KILL*(aliens-wave.getAlienCount())
+            if wave.aliensLost():
+                return REWARD_WIN + REWARD_KILL*aliens
+            if wave.aliensWon():
+                return REWARD_LOSS
+        value = REWARD_KILL*(aliens - wave.getAlienCount())
+        x = wave.getShipX()
+        target = wave.getTargetX(x)
+        if target is not None:
+            value -= AUTOPILOT_AIM*abs(target - x)
+        return value
+
+
+def play(frames, seed = None, dt = TIMESTEP, recorder = None,
+config = DEFAULT_CONFIG, depth = AUTOPILOT_DEPTH, budget = AUTOPILOT_BUDGET):
+    """
+    Returns the statistics of one game played by an autopilot
+
+    The game runs until it is complete or until frames animation frames have
+    passed, whichever comes first.  The result is a dictionary with the keys
+    'frames', 'waves', 'outcome', 'lives', 'updates' (a numpy array of the
+    seconds of each update of the game, not counting the autopilot),
+    'thinking', 'futures' and 'hits'.
+
+    Parameter frames: the largest number of animation frames to play
+    Precondition: frames is an int >= 0
+
+    Parameter seed: the seed for the random number generator
+    Precondition: seed is an int >= 0, a numpy SeedSequence, or None (for a
+    random seed)
+
+    Parameter dt: the time in seconds of each animation frame
+    Precondition: dt is a float > 0
+
+    Parameter recorder: the recorder for the game (see replay.py)
+    Precondition: recorder is a Recorder object, or None to not record
+
+    Parameter config: the settings of every wave
+    Precondition: config is a GameConfig object
+
+    Parameter depth: the number of frames in each future
+    Precondition: depth is an int > 0
+
+    Parameter budget: the most seconds spent looking ahead before a frame
+    Precondition: budget is a float >= 0
+    """
+    app = Invaders(width=GAME_WIDTH,height=GAME_HEIGHT)
+    app.setConfig(config)
+    app.setSeed(seed)
+    app.setRecorder(recorder)
+    pilot = Autopilot(app, dt, depth, budget)
+    app.start_headless(pilot)
+    updates = np.zeros(frames)
+    waves = 0
+    wave = None
+    frame = 0
+    while frame < frames and app.getState() != STATE_COMPLETE:
+        pilot.advance(frame)
+        start = time.perf_counter()
+        app.update(dt)
+        updates[frame] = time.perf_counter() - start
+        if app.getWave() is not wave:
+            wave = app.getWave()
+            waves += 1
+        frame += 1
+    wave = app.getWave()
+    return {'frames': frame, 'waves': waves, 'outcome': outcome(app),
+            'lives': config.ship_lives if wave is None else wave.getLives(),
+            'updates': updates[:frame], 'thinking': pilot.getThinking(),
+            'futures': pilot.getFutures(), 'hits': pilot.getHits()}
+
+
+def soak(frames, seed = None, dt = TIMESTEP, recorder = None,
+config = DEFAULT_CONFIG, depth = AUTOPILOT_DEPTH, budget = AUTOPILOT_BUDGET):
+    """
+    Returns the statistics of games played back to back by an autopilot
+
+    New games are started until frames animation frames have been played in
+    all.  Each game gets its own seed, spawned from seed.  If there is a
+    recorder, only one game is played, as a recording holds a single game.
+
+    The result is a dictionary with the keys 'games', 'won', 'waves',
+    'frames', 'updates' (a numpy array of the seconds of every update),
+    'thinking', 'futures', 'hits' and 'memory' (the peak memory of the
+    process in bytes, or None if it is not known).
+
+    Parameter frames: the number of animation frames to play
+    Precondition: frames is an int >= 0
+
+    Parameter seed: the seed for the random number generator
+    Precondition: seed is an int >= 0 or None (for a random seed)
+
+    Parameter dt: the time in seconds of each animation frame
+    Precondition: dt is a float > 0
+
+    Parameter recorder: the recorder for the game (see replay.py)
+    Precondition: recorder is a Recorder object, or None to not record
+
+    Parameter config: the settings of every wave
+    Precondition: config is a GameConfig object
+
+    Parameter depth: the number of frames in each future
+    Precondition: depth is an int > 0
+
+    Parameter budget: the most seconds spent looking ahead before a frame
+    Precondition: budget is a float >= 0
+    """
+    seeds = np.random.SeedSequence(seed)
+    games = []
+    left = frames
+    while left > 0 and (recorder is None or len(games) == 0):
+        stats = play(left, seeds.spawn(1)[0], dt, recorder, config, depth,
+            budget)
+        games.append(stats)
+        left -= stats['frames']
+    memory = None
+    if resource is not None:
+        # ru_maxrss is in kilobytes on Linux, but in bytes on macOS
+        scale = 1 if sys.platform == 'darwin' else 1024
+        memory = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss*scale
+    return {'games': len(games),
+            'won': sum(stats['outcome'] == 'won' for stats in games),
+            'waves': sum(stats['waves'] for stats in games),
+            'frames': sum(stats['frames'] for stats in games),
+            'updates': np.concatenate([stats['updates'] for stats in games]),
+            'thinking': sum(stats['thinking'] for stats in games),
+            'futures': sum(stats['futures'] for stats in games),
+            'hits': sum(stats['hits'] for stats in games),
+            'memory': memory}
+
+
+def main(args, recorder = None, config = DEFAULT_CONFIG):
+    """
+    Runs a soak test from the command line and prints the results
+
+    Parameter args: the parsed command line arguments
+    Precondition: args has the attributes frames, seed and dt
+
+    Parameter recorder: the recorder for the game (see replay.py)
+    Precondition: recorder is a Recorder object, or None to not record
+
+    Parameter config: the settings of every wave
+    Precondition: config is a GameConfig object
+    """
+    frames = FRAMES if args.frames is None else args.frames
+    stats = soak(frames, args.seed, args.dt, recorder, config)
+    updates = stats['updates']*1000
+    print('games:    %d (%d won)' % (stats['games'], stats['won']))
+    print('waves:    %d' % stats['waves'])
+    print('frames:   %d' % stats['frames'])
+    if len(updates) > 0:
+        print('update:   mean %.3f ms, p99 %.3f ms, max %.3f ms' %
+            (updates.mean(), np.percentile(updates, 99), updates.max()))
+        print('thinking: %.3f ms per frame, %d futures, %d from the cache' %
+            (stats['thinking']*1000/len(updates), stats['futures'],
+            stats['hits']))
+    if stats['memory'] is not None:
+        print('memory:   %.1f MB peak' % (stats['memory']/(1024*1024)))
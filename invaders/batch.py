@@ -0,0 +1,734 @@
+"""
+Batch simulator for Alien Invaders
+
+This module plays many independent waves at once, in lockstep, for balance
+studies.  Instead of one Wave object per game, the state of every game lives in
+numpy arrays with one entry (or row) per game: the living cells, the formation
+offsets and directions, the bolt tables and the ships.  Each rule of
+Wave.update is then one array operation over every game.  Run it with
+
+    python invaders --batch 10000 --frames 3600 --seed 7 --input sweep
+
+The rules are the same as Wave.update with the uniform shooter, as played by
+InvadersEnv (a new ship appears as soon as the explosion ends).  Each game has
+its own random generator, seeded as a Wave would be, so game i of a batch plays
+out exactly like a Wave with the same seed and input.  Aliens only fire every
+few steps, so the draws for firing are the one rule that loops over games (only
+over the games firing this frame).  The function crosscheck tests this against
+Wave, and test_batch.py runs it.
+
+The one difference from Wave is that a game stops changing once it is done (won
+or lost), except that its bolts keep flying.
+
+Jose Vizueth jdv72
+10/18/2026
+"""
+from consts import *
+from models import *
+from app import Invaders
+from wave import Wave
+from headless import ScriptInput, load_script, FRAMES
+import numpy as np
+import time
+
+# the number of frames in the explosion of a ship
+SHIP_FRAMES = SHIP_FORMAT[0] * SHIP_FORMAT[1]
+# the number of alien bolts each game can hold before the table grows
+BATCH_BOLTS = 16
+
+
+class Batch(object):
+    """
+    A class representing many waves of Alien Invaders, played in lockstep.
+
+    Call step once per frame with the keys held down in each game.  The getters
+    return numpy arrays with one entry per game.  They are the arrays of the
+    batch (not copies), so do not change them.
+    """
+    # HIDDEN ATTRIBUTES:
+    # Attribute _n: the number of games
+    # Invariant: _n is an int > 0
+    #
+    # Attribute _dt: the time in seconds of each frame
+    # Invariant: _dt is a float > 0
+    #
+    # Attribute _config: the settings of every game
+    # Invariant: _config is a GameConfig object
+    #
+    # Attribute _rngs: the random generator of each game
+    # Invariant: _rngs is a list of _n numpy Generators
+    #
+    # Attribute _alive: the living cells of each game (row 0 is the bottom)
+    # Invariant: _alive is a numpy bool array of shape (_n,rows,cols)
+    #
+    # Attribute _count: the number of living aliens in each game
+    # Invariant: _count is a numpy int array of length _n
+    #
+    # Attribute _left, _rightcol, _bottom: the leftmost column, rightmost
+    # column and bottom row with a living alien in each game
+    # Invariant: each is a numpy int array of length _n (any value if the
+    # game has no aliens)
+    #
+    # Attribute _x, _y: the center of the bottom-left cell of each game
+    # Invariant: each is a numpy float array of length _n
+    #
+    # Attribute _right: whether each formation is marching to the right
+    # Invariant: _right is a numpy bool array of length _n
+    #
+    # Attribute _interval: the seconds between alien steps in each game
+    # Invariant: _interval is a numpy float array of length _n, >= alien_min_speed
+    #
+    # Attribute _time: the time since the last alien step in each game
+    # Invariant: _time is a numpy float array of length _n
+    #
+    # Attribute _steps: the alien steps since the last alien bolt
+    # Invariant: _steps is a numpy int array of length _n
+    #
+    # Attribute _rates: the alien steps between alien bolts
+    # Invariant: _rates is a numpy int array of length _n, in 1..bolt_rate
+    #
+    # Attribute _bx, _by: the centers of the alien bolts of each game
+    # Invariant: each is a numpy float array of shape (_n,width), where width
+    # grows (up to bolt_capacity) when a game needs more room
+    #
+    # Attribute _bon: the slots of _bx and _by that hold a bolt
+    # Invariant: _bon is a numpy bool array with the same shape as _bx
+    #
+    # Attribute _px, _py: the center of the player bolt of each game
+    # Invariant: each is a numpy float array of length _n
+    #
+    # Attribute _pon: whether each game has a player bolt
+    # Invariant: _pon is a numpy bool array of length _n
+    #
+    # Attribute _shipx: the horizontal coordinate of each ship
+    # Invariant: _shipx is a numpy float array of length _n
+    #
+    # Attribute _ship: whether each game has a ship
+    # Invariant: _ship is a numpy bool array of length _n
+    #
+    # Attribute _shot: whether each ship has been shot
+    # Invariant: _shot is a numpy bool array of length _n
+    #
+    # Attribute _exploding: whether each ship is exploding
+    # Invariant: _exploding is a numpy bool array of length _n
+    #
+    # Attribute _boom: the time each explosion has run
+    # Invariant: _boom is a numpy float array of length _n
+    #
+    # Attribute _end: whether each game has just lost a ship
+    # Invariant: _end is a numpy bool array of length _n
+    #
+    # Attribute _lives: the lives left in each game
+    # Invariant: _lives is a numpy int array of length _n
+    #
+    # Attribute _lost: whether each game has no aliens left (Wave.aliensLost)
+    # Invariant: _lost is a numpy bool array of length _n
+    #
+    # Attribute _won: whether the aliens reached the defense line in each game
+    # (Wave.aliensWon)
+    # Invariant: _won is a numpy bool array of length _n
+    #
+    # Attribute _done: whether each game is over
+    # Invariant: _done is a numpy bool array of length _n
+    #
+    # Attribute _frames: the number of frames each game has been played
+    # Invariant: _frames is a numpy int array of length _n
+
+    # GETTERS
+    def getCount(self):
+        """
+        Returns the number of games
+        """
+        return self._n
+
+    def getDt(self):
+        """
+        Returns the time in seconds of each frame
+        """
+        return self._dt
+
+    def getDone(self):
+        """
+        Returns whether each game is over
+        """
+        return self._done
+
+    def getWon(self):
+        """
+        Returns whether the player has destroyed every alien in each game
+        """
+        return self._lost
+
+    def getLives(self):
+        """
+        Returns the lives left in each game
+        """
+        return self._lives
+
+    def getAliens(self):
+        """
+        Returns the number of living aliens in each game
+        """
+        return self._count
+
+    def getFrames(self):
+        """
+        Returns the number of frames each game was played (until it was done)
+        """
+        return self._frames
+
+    def getAlive(self):
+        """
+        Returns the living cells of each game, of shape (count,rows,cols)
+
+        Row 0 is the bottom row.
+        """
+        return self._alive
+
+    def getOffsets(self):
+        """
+        Returns the center of the bottom-left cell of each game, as (x, y)
+        """
+        return (self._x, self._y)
+
+    def getBolts(self):
+        """
+        Returns the alien bolts of each game, as (x, y, on)
+
+        Each array has one row per game.  Only the slots where on is True hold
+        a bolt.
+        """
+        return (self._bx, self._by, self._bon)
+
+    def getPlayerBolts(self):
+        """
+        Returns the player bolt of each game, as (x, y, on)
+
+        Only the games where on is True have a player bolt.
+        """
+        return (self._px, self._py, self._pon)
+
+    def getShips(self):
+        """
+        Returns the ship of each game, as (x, on)
+
+        Only the games where on is True have a ship.
+        """
+        return (self._shipx, self._ship)
+
+    def getGame(self, i):
+        """
+        Returns the state of game i as a dictionary
+
+        The keys are 'alive', 'x', 'y', 'right', 'ship' (the ship x, or None),
+        'exploding', 'boom', 'shot', 'lives', 'time', 'steps', 'rates',
+        'lost', 'won' and 'bolts' (a sorted list of (x, y, player) triples).
+        This is for testing (see crosscheck), and is not fast.
+
+        Parameter i: the game
+        Precondition: i is an int in 0..getCount()-1
+        """
+        bolts = [(float(x), float(y), False) for (x, y) in
+            zip(self._bx[i][self._bon[i]], self._by[i][self._bon[i]])]
+        if self._pon[i]:
+            bolts.append((float(self._px[i]), float(self._py[i]), True))
+        return {'alive': self._alive[i].copy(), 'x': float(self._x[i]),
+            'y': float(self._y[i]), 'right': bool(self._right[i]),
+            'ship': float(self._shipx[i]) if self._ship[i] else None,
+            'exploding': bool(self._exploding[i]), 'boom': float(self._boom[i]),
+            'shot': bool(self._shot[i]), 'lives': int(self._lives[i]),
+            'time': float(self._time[i]), 'steps': int(self._steps[i]),
+            'rates': int(self._rates[i]), 'lost': bool(self._lost[i]),
+            'won': bool(self._won[i]), 'bolts': sorted(bolts)}
+
+    # INITIALIZER
+    def __init__(self, n, seed = None, seeds = None, config = DEFAULT_CONFIG,
+    dt = TIMESTEP):
+        """
+        Initializes a batch of n new waves
+
+        Parameter n: the number of games
+        Precondition: n is an int > 0
+
+        Parameter seed: the seed the seeds of the games are spawned from
+        Precondition: seed is an int >= 0 or None (for a random seed)
+
+        Parameter seeds: the seed of each game, used instead of seed
+        Precondition: seeds is None or a sequence of n seeds, each an int >= 0
+        or a numpy SeedSequence
+
+        Parameter config: the settings of every game
+        Precondition: config is a GameConfig object
+
+        Parameter dt: the time in seconds of each frame
+        Precondition: dt is a float > 0
+        """
+        if seeds is None:
+            seeds = np.random.SeedSequence(seed).spawn(n)
+        rows = config.alien_rows
+        cols = config.aliens_in_row
+        start = Formation(rows, cols, config)
+        self._n = n
+        self._dt = dt
+        self._config = config
+        # A Wave draws its first rate as soon as it is made
+        self._rngs = [np.random.default_rng(s) for s in seeds]
+        self._rates = np.array([rng.integers(1, config.bolt_rate+1)
+            for rng in self._rngs], dtype=int)
+        self._alive = np.ones((n, rows, cols), dtype=bool)
+        self._count = np.full(n, rows*cols)
+        self._left = np.zeros(n, dtype=int)
+        self._rightcol = np.full(n, cols-1)
+        self._bottom = np.zeros(n, dtype=int)
+        self._x = np.full(n, float(start.cellX(0)))
+        self._y = np.full(n, float(start.cellY(0)))
+        self._right = np.ones(n, dtype=bool)
+        self._interval = np.full(n,
+            float(max(config.alien_speed, config.alien_min_speed)))
+        self._time = np.zeros(n)
+        self._steps = np.zeros(n, dtype=int)
+        self._bx = np.zeros((n, BATCH_BOLTS))
+        self._by = np.zeros((n, BATCH_BOLTS))
+        self._bon = np.zeros((n, BATCH_BOLTS), dtype=bool)
+        self._px = np.zeros(n)
+        self._py = np.zeros(n)
+        self._pon = np.zeros(n, dtype=bool)
+        self._shipx = np.full(n, GAME_WIDTH/2)
+        self._ship = np.ones(n, dtype=bool)
+        self._shot = np.zeros(n, dtype=bool)
+        self._exploding = np.zeros(n, dtype=bool)
+        self._boom = np.zeros(n)
+        self._end = np.zeros(n, dtype=bool)
+        self._lives = np.full(n, config.ship_lives)
+        self._lost = np.zeros(n, dtype=bool)
+        self._won = np.zeros(n, dtype=bool)
+        self._done = np.zeros(n, dtype=bool)
+        self._frames = np.zeros(n, dtype=int)
+
+    # UPDATE METHOD
+    def step(self, left = False, right = False, fire = False):
+        """
+        Plays one frame of every game that is not done
+
+        The rules are applied in the same order as in Wave.update.  Each key
+        argument is either one bool for every game, or a numpy bool array with
+        one entry per game.
+
+        Parameter left: whether the left key is held down
+        Precondition: left is a bool or a numpy bool array of length getCount()
+
+        Parameter right: whether the right key is held down
+        Precondition: right is a bool or a numpy bool array of length getCount()
+
+        Parameter fire: whether the fire key (spacebar or up) is held down
+        Precondition: fire is a bool or a numpy bool array of length getCount()
+        """
+        live = ~self._done
+        self._alienmotion(live)
+        self._alienshoot(live)
+        self._lasergone()
+        self._alienhit()
+        self._shiphit(live)
+        self._alienswonorlost()
+        self._shipshoot(live, fire)
+        self._ship_update(live, left, right)
+        self._frames += live
+        self._done |= self._lost | self._won | (self._lives <= 0)
+
+    # HELPER METHODS, ONE FOR EACH RULE OF WAVE.UPDATE
+    def _alienmotion(self, live):
+        """
+        Marches the formations of the live games (see Wave.alienmotion)
+
+        Parameter live: the games being played
+        Precondition: live is a numpy bool array of length getCount()
+        """
+        c = self._config
+        self._time += np.where(live, self._dt, 0.0)
+        for i in range(c.alien_max_steps):
+            due = self._time >= self._interval
+            if not due.any():
+                return
+            self._march(due)
+            self._time[due] -= self._interval[due]
+            self._steps[due] += 1
+        over = self._time >= self._interval
+        if over.any():
+            self._time[over] %= self._interval[over]
+
+    def _march(self, due):
+        """
+        Moves the given formations one step (see Formation.march)
+
+        Parameter due: the games whose formation steps
+        Precondition: due is a numpy bool array of length getCount()
+        """
+        c = self._config
+        empty = self._count == 0
+        edge = np.where(empty, 0,
+            (self._x + self._rightcol * c.alien_h_pitch) + c.alien_half_width)
+        rbounce = edge + c.alien_h_walk > GAME_WIDTH - c.alien_h_sep
+        edge = np.where(empty, GAME_WIDTH,
+            (self._x + self._left * c.alien_h_pitch) - c.alien_half_width)
+        lbounce = edge - c.alien_h_walk < c.alien_h_sep
+        bounce = due & np.where(self._right, rbounce, lbounce)
+        walk = due & ~bounce
+        self._x[walk & self._right] += c.alien_h_walk
+        self._x[walk & ~self._right] -= c.alien_h_walk
+        self._y[bounce] -= c.alien_v_sep
+        self._right[bounce] = ~self._right[bounce]
+
+    def _alienshoot(self, live):
+        """
+        Fires an alien bolt in each live game that is due (see Wave.alienshoot)
+
+        Each game draws from its own generator, in the same order as a Wave.
+        Only those draws loop over the firing games; choosing the alien and
+        adding the bolt are array operations.
+
+        Parameter live: the games being played
+        Precondition: live is a numpy bool array of length getCount()
+        """
+        c = self._config
+        games = np.flatnonzero(live & (self._steps >= self._rates))
+        if len(games) == 0:
+            return
+        columns = self._alive[games].any(axis=1)
+        counts = columns.sum(axis=1)
+        picks = np.zeros(len(games), dtype=int)
+        for i in range(len(games)):
+            rng = self._rngs[games[i]]
+            if counts[i] > 0:
+                picks[i] = rng.integers(0, counts[i])
+            self._rates[games[i]] = rng.integers(1, c.bolt_rate+1)
+        self._steps[games] = 0
+        firing = counts > 0
+        games = games[firing]
+        # The column of the pick-th nonempty column, and its front row
+        col = np.argmax(np.cumsum(columns[firing], axis=1) > picks[firing,None],
+            axis=1)
+        row = np.argmax(self._alive[games, :, col], axis=1)
+        x = self._x[games] + col * c.alien_h_pitch
+        y = self._y[games] + row * c.alien_v_pitch
+        self._addbolts(games, x, y - c.alien_half_height - c.bolt_half_height)
+
+    def _addbolts(self, games, x, y):
+        """
+        Adds an alien bolt to each of the given games, growing the table if
+        one of them is full
+
+        Parameter games: the games, with no repeats
+        Precondition: games is a numpy int array
+
+        Parameter x: the horizontal coordinate of each bolt center
+        Precondition: x is a numpy float array, the same length as games
+
+        Parameter y: the vertical coordinate of each bolt center
+        Precondition: y is a numpy float array, the same length as games
+        """
+        c = self._config
+        full = self._bon[games].all(axis=1)
+        width = self._bon.shape[1]
+        if full.any() and width < c.bolt_capacity:
+            grow = min(width, c.bolt_capacity - width)
+            self._bx = np.pad(self._bx, ((0, 0), (0, grow)))
+            self._by = np.pad(self._by, ((0, 0), (0, grow)))
+            self._bon = np.pad(self._bon, ((0, 0), (0, grow)))
+            full = self._bon[games].all(axis=1)
+        # A BoltPool holds c.bolt_capacity bolts, the player bolt included
+        full |= self._bon[games].sum(axis=1) + self._pon[games] >= c.bolt_capacity
+        games = games[~full]
+        slot = np.argmin(self._bon[games], axis=1)
+        self._bx[games, slot] = x[~full]
+        self._by[games, slot] = y[~full]
+        self._bon[games, slot] = True
+
+    def _lasergone(self):
+        """
+        Removes the bolts that have left the window (see BoltPool.cull)
+
+        Alien bolts only move down, so they can only leave at the bottom.
+        """
+        c = self._config
+        self._bon &= self._by + c.bolt_half_height >= 0
+        self._pon &= ~((self._py > GAME_HEIGHT) |
+            (self._py + c.bolt_half_height < 0))
+
+    def _alienhit(self):
+        """
+        Kills the aliens hit by player bolts (see Formation.hit)
+
+        Only the bolts level with their formation are tested.  The corners of
+        each are tried in the same order as Formation.hit, and the first one
+        inside a living alien counts.
+        """
+        c = self._config
+        top = (self._alive.shape[1]-1) * c.alien_v_pitch + c.alien_half_height
+        reach = (self._py + c.bolt_half_height > self._y - c.alien_half_height) & \
+        (self._py - c.bolt_half_height < self._y + top)
+        games = np.flatnonzero(self._pon & reach)
+        if len(games) == 0:
+            return
+        (rows, cols) = self._alive.shape[1:]
+        fx = self._x[games]
+        fy = self._y[games]
+        alive = self._alive[games]
+        found = np.zeros(len(games), dtype=bool)
+        hitrow = np.zeros(len(games), dtype=int)
+        hitcol = np.zeros(len(games), dtype=int)
+        for px in (self._px[games] + c.bolt_half_width,
+                   self._px[games] - c.bolt_half_width):
+            col = np.round((px - fx) / c.alien_h_pitch).astype(int)
+            okcol = (col >= 0) & (col < cols) & \
+            (np.abs(px - (fx + col * c.alien_h_pitch)) < c.alien_half_width)
+            col = np.clip(col, 0, cols-1)
+            for py in (self._py[games] + c.bolt_half_height,
+                       self._py[games] - c.bolt_half_height):
+                row = np.round((py - fy) / c.alien_v_pitch).astype(int)
+                ok = okcol & (row >= 0) & (row < rows) & \
+                (np.abs(py - (fy + row * c.alien_v_pitch)) < c.alien_half_height)
+                row = np.clip(row, 0, rows-1)
+                ok &= alive[np.arange(len(games)), row, col] & ~found
+                hitrow[ok] = row[ok]
+                hitcol[ok] = col[ok]
+                found |= ok
+        if not found.any():
+            return
+        games = games[found]
+        self._alive[games, hitrow[found], hitcol[found]] = False
+        self._pon[games] = False
+        self._count[games] -= 1
+        columns = self._alive[games].any(axis=1)
+        self._left[games] = np.argmax(columns, axis=1)
+        self._rightcol[games] = cols - 1 - \
+        np.argmax(columns[:, ::-1], axis=1)
+        self._bottom[games] = np.argmax(self._alive[games].any(axis=2), axis=1)
+
+    def _shiphit(self, live):
+        """
+        Removes the alien bolts that hit a ship, marking it shot (see
+        Wave.shiphit)
+
+        Only the bolts low enough to touch a ship are tested.
+
+        Parameter live: the games being played
+        Precondition: live is a numpy bool array of length getCount()
+        """
+        c = self._config
+        reach = (c.ship_height + c.bolt_height)/2
+        low = np.flatnonzero(self._bon & (self._by < c.ship_y + reach))
+        if len(low) == 0:
+            return
+        (games, slots) = np.divmod(low, self._bon.shape[1])
+        hit = live[games] & self._ship[games]
+        hit &= np.abs(self._by[games, slots] - c.ship_y) < reach
+        hit &= np.abs(self._bx[games, slots] - self._shipx[games]) < \
+        (c.ship_width + c.bolt_width)/2
+        self._bon[games[hit], slots[hit]] = False
+        self._shot[games[hit]] = True
+
+    def _alienswonorlost(self):
+        """
+        Checks whether the aliens are all gone or have reached the defense line
+        (see Wave.alienswonorlost)
+        """
+        c = self._config
+        self._lost = self._count == 0
+        bottom = np.where(self._lost, GAME_HEIGHT,
+            (self._y + self._bottom * c.alien_v_pitch) - c.alien_half_height)
+        self._won |= bottom <= c.defense_line
+
+    def _shipshoot(self, live, fire):
+        """
+        Moves every bolt and fires the player bolts (see Wave.shipshoot)
+
+        Parameter live: the games being played
+        Precondition: live is a numpy bool array of length getCount()
+
+        Parameter fire: whether the fire key is held down
+        Precondition: fire is a bool or a numpy bool array of length getCount()
+        """
+        c = self._config
+        self._by -= c.bolt_speed
+        self._py += c.bolt_speed
+        shoot = live & self._ship & ~self._pon & fire
+        # The player bolt does not fit if the alien bolts fill the BoltPool
+        shoot &= self._bon.sum(axis=1) + self._pon < c.bolt_capacity
+        self._px[shoot] = self._shipx[shoot]
+        self._py[shoot] = c.ship_y + c.alien_half_height + c.bolt_half_height
+        self._pon |= shoot
+
+    def _ship_update(self, live, left, right):
+        """
+        Runs the explosions and moves the ships (the end of Wave.update)
+
+        A ship that finishes exploding costs a life, and a new ship appears at
+        once if there are lives left (as in InvadersEnv).
+
+        Parameter live: the games being played
+        Precondition: live is a numpy bool array of length getCount()
+
+        Parameter left: whether the left key is held down
+        Precondition: left is a bool or a numpy bool array of length getCount()
+
+        Parameter right: whether the right key is held down
+        Precondition: right is a bool or a numpy bool array of length getCount()
+        """
+        c = self._config
+        exploding = live & self._exploding
+        starting = live & ~self._exploding & self._shot
+        moving = live & ~self._exploding & ~self._shot
+        self._boom[exploding] += self._dt
+        dead = exploding & ((self._boom / c.death_speed *
+            (SHIP_FRAMES - 1)).astype(int) >= SHIP_FRAMES)
+        self._exploding[dead] = False
+        self._ship[dead] = False
+        self._lives[dead] -= 1
+        self._shot[dead] = False
+        self._end[dead] = True
+        self._exploding[starting] = True
+        self._boom[starting] = 0
+        self._end[moving] = False
+        moving &= self._ship
+        go = moving & left
+        self._shipx[go] = np.maximum(self._shipx[go] - c.ship_movement,
+            c.ship_half_width)
+        go = moving & right
+        # As in Wave.shipmotion, holding both keys moves left only
+        step = np.broadcast_to(np.where(left, 0, c.ship_movement), go.shape)
+        self._shipx[go] = np.minimum(self._shipx[go] + step[go],
+            GAME_WIDTH - c.ship_half_width)
+        respawn = self._end & (self._lives > 0)
+        self._ship[respawn] = True
+        self._shipx[respawn] = GAME_WIDTH/2
+
+
+def crosscheck(n = 16, frames = 3000, seed = 0, config = DEFAULT_CONFIG):
+    """
+    Returns None if a Batch plays exactly like Wave, or else the first mismatch
+
+    This plays n games both ways, with the same seeds and random keys, until
+    each is done or frames frames have passed.  The waves are played as in
+    InvadersEnv.  A mismatch is reported as the triple (game, frame, key),
+    where key is the first key of Batch.getGame that differs.
+
+    Parameter n: the number of games
+    Precondition: n is an int > 0
+
+    Parameter frames: the largest number of frames to play
+    Precondition: frames is an int >= 0
+
+    Parameter seed: the seed for the games and the keys
+    Precondition: seed is an int >= 0
+
+    Parameter config: the settings of every game
+    Precondition: config is a GameConfig object
+    """
+    input = ScriptInput()
+    Invaders.init_headless()
+    seeds = np.random.SeedSequence(seed).spawn(n)
+    batch = Batch(n, seeds=seeds, config=config)
+    waves = [Wave(seed=s, config=config) for s in seeds]
+    rng = np.random.default_rng(seed)
+    keys = np.zeros((3, n), dtype=bool)
+    for frame in range(frames):
+        # Hold keys for a while, as a player would
+        change = rng.random(n) < 0.1
+        keys[:, change] = rng.random((3, np.count_nonzero(change))) < 0.5
+        done = batch.getDone().copy()
+        batch.step(keys[0], keys[1], keys[2])
+        for g in np.flatnonzero(~done):
+            input.setKeys([name for (name, down) in
+                zip(('left', 'right', 'spacebar'), keys[:, g]) if down])
+            waves[g].update(input, batch.getDt())
+            if waves[g].getEnd() and waves[g].getLives() > 0:
+                waves[g].setnewShip()
+            expected = _state(waves[g])
+            actual = batch.getGame(g)
+            for key in expected:
+                if not np.array_equal(expected[key], actual[key]):
+                    return (int(g), frame, key)
+    return None
+
+
+def _state(wave):
+    """
+    Returns the state of wave, in the form of Batch.getGame
+
+    Parameter wave: the wave
+    Precondition: wave is a Wave object
+    """
+    (formation, bolts, shipx, frame, animating, boomtime, clock, rates, steps,
+        shot, end, lives, lost, won, speed, rng) = wave.snapshot()
+    (x, y, right, alive, version) = formation
+    (bx, by, bvy, player) = bolts
+    return {'alive': alive, 'x': float(x), 'y': float(y), 'right': right,
+        'ship': shipx, 'exploding': animating, 'boom': float(boomtime),
+        'shot': shot, 'lives': lives, 'time': float(clock), 'steps': steps,
+        'rates': rates, 'lost': lost, 'won': won,
+        'bolts': sorted((float(bx[i]), float(by[i]), bool(player[i]))
+            for i in range(len(bx)))}
+
+
+def simulate(batch, input, frames):
+    """
+    Returns the statistics of a batch of games played with the same keys
+
+    The games run until every one is done or until frames frames have passed,
+    whichever comes first.  The result is a dictionary with the keys 'games',
+    'frames' (played by all games together), 'seconds', 'fps', 'won', 'lost',
+    'running', 'duration' (the total frames of the games that are done) and
+    'lives' (the mean lives left).
+
+    Parameter batch: the games to play
+    Precondition: batch is a Batch object
+
+    Parameter input: the keys to hold down
+    Precondition: input is a ScriptInput object
+
+    Parameter frames: the largest number of frames to play
+    Precondition: frames is an int >= 0
+    """
+    start = time.perf_counter()
+    frame = 0
+    while frame < frames and not batch.getDone().all():
+        input.advance(frame)
+        batch.step(input.is_key_down('left'), input.is_key_down('right'),
+            input.is_key_down('spacebar') or input.is_key_down('up'))
+        frame += 1
+    seconds = time.perf_counter() - start
+    played = int(batch.getFrames().sum())
+    done = batch.getDone()
+    won = int(np.count_nonzero(batch.getWon()))
+    lost = int(np.count_nonzero(done)) - won
+    return {'games': batch.getCount(), 'frames': played, 'seconds': seconds,
+            'fps': played/seconds if seconds > 0 else float('inf'),
+            'won': won, 'lost': lost, 'running': batch.getCount() - won - lost,
+            'duration': int(batch.getFrames()[done].sum()),
+            'lives': float(batch.getLives().mean())}
+
+
+def main(args, config = DEFAULT_CONFIG):
+    """
+    Plays a batch of games from the command line and prints the results
+
+    Every game gets the same keys, from the input script.
+
+    Parameter args: the parsed command line arguments
+    Precondition: args has the attributes batch, frames, seed, input and dt
+
+    Parameter config: the settings of every game
+    Precondition: config is a GameConfig object
+    """
+    frames = FRAMES if args.frames is None else args.frames
+    input = ScriptInput(load_script(args.input, frames))
+    stats = simulate(Batch(args.batch, seed=args.seed, config=config,
+        dt=args.dt), input, frames)
+    print('games:   %d' % stats['games'])
+    print('frames:  %d' % stats['frames'])
+    print('seconds: %.3f' % stats['seconds'])
+    print('fps:     %.1f' % stats['fps'])
+    print('won:     %d' % stats['won'])
+    print('lost:    %d' % stats['lost'])
+    print('running: %d' % stats['running'])
+    print('lives:   %.2f' % stats['lives'])
@@ -10,7 +10,6 @@ Jose Vizueth jdv72
 11/30/2021
 """
 import introcs
-import sys
 
 ### WINDOW CONSTANTS (all coordinates are in pixels) ###
 
@@ -25,6 +24,8 @@ GAME_HEIGHT = 700
 SHIP_IMAGE = 'ship.png'
 # the images used for the explosion of the ship
 SHIP_ANIMATION = 'ship-strip.png'
+# the rows and columns of frames in SHIP_ANIMATION
+SHIP_FORMAT = (2,4)
 # the speed of how fast the explosion animation occurs
 DEATH_SPEED = 0.3
 # the width of the ship
@@ -56,6 +57,10 @@ ALIEN_V_SEP   = 16
 ALIEN_H_WALK  = ALIEN_WIDTH // 4
 # the number of vertical pixels to move an alien
 ALIEN_V_WALK  = ALIEN_HEIGHT // 2
+# the horizontal distance between the centers of neighboring aliens
+ALIEN_H_PITCH = ALIEN_WIDTH + ALIEN_H_SEP
+# the vertical distance between the centers of neighboring aliens
+ALIEN_V_PITCH = ALIEN_HEIGHT + ALIEN_V_SEP
 # The distance of the top alien from the top of the window
 ALIEN_CEILING = 100
 # the number of rows of aliens, in range 1..10
@@ -66,6 +71,10 @@ ALIENS_IN_ROW  = 12
 ALIEN_IMAGES   = ('alien1.png','alien2.png','alien3.png')
 # the number of seconds (0 < float <= 1) between alien steps
 ALIEN_SPEED = 1
+# the shortest number of seconds between alien steps, for the fastest waves
+ALIEN_MIN_SPEED = 1/30
+# the most alien steps to take in one update (the rest are dropped)
+ALIEN_MAX_STEPS = 4
 
 
 ### BOLT CONSTANTS ###
@@ -78,10 +87,33 @@ BOLT_HEIGHT = 16
 BOLT_SPEED  = 10
 # the number of ALIEN STEPS (not frames) between bolts
 BOLT_RATE   = 5
+# the largest number of laser bolts that can be on screen at once
+BOLT_CAPACITY = 256
 
 
 ### GAME CONSTANTS ###
 
+# the number of seconds in each fixed simulation step
+TIMESTEP = 1/60
+# the most simulation steps to take in one animation frame
+MAX_STEPS = 5
+# the number of frames in each chunk of a recording (see replay.py)
+REPLAY_EVERY = 600
+# the number of seconds of play the rewind buffer keeps (see rewind.py)
+REWIND_SECONDS = 10
+# the number of frames between full states in the rewind buffer
+REWIND_EVERY = 60
+# the most bytes the rewind buffer may use
+REWIND_BUDGET = 4*1024*1024
+# the key to hold down to rewind the game
+REWIND_KEY = 'r'
+# the layer of the view for scenery that only changes with the wave
+LAYER_SCENERY = 'scenery'
+# the layer of the view for messages, drawn over everything else
+LAYER_HUD = 'hud'
+# the layers of the view besides 'default' (depth 0), as (name, depth, static)
+LAYERS = ((LAYER_SCENERY, -1, True), (LAYER_HUD, 1, False))
+
 # state before the game has started
 STATE_INACTIVE = 0
 # state when we are initializing a new wave
@@ -96,6 +128,164 @@ STATE_CONTINUE = 4
 STATE_COMPLETE = 5
 
 
+### GAME CONFIGURATION
+"""
+The constants above are the defaults of the game.  The ones that describe a
+wave (the sizes, speeds and counts of the ship, aliens and bolts) can differ
+from one wave to the next, even in the same process, by giving the wave a
+GameConfig.  A model or wave reads these values from its configuration, and
+never from the constants directly.
+"""
+
+class GameConfig(object):
+    """
+    A class representing the settings of a wave, as an immutable object.
+
+    Each setting is an attribute named after its constant in lower case, so
+    ALIEN_ROWS is the attribute alien_rows.  The settings not given to the
+    initializer have the values of the constants.  A configuration also keeps
+    values derived from the settings (such as half widths), so that they are
+    not recomputed every frame.
+
+    The attributes cannot be changed.  Use replace to make a configuration that
+    differs in a few settings.  Two configurations with the same settings are
+    equal, and can be used as dictionary keys.
+    """
+    # ATTRIBUTES (the settings, with the constant each one defaults to):
+    # ship_width (SHIP_WIDTH), ship_height (SHIP_HEIGHT), ship_bottom
+    # (SHIP_BOTTOM), ship_movement (SHIP_MOVEMENT), ship_lives (SHIP_LIVES),
+    # death_speed (DEATH_SPEED), defense_line (DEFENSE_LINE), alien_width
+    # (ALIEN_WIDTH), alien_height (ALIEN_HEIGHT), alien_h_sep (ALIEN_H_SEP),
+    # alien_v_sep (ALIEN_V_SEP), alien_ceiling (ALIEN_CEILING), alien_rows
+    # (ALIEN_ROWS), aliens_in_row (ALIENS_IN_ROW), alien_speed (ALIEN_SPEED),
+    # alien_min_speed (ALIEN_MIN_SPEED), alien_max_steps (ALIEN_MAX_STEPS),
+    # bolt_width (BOLT_WIDTH), bolt_height (BOLT_HEIGHT), bolt_speed
+    # (BOLT_SPEED), bolt_rate (BOLT_RATE), bolt_capacity (BOLT_CAPACITY)
+    #
+    # DERIVED ATTRIBUTES:
+    # alien_h_walk, alien_v_walk, alien_h_pitch, alien_v_pitch: as the
+    # constants of the same names, computed from the settings
+    # alien_half_width, alien_half_height, bolt_half_width, bolt_half_height,
+    # ship_half_width, ship_half_height: half of the matching sizes
+    # ship_y: the vertical coordinate of the center of a ship
+
+    # the settings, in order
+    SETTINGS = ('ship_width', 'ship_height', 'ship_bottom', 'ship_movement',
+        'ship_lives', 'death_speed', 'defense_line', 'alien_width',
+        'alien_height', 'alien_h_sep', 'alien_v_sep', 'alien_ceiling',
+        'alien_rows', 'aliens_in_row', 'alien_speed', 'alien_min_speed',
+        'alien_max_steps', 'bolt_width', 'bolt_height', 'bolt_speed',
+        'bolt_rate', 'bolt_capacity')
+    # the values computed from the settings
+    DERIVED = ('alien_h_walk', 'alien_v_walk', 'alien_h_pitch', 'alien_v_pitch',
+        'alien_half_width', 'alien_half_height', 'bolt_half_width',
+        'bolt_half_height', 'ship_half_width', 'ship_half_height', 'ship_y')
+    __slots__ = SETTINGS + DERIVED
+
+    def __init__(self, **settings):
+        """
+        Initializes a configuration with the given settings
+
+        Parameter settings: the settings that differ from the constants
+        Precondition: each key is in SETTINGS, with a value of the same kind
+        as its constant
+        """
+        for name in settings:
+            if name not in self.SETTINGS:
+                raise TypeError('%s is not a setting' % repr(name))
+        for name in self.SETTINGS:
+            value = settings[name] if name in settings else \
+            globals()[name.upper()]
+            object.__setattr__(self, name, value)
+        derived = {
+            'alien_h_walk': self.alien_width // 4,
+            'alien_v_walk': self.alien_height // 2,
+            'alien_h_pitch': self.alien_width + self.alien_h_sep,
+            'alien_v_pitch': self.alien_height + self.alien_v_sep,
+            'alien_half_width': self.alien_width/2,
+            'alien_half_height': self.alien_height/2,
+            'bolt_half_width': self.bolt_width/2,
+            'bolt_half_height': self.bolt_height/2,
+            'ship_half_width': self.ship_width/2,
+            'ship_half_height': self.ship_height/2,
+            'ship_y': self.ship_bottom + (self.ship_height/2)}
+        for name in self.DERIVED:
+            object.__setattr__(self, name, derived[name])
+
+    def replace(self, **settings):
+        """
+        Returns a copy of this configuration with the given settings changed
+
+        Parameter settings: the settings to change
+        Precondition: each key is in SETTINGS, with a value of the same kind
+        as its constant
+        """
+        values = self.getSettings()
+        values.update(settings)
+        return GameConfig(**values)
+
+    def getSettings(self):
+        """
+        Returns the settings of this configuration as a new dictionary
+        """
+        return {name: getattr(self, name) for name in self.SETTINGS}
+
+    def __setattr__(self, name, value):
+        """
+        Refuses to change an attribute, as a configuration is immutable
+        """
+        raise AttributeError('a GameConfig cannot be changed; use replace')
+
+    def __delattr__(self, name):
+        """
+        Refuses to delete an attribute, as a configuration is immutable
+        """
+        raise AttributeError('a GameConfig cannot be changed; use replace')
+
+    def __eq__(self, other):
+        """
+        Returns True if other is a configuration with the same settings
+        """
+        return isinstance(other, GameConfig) and \
+        all(getattr(self, name) == getattr(other, name)
+            for name in self.SETTINGS)
+
+    def __hash__(self):
+        """
+        Returns a hash of the settings
+        """
+        return hash(tuple(getattr(self, name) for name in self.SETTINGS))
+
+    def __repr__(self):
+        """
+        Returns the settings that differ from the constants, as a call
+        """
+        changed = ['%s=%s' % (name, repr(getattr(self, name)))
+            for name in self.SETTINGS
+            if getattr(self, name) != globals()[name.upper()]]
+        return 'GameConfig(%s)' % ', '.join(changed)
+
+    def __reduce__(self):
+        """
+        Returns how to pickle this configuration, for worker processes
+        """
+        return (_config, (self.getSettings(),))
+
+
+def _config(settings):
+    """
+    Returns a configuration with the given settings (used by pickle)
+
+    Parameter settings: the settings
+    Precondition: settings is a dictionary returned by GameConfig.getSettings
+    """
+    return GameConfig(**settings)
+
+
+# the configuration of a wave when none is given
+DEFAULT_CONFIG = GameConfig()
+
+
 ### USE COMMAND LINE ARGUMENTS TO CHANGE NUMBER OF ALIENS IN A ROW
 """
 sys.argv is a list of the command line arguments when you run Python. These
@@ -103,29 +293,37 @@ arguments are everything after the word python. So if you start the game typing
 
     python invaders 3 4 0.5
 
-Python puts ['breakout.py', '3', '4', '0.5'] into sys.argv. Below, we take
-advantage of this fact to change the constants ALIEN_ROWS, ALIENS_IN_ROW, and
-ALIEN_SPEED.
+Python puts ['breakout.py', '3', '4', '0.5'] into sys.argv.  The script
+__main__.py reads the first three of these and gives them to the function
+below, to change ALIEN_ROWS, ALIENS_IN_ROW and ALIEN_SPEED for that game.
+Nothing reads sys.argv when this module is imported, so importing the game
+(for example, from a test runner) does not depend on the command line.
 """
-try:
-    rows = int(sys.argv[1])
-    if rows >= 1 and rows <= 10:
-        ALIEN_ROWS = rows
-except:
-    pass # Use original value
-
-try:
-    perrow = int(sys.argv[2])
-    if perrow >= 1 and perrow <= 15:
-        ALIENS_IN_ROW = perrow
-except:
-    pass # Use original value
-
-try:
-    speed = float(sys.argv[3])
-    if speed > 0 and speed <= 3:
-        ALIEN_SPEED = speed
-except:
-    pass # Use original value
+
+def config_from_args(rows = None, perrow = None, speed = None):
+    """
+    Returns the default configuration with the size and speed of the aliens
+    from the command line
+
+    A value that is missing or out of range is ignored, and the constant is
+    used instead.
+
+    Parameter rows: the number of rows of aliens, in 1..10
+    Precondition: rows is an int or None
+
+    Parameter perrow: the number of aliens in each row, in 1..15
+    Precondition: perrow is an int or None
+
+    Parameter speed: the number of seconds between alien steps, in (0,3]
+    Precondition: speed is a number or None
+    """
+    settings = {}
+    if rows is not None and rows >= 1 and rows <= 10:
+        settings['alien_rows'] = rows
+    if perrow is not None and perrow >= 1 and perrow <= 15:
+        settings['aliens_in_row'] = perrow
+    if speed is not None and speed > 0 and speed <= 3:
+        settings['alien_speed'] = speed
+    return DEFAULT_CONFIG.replace(**settings)
 
 ### ADD MORE CONSTANTS (PROPERLY COMMENTED) AS NECESSARY ###
@@ -0,0 +1,214 @@
+"""
+Gym-style environment for Alien Invaders
+
+This module lets a program (such as a bot being trained) play single waves of
+Alien Invaders, one update at a time, without a window.  It follows the shape of
+the Gym API:
+
+    env = InvadersEnv()
+    obs = env.reset(seed=7)
+    done = False
+    while not done:
+        (obs, reward, done, info) = env.step(policy(obs))
+
+An action is an index into ACTIONS.  The observation is a dictionary of numpy
+arrays that are made once and overwritten by every call to reset and step, so
+stepping allocates no arrays.  Copy them if you need to keep them.
+
+    'ship':   shape (1,), the x coordinate of the ship (nan if there is none)
+    'alive':  shape (alien_rows,aliens_in_row), the living aliens (row 0 is
+              the bottom row)
+    'offset': shape (2,), the center of the bottom-left alien cell
+    'bolts':  shape (bolt_capacity,3), (x, y, vy) of each bolt; vy > 0 for a
+              player bolt, and the rows past the last bolt are 0
+    'count':  shape (1,), the number of bolts
+
+The sizes are those of the GameConfig of the environment.
+
+When the ship is destroyed, the next ship appears as soon as the explosion ends
+(there is no pause).  The episode is done when the wave is won or lost.
+
+Jose Vizueth jdv72
+10/18/2026
+"""
+from consts import *
+from app import *
+from headless import ScriptInput
+import numpy as np
+
+# the keys held down for each action
+ACTIONS = ((), ('left',), ('right',), ('spacebar',), ('left', 'spacebar'),
+    ('right', 'spacebar'))
+# the reward for each alien killed
+REWARD_KILL = 1
+# the reward for each life lost
+REWARD_LIFE = -10
+# the reward for destroying every alien
+REWARD_WIN = 10
+# the reward for letting the aliens reach the defense line
+REWARD_LOSS = -10
+
+
+class InvadersEnv(object):
+    """
+    A class representing a single wave of Alien Invaders as an environment.
+
+    The wave is made once.  Every reset returns it to its first state (see
+    Wave.snapshot) and reseeds it, which is much faster than making a new wave.
+    """
+    # HIDDEN ATTRIBUTES:
+    # Attribute _input: the keys held down, set from the action
+    # Invariant: _input is a ScriptInput object
+    #
+    # Attribute _wave: the wave being played
+    # Invariant: _wave is a Wave object
+    #
+    # Attribute _start: the first state of the wave
+    # Invariant: _start is a tuple returned by Wave.snapshot
+    #
+    # Attribute _dt: the time in seconds of each step
+    # Invariant: _dt is a float > 0
+    #
+    # Attribute _limit: the most steps in an episode
+    # Invariant: _limit is an int > 0, or None for no limit
+    #
+    # Attribute _steps: the number of steps taken in this episode
+    # Invariant: _steps is an int >= 0
+    #
+    # Attribute _done: True if the episode is over
+    # Invariant: _done is a bool
+    #
+    # Attribute _obs: the observation (see the module description)
+    # Invariant: _obs is a dict of numpy arrays
+    #
+    # Attribute _bolts: the number of bolt rows filled in the last observation
+    # Invariant: _bolts is an int in 0..bolt_capacity
+    #
+    # Attribute _info: the extra information returned by step
+    # Invariant: _info is a dict with the keys 'steps', 'lives' and 'aliens'
+
+    # GETTERS
+    def getObservation(self):
+        """
+        Returns the current observation (see the module description)
+        """
+        return self._obs
+
+    def getWave(self):
+        """
+        Returns the wave being played
+        """
+        return self._wave
+
+    def isDone(self):
+        """
+        Returns True if the episode is over
+        """
+        return self._done
+
+    # INITIALIZER
+    def __init__(self, dt = TIMESTEP, limit = None, shooter = None,
+    config = DEFAULT_CONFIG):
+        """
+        Initializes an environment with a new wave
+
+        Call reset before the first step.
+
+        Parameter dt: the time in seconds of each step
+        Precondition: dt is a float > 0
+
+        Parameter limit: the most steps in an episode
+        Precondition: limit is an int > 0, or None for no limit
+
+        Parameter shooter: the policy that picks which alien fires next
+        Precondition: shooter is a Shooter object, or None for a uniform choice
+
+        Parameter config: the settings of the wave
+        Precondition: config is a GameConfig object
+        """
+        self._input = ScriptInput()
+        Invaders.init_headless()
+        self._wave = Wave(shooter = shooter, config = config)
+        self._start = self._wave.snapshot()
+        self._dt = dt
+        self._limit = limit
+        self._steps = 0
+        self._done = True
+        self._obs = {'ship': np.zeros(1),
+                     'alive': np.zeros((config.alien_rows,
+                                        config.aliens_in_row), dtype=bool),
+                     'offset': np.zeros(2),
+                     'bolts': np.zeros((config.bolt_capacity, 3)),
+                     'count': np.zeros(1, dtype=int)}
+        self._bolts = 0
+        self._info = {'steps': 0, 'lives': config.ship_lives, 'aliens': 0}
+
+    # ENVIRONMENT METHODS
+    def reset(self, seed = None):
+        """
+        Returns the first observation of a new episode
+
+        Parameter seed: the seed for the random generator of the wave
+        Precondition: seed is an int >= 0, a numpy SeedSequence, or None (for
+        a different episode every time)
+        """
+        self._wave.restore(self._start)
+        self._wave.reseed(seed)
+        self._input.setKeys(())
+        self._steps = 0
+        self._done = False
+        self._observe()
+        return self._obs
+
+    def step(self, action):
+        """
+        Returns (observation, reward, done, info) after one update with action
+
+        The reward is REWARD_KILL for each alien killed, plus REWARD_LIFE for
+        each life lost, plus REWARD_WIN or REWARD_LOSS when the wave ends.  The
+        info is a dictionary with the number of steps, the lives left and the
+        aliens left; like the observation, it is reused.
+
+        Parameter action: the action to take
+        Precondition: action is an int in 0..len(ACTIONS)-1, and the episode
+        is not done
+        """
+        assert not self._done, 'the episode is over; call reset'
+        wave = self._wave
+        aliens = wave.getAlienCount()
+        lives = wave.getLives()
+        self._input.setKeys(ACTIONS[action])
+        wave.update(self._input, self._dt)
+        if wave.getEnd() and wave.getLives() > 0:
+            wave.setnewShip()
+        self._steps += 1
+        reward = REWARD_KILL*(aliens - wave.getAlienCount()) + \
+        REWARD_LIFE*(lives - wave.getLives())
+        if wave.aliensLost():
+            reward += REWARD_WIN
+        elif wave.aliensWon():
+            reward += REWARD_LOSS
+        self._done = wave.aliensLost() or wave.aliensWon() or \
+        wave.getLives() <= 0 or \
+        (self._limit is not None and self._steps >= self._limit)
+        self._observe()
+        return (self._obs, reward, self._done, self._info)
+
+    # HELPER METHODS
+    def _observe(self):
+        """
+        Writes the state of the wave into the observation and info
+        """
+        wave = self._wave
+        obs = self._obs
+        x = wave.getShipX()
+        obs['ship'][0] = np.nan if x is None else x
+        wave.copyAliens(obs['alive'], obs['offset'])
+        count = wave.copyBolts(obs['bolts'])
+        if count < self._bolts:
+            obs['bolts'][count:self._bolts] = 0
+        self._bolts = count
+        obs['count'][0] = count
+        self._info['steps'] = self._steps
+        self._info['lives'] = wave.getLives()
+        self._info['aliens'] = wave.getAlienCount()
@@ -0,0 +1,525 @@
+"""
+Simulation farm for Alien Invaders
+
+This module spreads the tasks of a sweep (see sweep.py) over several machines.
+One coordinator hands out the tasks over TCP, and any number of workers pull
+them, play them and send back the results.  Start the coordinator with the
+options of a sweep and an address to listen on
+
+    python invaders --sweep results.csv --grid speed=0.25,0.5,1 --games 20000 \\
+        --seed 7 --serve 0.0.0.0:5599
+
+and then start workers on every machine, each with a number of processes
+
+    python invaders --worker coordinator.example.com:5599 --jobs 8
+
+A bare port (such as --serve 5599) listens on the loopback interface only, so
+workers must run on the same machine.  The protocol has no authentication:
+anyone who can reach the address can take tasks and send results, so only
+serve a network you trust.
+
+The results are the same as those of the sweep run on one machine: the tasks
+and their seeds are made by the coordinator, and a task plays the same games
+wherever it runs.  Workers can join at any time.  If a worker goes away (its
+connection closes) or does not finish a task within FARM_LEASE seconds, its
+unfinished tasks are handed to another worker.  If a task is finished twice,
+the first result is kept.  A result is only accepted for a task that was
+handed to the same connection; a malformed result closes the connection.  The
+coordinator stops when every task is finished, and the workers stop when they
+hear that (or lose the coordinator).
+
+The protocol is a sequence of requests from the worker, each answered by one
+reply from the coordinator.  Every message is a JSON object, preceded by its
+length in bytes as a 4-byte little-endian unsigned int.  The requests are
+
+    {"get": N}          ask for up to N tasks
+    {"put": [RESULT]}   return finished tasks
+
+and the replies are
+
+    {"jobs": [JOB]}     the tasks, or an empty list if the worker should wait
+                        a moment and ask again
+    {"done": true}      every task is finished; the worker should stop
+    {}                  the results were received
+
+A JOB is an object with the keys "id", "cell" (the parameters, as returned by
+sweep.cells), "games", "frames", "seed" (the entropy and spawn key of a numpy
+SeedSequence), "script", "dt" and "config" (the settings of the GameConfig of
+the games, apart from the cell).  A RESULT is the list [id, games, won, lost,
+frames, seconds, duration], where the last five are from batch.simulate.
+
+Jose Vizueth jdv72
+10/18/2026
+"""
+from consts import *
+from headless import load_script, FRAMES
+import sweep
+import numpy as np
+import collections
+import itertools
+import json
+import multiprocessing
+import socket
+import socketserver
+import struct
+import threading
+import time
+
+# the length of a message, before the message
+_LENGTH = struct.Struct('<I')
+# the largest message accepted, in bytes
+FARM_MESSAGE = 64*1024*1024
+# the seconds a worker has to finish a task before it is handed out again
+FARM_LEASE = 600
+# the number of tasks a worker asks for at a time
+FARM_FETCH = 2
+# the seconds a worker waits before asking again when there is no task
+FARM_WAIT = 0.5
+# the seconds a worker keeps trying to reach the coordinator
+FARM_CONNECT = 30
+# the host a coordinator listens on when only a port is given
+FARM_HOST = '127.0.0.1'
+# the statistics of a task sent back to the coordinator, in order
+_RESULT = ('games', 'won', 'lost', 'frames', 'seconds', 'duration')
+
+
+def send(sock, message):
+    """
+    Sends a message over a socket
+
+    Parameter sock: the connection
+    Precondition: sock is a connected socket
+
+    Parameter message: the message
+    Precondition: message is a dictionary that can be written as JSON
+    """
+    data = json.dumps(message, separators=(',', ':')).encode('utf-8')
+    sock.sendall(_LENGTH.pack(len(data)) + data)
+
+
+def receive(sock):
+    """
+    Returns the next message from a socket, or None if it was closed
+
+    Parameter sock: the connection
+    Precondition: sock is a connected socket
+    """
+    head = _read(sock, _LENGTH.size)
+    if head is None:
+        return None
+    (length,) = _LENGTH.unpack(head)
+    if length > FARM_MESSAGE:
+        raise IOError('message of %d bytes is too long' % length)
+    data = _read(sock, length)
+    if data is None:
+        return None
+    return json.loads(data.decode('utf-8'))
+
+
+def _read(sock, size):
+    """
+    Returns exactly size bytes from a socket, or None if it was closed first
+
+    Parameter sock: the connection
+    Precondition: sock is a connected socket
+
+    Parameter size: the number of bytes
+    Precondition: size is an int >= 0
+    """
+    data = bytearray()
+    while len(data) < size:
+        chunk = sock.recv(size - len(data))
+        if not chunk:
+            return None
+        data += chunk
+    return bytes(data)
+
+
+def address(text):
+    """
+    Returns the pair (host, port) for an address of the form HOST:PORT or PORT
+
+    A bare PORT has the host FARM_HOST (the loopback interface), so a
+    coordinator only serves other machines when given a host.  This is the
+    type of the --serve and --worker options.
+
+    Parameter text: the address
+    Precondition: text is a string
+    """
+    (host, sep, port) = text.rpartition(':')
+    return (host or FARM_HOST, int(port))
+
+
+class Queue(object):
+    """
+    A class representing the tasks of a sweep, as handed out to workers.
+
+    A task is waiting, leased (handed to a worker and not yet finished) or
+    finished.  Every method is safe to call from several threads.
+    """
+    # HIDDEN ATTRIBUTES:
+    # Attribute _jobs: the tasks, as messages for the workers
+    # Invariant: _jobs is a list of JOB dictionaries (see the module
+    # description), where _jobs[i]['id'] is i
+    #
+    # Attribute _cells: the cell of each task
+    # Invariant: _cells is a list of ints, the same length as _jobs
+    #
+    # Attribute _waiting: the tasks not handed out, oldest first
+    # Invariant: _waiting is a deque of task ids
+    #
+    # Attribute _leases: the leased tasks
+    # Invariant: _leases is a dict from task id to the pair (owner, deadline),
+    # where owner identifies the worker and deadline is a time.monotonic() time
+    #
+    # Attribute _results: the finished tasks not yet taken by next
+    # Invariant: _results is a deque of (cell, stats) pairs
+    #
+    # Attribute _left: the number of tasks not finished
+    # Invariant: _left is an int >= 0
+    #
+    # Attribute _finished: whether each task is finished
+    # Invariant: _finished is a list of bools, the same length as _jobs
+    #
+    # Attribute _owners: the workers each task has been handed to
+    # Invariant: _owners is a list of sets, the same length as _jobs
+    #
+    # Attribute _lock: the lock guarding the attributes above
+    # Invariant: _lock is a threading.Condition
+
+    def __init__(self, table, work, frames, script = (), dt = TIMESTEP,
+    config = DEFAULT_CONFIG):
+        """
+        Initializes a queue with every task waiting
+
+        Parameter table: the cells of the sweep
+        Precondition: table is a list returned by sweep.cells
+
+        Parameter work: the tasks of the sweep
+        Precondition: work is a list returned by sweep.tasks
+
+        Parameter frames: the largest number of frames to play in each game
+        Precondition: frames is an int >= 0
+
+        Parameter script: the key changes to make in every game
+        Precondition: script is a sequence of (frame, keys) pairs (see
+        ScriptInput)
+
+        Parameter dt: the time in seconds of each frame
+        Precondition: dt is a float > 0
+
+        Parameter config: the settings of the games, apart from the swept ones
+        Precondition: config is a GameConfig object
+        """
+        script = [[frame, list(keys)] for (frame, keys) in script]
+        settings = config.getSettings()
+        self._jobs = []
+        self._cells = []
+        for (i, n, seed) in work:
+            self._jobs.append({'id': len(self._jobs), 'cell': table[i],
+                'games': n, 'frames': frames, 'script': script, 'dt': dt,
+                'seed': [seed.entropy, list(seed.spawn_key)],
+                'config': settings})
+            self._cells.append(i)
+        self._waiting = collections.deque(range(len(self._jobs)))
+        self._leases = {}
+        self._results = collections.deque()
+        self._left = len(self._jobs)
+        self._finished = [False]*len(self._jobs)
+        self._owners = [set() for job in self._jobs]
+        self._lock = threading.Condition()
+
+    def isDone(self):
+        """
+        Returns True if every task is finished
+        """
+        with self._lock:
+            return self._left == 0
+
+    def lease(self, owner, count):
+        """
+        Returns up to count tasks for a worker, as JOB dictionaries
+
+        Leases that have run out are handed out again first.  The result is
+        empty if every unfinished task is leased.
+
+        Parameter owner: the worker
+        Precondition: owner is any hashable value that identifies the worker
+
+        Parameter count: the most tasks to return
+        Precondition: count is an int > 0
+        """
+        with self._lock:
+            now = time.monotonic()
+            for (job, (holder, deadline)) in list(self._leases.items()):
+                if deadline <= now:
+                    del self._leases[job]
+                    self._waiting.appendleft(job)
+            result = []
+            while len(result) < count and len(self._waiting) > 0:
+                job = self._waiting.popleft()
+                if not self._finished[job]:
+                    self._leases[job] = (owner, now + FARM_LEASE)
+                    self._owners[job].add(owner)
+                    result.append(self._jobs[job])
+            return result
+
+    def finish(self, owner, result):
+        """
+        Records a finished task, unless it was finished before
+
+        The result comes from a worker, so it is checked.  This raises a
+        ValueError if it is not a RESULT list, if it names no task, or if the
+        task was never handed to owner (even if that lease has run out).
+
+        Parameter owner: the worker
+        Precondition: owner is a value given to lease
+
+        Parameter result: the result of the task
+        Precondition: result is any value read from a message
+        """
+        if type(result) != list or len(result) != len(_RESULT) + 1 or \
+        not all(type(value) in (int, float) for value in result):
+            raise ValueError('malformed result %s' % repr(result)[:80])
+        job = result[0]
+        if type(job) != int or not 0 <= job < len(self._jobs):
+            raise ValueError('no task %s' % repr(job))
+        with self._lock:
+            if not owner in self._owners[job]:
+                raise ValueError('task %d was not leased to this worker' % job)
+            if self._finished[job]:
+                return
+            self._finished[job] = True
+            self._leases.pop(job, None)
+            self._left -= 1
+            self._results.append((self._cells[job], dict(zip(_RESULT,
+                result[1:]))))
+            self._lock.notify_all()
+
+    def release(self, owner):
+        """
+        Puts the unfinished tasks leased by a worker back in the queue
+
+        Parameter owner: the worker
+        Precondition: owner is a value given to lease
+        """
+        with self._lock:
+            for (job, (holder, deadline)) in list(self._leases.items()):
+                if holder == owner:
+                    del self._leases[job]
+                    self._waiting.appendleft(job)
+
+    def next(self):
+        """
+        Returns the next finished task as the pair (cell, stats), or None
+
+        This waits until a task is finished.  It returns None once the result
+        of every task has been returned.
+        """
+        with self._lock:
+            while len(self._results) == 0 and self._left > 0:
+                self._lock.wait()
+            if len(self._results) == 0:
+                return None
+            return self._results.popleft()
+
+
+class _Handler(socketserver.BaseRequestHandler):
+    """
+    A class that answers the requests of one worker connection.
+
+    The queue is the attribute queue of the server, and each connection takes
+    a number from its attribute owners to identify the worker.
+    """
+
+    def handle(self):
+        """
+        Answers requests until the worker closes the connection
+
+        Whatever happens, the tasks still leased to the worker are put back.
+        """
+        queue = self.server.queue
+        owner = next(self.server.owners)
+        try:
+            while True:
+                message = receive(self.request)
+                if message is None:
+                    return
+                if 'put' in message:
+                    for result in message['put']:
+                        queue.finish(owner, result)
+                    send(self.request, {})
+                elif queue.isDone():
+                    send(self.request, {'done': True})
+                else:
+                    send(self.request,
+                        {'jobs': queue.lease(owner, int(message['get']))})
+        except (OSError, ValueError, KeyError, TypeError, IndexError):
+            pass
+        finally:
+            queue.release(owner)
+
+
+class _Server(socketserver.ThreadingTCPServer):
+    """
+    A TCP server with one thread per worker connection.
+    """
+    allow_reuse_address = True
+    daemon_threads = True
+
+
+def serve(grid, where, games = sweep.GAMES, frames = FRAMES, seed = None,
+script = (), dt = TIMESTEP, config = DEFAULT_CONFIG):
+    """
+    Yields the results of every cell of a grid, as each cell is finished
+
+    This is sweep.sweep, with the tasks played by workers that connect to the
+    given address.  Each result is a dictionary with the parameters of the cell
+    and the keys of sweep.COLUMNS.
+
+    Parameter grid: the values of the swept parameters
+    Precondition: grid is a sequence of (name, values) pairs returned by
+    sweep.axis, with no name repeated
+
+    Parameter where: the address to listen on
+    Precondition: where is a (host, port) pair
+
+    Parameter games: the number of games in each cell
+    Precondition: games is an int > 0
+
+    Parameter frames: the largest number of frames to play in each game
+    Precondition: frames is an int >= 0
+
+    Parameter seed: the seed of the sweep
+    Precondition: seed is an int >= 0 or None (for a random seed)
+
+    Parameter script: the key changes to make in every game
+    Precondition: script is a sequence of (frame, keys) pairs (see ScriptInput)
+
+    Parameter dt: the time in seconds of each frame
+    Precondition: dt is a float > 0
+
+    Parameter config: the settings of the games, apart from the swept ones
+    Precondition: config is a GameConfig object
+    """
+    table = sweep.cells(grid, config)
+    work = sweep.tasks(grid, games, seed)
+    tally = sweep.Tally(table, work, dt)
+    queue = Queue(table, work, frames, script, dt, config)
+    server = _Server(where, _Handler)
+    server.queue = queue
+    server.owners = itertools.count()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        while True:
+            result = queue.next()
+            if result is None:
+                break
+            row = tally.add(*result)
+            if row is not None:
+                yield row
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def play(job):
+    """
+    Returns the RESULT of a task (see the module description)
+
+    Parameter job: the task
+    Precondition: job is a JOB dictionary (see the module description)
+    """
+    (entropy, key) = job['seed']
+    seed = np.random.SeedSequence(entropy, spawn_key=tuple(key))
+    script = [(frame, tuple(keys)) for (frame, keys) in job['script']]
+    config = GameConfig(**job['config'])
+    stats = sweep.play(job['cell'], seed, job['games'], job['frames'], script,
+        job['dt'], config)
+    return [job['id']] + [stats[key] for key in _RESULT]
+
+
+def work(where, fetch = FARM_FETCH):
+    """
+    Plays tasks from a coordinator until there are none left
+
+    This returns the number of tasks played.  It keeps trying to connect for
+    FARM_CONNECT seconds, so it can be started before the coordinator.  Once
+    connected, losing the coordinator ends the work (the coordinator stops
+    as soon as the sweep is finished, possibly before it says so).
+
+    Parameter where: the address of the coordinator
+    Precondition: where is a (host, port) pair
+
+    Parameter fetch: the number of tasks to ask for at a time
+    Precondition: fetch is an int > 0
+    """
+    sock = _connect(where)
+    played = 0
+    try:
+        while True:
+            send(sock, {'get': fetch})
+            reply = receive(sock)
+            if reply is None or reply.get('done'):
+                return played
+            if len(reply['jobs']) == 0:
+                time.sleep(FARM_WAIT)
+            for job in reply['jobs']:
+                send(sock, {'put': [play(job)]})
+                if receive(sock) is None:
+                    return played
+                played += 1
+    except ConnectionError:
+        return played
+    finally:
+        sock.close()
+
+
+def _connect(where):
+    """
+    Returns a socket connected to a coordinator
+
+    This keeps trying for FARM_CONNECT seconds before giving up.
+
+    Parameter where: the address of the coordinator
+    Precondition: where is a (host, port) pair
+    """
+    (host, port) = where
+    stop = time.monotonic() + FARM_CONNECT
+    while True:
+        try:
+            return socket.create_connection((host or 'localhost', port))
+        except OSError:
+            if time.monotonic() >= stop:
+                raise
+            time.sleep(FARM_WAIT)
+
+
+def main(args, config = DEFAULT_CONFIG):
+    """
+    Runs a coordinator or the workers of a machine from the command line
+
+    A coordinator writes the results to a file, as sweep.main does.  A worker
+    machine starts one process per job and prints how many tasks each played.
+    The settings of a worker come from the coordinator, so it ignores config.
+
+    Parameter args: the parsed command line arguments
+    Precondition: args has the attributes serve, worker, sweep, grid, games,
+    frames, seed, input, dt and jobs
+
+    Parameter config: the settings of the games, apart from the swept ones
+    Precondition: config is a GameConfig object
+    """
+    if args.worker is not None:
+        jobs = args.jobs or multiprocessing.cpu_count()
+        with multiprocessing.Pool(jobs) as pool:
+            counts = pool.map(work, [args.worker]*jobs)
+        print('played %d tasks in %d processes' % (sum(counts), jobs))
+        return
+    grid = args.grid or []
+    frames = FRAMES if args.frames is None else args.frames
+    script = load_script(args.input, frames)
+    results = serve(grid, args.serve, args.games, frames, args.seed, script,
+        args.dt, config)
+    sweep.write(args.sweep, results, len(sweep.cells(grid, config)))
@@ -0,0 +1,449 @@
+"""
+Randomized input fuzzer for Alien Invaders
+
+This module plays many waves with random input and checks the invariants of
+the wave after every frame (see Wave.checkInvariants), to find the rare bugs
+that only show up after a long, strange sequence of frames.  Run it with
+
+    python invaders --fuzz 1000 --frames 3000 --seed 7 --jobs 8
+
+Every case is a wave with a random GameConfig (the size of the formation, the
+speeds, the bolt rate and the lives), a random seed and a random trace.  A
+trace is a list of (keys, dt) pairs, one per frame.  The keys are held down
+for runs of frames, and dt is usually TIMESTEP but sometimes anything up to
+FUZZ_MAX_DT, as after a slow frame.  Besides Wave.checkInvariants, the number
+of living aliens and the number of lives may never go up, and update may
+never raise an error.
+
+When a case fails, its trace is shrunk: it is cut at the failing frame, runs
+of frames are removed, and the remaining frames are made plain (no keys, a
+dt of TIMESTEP), as long as the case still fails the same way.  What is left
+is usually a handful of frames that show the bug.
+
+The cases are split into tasks of FUZZ_CHUNK cases and fanned out over a pool
+of processes.  Each case gets its own seed, spawned from the seed of the run,
+so a failure can be played again with check.
+
+Jose Vizueth jdv72
+10/18/2026
+"""
+from consts import *
+from app import *
+from headless import ScriptInput
+import numpy as np
+import concurrent.futures
+import time
+import sys
+
+# the number of frames in each case if not given on the command line
+FUZZ_FRAMES = 3000
+# the number of cases in each task
+FUZZ_CHUNK = 20
+# the longest dt in a trace
+FUZZ_MAX_DT = 0.25
+# the chance that a frame of a trace has a random dt
+FUZZ_SLOW = 0.05
+# the mean number of frames that the same keys are held down
+FUZZ_RUN = 20
+# the most times a failing case is played again while shrinking it
+FUZZ_SHRINK = 2000
+# the keys that a trace holds down
+KEYS = ('left', 'right', 'spacebar', 'up')
+
+
+def random_config(rng):
+    """
+    Returns a GameConfig with random values for the settings being fuzzed
+
+    The formation is 1..10 rows of 1..15 aliens (the sizes allowed on the
+    command line).
+
+    Parameter rng: the random generator
+    Precondition: rng is a numpy Generator
+    """
+    return DEFAULT_CONFIG.replace(alien_rows=int(rng.integers(1, 11)),
+        aliens_in_row=int(rng.integers(1, 16)),
+        alien_speed=float(rng.uniform(ALIEN_MIN_SPEED/2, 1)),
+        bolt_rate=int(rng.integers(1, 2*BOLT_RATE+1)),
+        bolt_speed=float(rng.uniform(1, 2*BOLT_SPEED)),
+        ship_lives=int(rng.integers(1, SHIP_LIVES+1)))
+
+
+def random_trace(rng, frames):
+    """
+    Returns a random trace, as a list of (keys, dt) pairs
+
+    Parameter rng: the random generator
+    Precondition: rng is a numpy Generator
+
+    Parameter frames: the number of frames in the trace
+    Precondition: frames is an int >= 0
+    """
+    trace = []
+    while len(trace) < frames:
+        keys = tuple(key for key in KEYS if rng.random() < 0.5)
+        for i in range(min(int(rng.geometric(1/FUZZ_RUN)), frames-len(trace))):
+            dt = float(rng.uniform(0, FUZZ_MAX_DT)) \
+                if rng.random() < FUZZ_SLOW else TIMESTEP
+            trace.append((keys, dt))
+    return trace
+
+
+def case(seed, frames):
+    """
+    Returns the case for a seed, as a triple (config, wave seed, trace)
+
+    Parameter seed: the seed of the case
+    Precondition: seed is a numpy SeedSequence
+
+    Parameter frames: the number of frames in the trace
+    Precondition: frames is an int >= 0
+    """
+    (wave, rest) = seed.spawn(2)
+    rng = np.random.default_rng(rest)
+    return (random_config(rng), wave, random_trace(rng, frames))
+
+
+class Runner(object):
+    """
+    A class that plays traces on a wave, starting over every time.
+
+    The wave is made once.  Every run restores its first state and reseeds
+    it (see Wave.snapshot and Wave.reseed), which is much faster than making a
+    new wave, so shrinking can play a case again thousands of times.
+    """
+    # HIDDEN ATTRIBUTES:
+    # Attribute _wave: the wave being played
+    # Invariant: _wave is a Wave object
+    #
+    # Attribute _start: the first state of the wave
+    # Invariant: _start is a tuple returned by Wave.snapshot
+    #
+    # Attribute _seed: the seed of the wave
+    # Invariant: _seed is a numpy SeedSequence
+    #
+    # Attribute _input: the keys held down, set from the trace
+    # Invariant: _input is a ScriptInput object
+    #
+    # Attribute _runs: the number of traces played so far
+    # Invariant: _runs is an int >= 0
+    #
+    # Attribute _frames: the number of frames played so far
+    # Invariant: _frames is an int >= 0
+
+    def getRuns(self):
+        """
+        Returns the number of traces played so far
+        """
+        return self._runs
+
+    def getFrames(self):
+        """
+        Returns the number of frames played so far
+        """
+        return self._frames
+
+    def __init__(self, config, seed):
+        """
+        Initializes a runner for a wave
+
+        The game must be able to make images (see Invaders.init_headless).
+
+        Parameter config: the settings of the wave
+        Precondition: config is a GameConfig object
+
+        Parameter seed: the seed of the wave
+        Precondition: seed is a numpy SeedSequence
+        """
+        self._wave = Wave(seed = seed, config = config)
+        self._start = self._wave.snapshot()
+        self._seed = seed
+        self._input = ScriptInput()
+        self._runs = 0
+        self._frames = 0
+
+    def run(self, trace):
+        """
+        Returns (frame, problem) for the first broken invariant, or None
+
+        The problem is a string, which starts with the part of the wave that is
+        broken and a colon (see Wave.checkInvariants), or with 'aliens',
+        'lives' or 'crash'.  The trace stops early when the wave is won or
+        lost.  When the ship is destroyed, the next ship appears as soon as
+        the explosion ends.
+
+        Parameter trace: the trace to play
+        Precondition: trace is a list of (keys, dt) pairs
+        """
+        wave = self._wave
+        wave.restore(self._start)
+        wave.reseed(self._seed)
+        self._runs += 1
+        aliens = wave.getAlienCount()
+        lives = wave.getLives()
+        for (frame, (keys, dt)) in enumerate(trace):
+            self._frames += 1
+            self._input.setKeys(keys)
+            try:
+                wave.update(self._input, dt)
+                if wave.getEnd() and wave.getLives() > 0:
+                    wave.setnewShip()
+                problems = wave.checkInvariants()
+            except Exception as e:
+                return (frame, 'crash: %s' % repr(e))
+            if wave.getAlienCount() > aliens:
+                problems.append('aliens: %d after %d' %
+                    (wave.getAlienCount(), aliens))
+            if wave.getLives() > lives:
+                problems.append('lives: %d after %d' % (wave.getLives(), lives))
+            if len(problems) > 0:
+                return (frame, problems[0])
+            if wave.aliensLost() or wave.aliensWon():
+                return None
+            aliens = wave.getAlienCount()
+            lives = wave.getLives()
+        return None
+
+    def shrink(self, trace, problem):
+        """
+        Returns the smallest trace found that fails the same way as trace
+
+        Two failures are the same when their problems start with the same
+        part (the text before the colon).  This plays the case at most
+        FUZZ_SHRINK times.
+
+        Parameter trace: the failing trace
+        Precondition: trace is a list of (keys, dt) pairs
+
+        Parameter problem: the problem of the trace, as returned by run
+        Precondition: problem is a string
+        """
+        kind = problem.split(':')[0]
+        stop = self._runs + FUZZ_SHRINK
+        trace = self._fails(trace, kind) or trace
+        # Remove runs of frames, halving the length of the runs
+        size = len(trace)//2
+        while size > 0 and self._runs < stop:
+            start = 0
+            while start < len(trace) and self._runs < stop:
+                smaller = self._fails(trace[:start] + trace[start+size:], kind)
+                if smaller is None:
+                    start += size
+                else:
+                    trace = smaller
+            size //= 2
+        # Make the runs of equal frames that are left plain
+        start = 0
+        while start < len(trace) and self._runs < stop:
+            end = start
+            while end < len(trace) and trace[end] == trace[start]:
+                end += 1
+            for step in self._plainer(trace[start]):
+                simpler = self._fails(trace[:start] + [step]*(end-start) +
+                    trace[end:], kind)
+                if simpler is not None:
+                    trace = simpler
+                    break
+            else:
+                start = end
+        return trace
+
+    # HELPER METHODS
+    def _fails(self, trace, kind):
+        """
+        Returns trace up to its failing frame if it fails the same way, or None
+
+        Parameter trace: the trace to play
+        Precondition: trace is a list of (keys, dt) pairs
+
+        Parameter kind: the part of the wave that must be broken
+        Precondition: kind is a string
+        """
+        result = self.run(trace)
+        if result is None or result[1].split(':')[0] != kind:
+            return None
+        return trace[:result[0]+1]
+
+    def _plainer(self, step):
+        """
+        Returns the frames that are plainer than step, plainest first
+
+        A frame is plainer with fewer keys held down, or with a dt of TIMESTEP.
+
+        Parameter step: the frame
+        Precondition: step is a (keys, dt) pair
+        """
+        (keys, dt) = step
+        result = []
+        if len(keys) > 0:
+            result.append(((), dt))
+        if len(keys) > 1:
+            result.extend((tuple(k for k in keys if k != key), dt)
+                for key in keys)
+        if dt != TIMESTEP:
+            result.append((keys, TIMESTEP))
+        return result
+
+
+def check(seed, frames, config = None, trace = None):
+    """
+    Returns the failure of a case, or None if it passes
+
+    The failure is a dictionary with the keys 'seed' (the entropy and spawn
+    key of the seed), 'config' (its settings), 'frame', 'problem', 'trace'
+    (the shrunk trace) and 'runs' (the number of times the case was played).
+    The config and trace of the case are made from the seed unless given.
+
+    The game must be able to make images (see Invaders.init_headless).
+
+    Parameter seed: the seed of the case
+    Precondition: seed is a numpy SeedSequence
+
+    Parameter frames: the number of frames in the trace
+    Precondition: frames is an int >= 0
+
+    Parameter config: the settings of the wave
+    Precondition: config is a GameConfig object or None
+
+    Parameter trace: the trace to play
+    Precondition: trace is a list of (keys, dt) pairs or None
+    """
+    (made, wave, made_trace) = case(seed, frames)
+    config = made if config is None else config
+    trace = made_trace if trace is None else trace
+    runner = Runner(config, wave)
+    return _failure(seed, config, trace, runner, runner.run(trace))
+
+
+def task(seed, cases, frames):
+    """
+    Returns the results of a task of a fuzzing run
+
+    The result is a dictionary with the keys 'cases', 'frames', 'seconds' and
+    'failures' (a list of dictionaries returned by check).  The frames do not
+    count the frames played while shrinking.
+
+    Parameter seed: the seed of the task
+    Precondition: seed is a numpy SeedSequence
+
+    Parameter cases: the number of cases
+    Precondition: cases is an int >= 0
+
+    Parameter frames: the number of frames in each case
+    Precondition: frames is an int >= 0
+    """
+    Invaders.init_headless()
+    start = time.perf_counter()
+    played = 0
+    failures = []
+    for child in seed.spawn(cases):
+        (config, wave, trace) = case(child, frames)
+        runner = Runner(config, wave)
+        result = runner.run(trace)
+        played += runner.getFrames()
+        if result is not None:
+            failures.append(_failure(child, config, trace, runner, result))
+    return {'cases': cases, 'frames': played, 'failures': failures,
+            'seconds': time.perf_counter() - start}
+
+
+def fuzz(cases, frames = FUZZ_FRAMES, seed = None, jobs = None):
+    """
+    Yields the results of the tasks of a fuzzing run, as each one is finished
+
+    Each result is a dictionary returned by task.
+
+    Parameter cases: the number of cases
+    Precondition: cases is an int >= 0
+
+    Parameter frames: the number of frames in each case
+    Precondition: frames is an int >= 0
+
+    Parameter seed: the seed of the run
+    Precondition: seed is an int >= 0 or None (for a random seed)
+
+    Parameter jobs: the number of processes to use
+    Precondition: jobs is an int > 0, or None for one per core
+    """
+    sizes = [min(FUZZ_CHUNK, cases-start) for start in range(0, cases,
+        FUZZ_CHUNK)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    with concurrent.futures.ProcessPoolExecutor(jobs) as pool:
+        futures = [pool.submit(task, stream, n, frames)
+            for (stream, n) in zip(seeds, sizes)]
+        for future in concurrent.futures.as_completed(futures):
+            yield future.result()
+
+
+def report(failure):
+    """
+    Prints a failure and its shrunk trace
+
+    Each frame of the trace is printed as FRAME DT KEYS.
+
+    Parameter failure: the failure to print
+    Precondition: failure is a dictionary returned by check
+    """
+    (entropy, key) = failure['seed']
+    print('FAILED at frame %d: %s' % (failure['frame'], failure['problem']))
+    print('  seed:   SeedSequence(%d, spawn_key=%s)' % (entropy, tuple(key)))
+    print('  config: %s' % repr(GameConfig(**failure['config'])))
+    print('  trace:  %d frames after shrinking (%d runs)' %
+        (len(failure['trace']), failure['runs']))
+    for (frame, (keys, dt)) in enumerate(failure['trace']):
+        print('    %d %.6f %s' % (frame, dt, ' '.join(keys)))
+    sys.stdout.flush()
+
+
+def main(args):
+    """
+    Runs a fuzzing run from the command line and prints the results
+
+    This returns the number of failures, for use as the exit status.
+
+    Parameter args: the parsed command line arguments
+    Precondition: args has the attributes fuzz, frames, seed and jobs
+    """
+    frames = FUZZ_FRAMES if args.frames is None else args.frames
+    start = time.perf_counter()
+    cases = 0
+    played = 0
+    failed = 0
+    for result in fuzz(args.fuzz, frames, args.seed, args.jobs):
+        cases += result['cases']
+        played += result['frames']
+        for failure in result['failures']:
+            report(failure)
+        failed += len(result['failures'])
+    seconds = time.perf_counter() - start
+    rate = played/seconds if seconds > 0 else float('inf')
+    print('%d cases, %d frames, %d failed; %.0f frames/s (%.1fM frames/hour)'
+        % (cases, played, failed, rate, rate*3600/1e6))
+    return failed
+
+
+def _failure(seed, config, trace, runner, result):
+    """
+    Returns the failure of a case, with its trace shrunk, or None if it passed
+
+    Parameter seed: the seed of the case
+    Precondition: seed is a numpy SeedSequence
+
+    Parameter config: the settings of the wave
+    Precondition: config is a GameConfig object
+
+    Parameter trace: the trace that was played
+    Precondition: trace is a list of (keys, dt) pairs
+
+    Parameter runner: the runner that played it
+    Precondition: runner is a Runner object
+
+    Parameter result: the result of playing the trace
+    Precondition: result is a value returned by runner.run(trace)
+    """
+    if result is None:
+        return None
+    (frame, problem) = result
+    return {'seed': [seed.entropy, list(seed.spawn_key)],
+            'config': config.getSettings(), 'frame': frame, 'problem': problem,
+            'trace': runner.shrink(trace, problem), 'runs': runner.getRuns()}
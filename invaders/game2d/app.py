@@ -42,6 +42,15 @@ class GameApp(kivy.app.App):
     # Class attribute for tracking textures (to reduce memory footprint)
     TEXTURE_CACHE = {}
     
+    # Class attribute for the images packed into large textures (see load_atlas)
+    ATLAS = None
+    
+    # Class attribute for the folder that keeps packed atlases between runs
+    ATLAS_CACHE = os.path.join(kivy.kivy_home_dir,'atlas')
+    
+    # Class attribute for running without a window (see init_headless)
+    HEADLESS = False
+    
     
     # MUTABLE ATTRIBUTES
     @property
@@ -65,8 +74,72 @@ class GameApp(kivy.app.App):
         self._fps = value
         Clock.schedule_interval(self._refresh,1.0/self._fps)
     
+    @property
+    def timestep(self):
+        """
+        The length in seconds of a fixed simulation step, or None
+        
+        By default this value is None, and :meth:`update` is called once per animation 
+        frame with the time since the last frame.  That makes the game speed depend on 
+        the frame rate.  If this value is a number, the game runs in fixed-timestep mode 
+        instead.  The time since the last frame is added to an accumulator, and 
+        :meth:`update` is called with exactly ``timestep`` seconds as many times as fit 
+        in the accumulator (up to ``max_steps`` times).  The game then behaves the same 
+        at any frame rate.  Use :attr:`alpha` in :meth:`draw` to smooth the motion 
+        between steps.
+        
+        **Invariant**: Must be None or an int or float > 0.
+        """
+        return self._timestep
+    
+    @timestep.setter
+    def timestep(self,value):
+        assert value is None or type(value) in [int,float], 'value %s is not a number' % repr(value)
+        assert value is None or value > 0, 'value %s is not positive' % repr(value)
+        self._timestep = value
+        self._accum = 0.0
+    
+    @property
+    def max_steps(self):
+        """
+        The most fixed steps to take in a single animation frame
+        
+        After a long hitch, taking every pending step would make the next frame even 
+        slower, and the game would never catch up.  Instead, at most this many steps 
+        are taken per frame and the rest of the pending time is dropped.  This value 
+        only matters if :attr:`timestep` is not None.
+        
+        **Invariant**: Must be an int > 0.
+        """
+        return self._maxsteps
+    
+    @max_steps.setter
+    def max_steps(self,value):
+        assert type(value) == int, 'value %s is not an int' % repr(value)
+        assert value > 0, 'value %s is not positive' % repr(value)
+        self._maxsteps = value
+    
     
     # IMMUTABLE PROPERTIES
+    @property
+    def alpha(self):
+        """
+        How far the current frame is between the last two fixed steps.
+        
+        In fixed-timestep mode, the frame is usually drawn part of the way into the next
+        step.  This value is that fraction, from 0 (just after the last step) up to (but
+        not including) 1.  An object moving at a steady speed should be drawn at 
+        ``previous+alpha*(current-previous)``.  If :attr:`timestep` is None, this value
+        is always 1, since the state is always current.
+        
+        **Immutable**: This value cannot be altered.
+        
+        **Invariant**: Must be a float in 0..1.
+        """
+        if self._timestep is None:
+            return 1.0
+        return self._accum/self._timestep
+    
     @property
     def width(self):
         """
@@ -171,17 +244,26 @@ class GameApp(kivy.app.App):
         
         The ``name`` must refer to the file in the **Images** folder.  If the texture
         has already been loaded, it will return the cached texture.  Otherwise, it will
-        load the texture and cache it before returning it.
+        load the texture and cache it before returning it.  If the image is packed in 
+        the atlas (see :meth:`load_atlas`), the texture is its region of an atlas page.
         
-        This method will crash if name is not a valid file.
+        This method will crash if name is not a valid file.  When the game is headless,
+        no textures are loaded and this method always returns None.
         
         :param name: The file name
         :type name:  ``str``
         """
         assert cls.is_image(name), '%s is not an image file' % repr(name)
+        if cls.HEADLESS:
+            return None
         if name in cls.TEXTURE_CACHE:
             return cls.TEXTURE_CACHE[name]
         
+        if cls.ATLAS is not None and name in cls.ATLAS:
+            texture = cls.ATLAS.texture(name)
+            cls.TEXTURE_CACHE[name] = texture
+            return texture
+        
         try:
             from kivy.core.image import Image
             texture = Image(name).texture
@@ -191,6 +273,77 @@ class GameApp(kivy.app.App):
         
         return texture
     
+    @classmethod
+    def load_page(cls,name):
+        """
+        Returns: The whole texture holding the image for the given file name
+        
+        If the image is packed in the atlas (see :meth:`load_atlas`), this is its atlas
+        page, which is shared with other images.  Otherwise, it is the same texture as 
+        :meth:`load_texture`.  Shapes that draw with the page, and with the texture 
+        coordinates of :meth:`load_texture`, do not switch textures between images.
+        
+        :param name: The file name
+        :type name:  ``str``
+        """
+        assert cls.is_image(name), '%s is not an image file' % repr(name)
+        if not cls.HEADLESS and cls.ATLAS is not None and name in cls.ATLAS:
+            return cls.ATLAS.page(name)
+        return cls.load_texture(name)
+    
+    @classmethod
+    def load_atlas(cls):
+        """
+        Returns: The atlas of the **Images** folder, or None if it cannot be made
+        
+        This packs every image in the **Images** folder into a few large textures (see
+        :class:`GAtlas`), so that :meth:`load_texture` returns regions of them.  The 
+        packed atlas is kept in the folder ``ATLAS_CACHE``, and it is only packed again 
+        when an image changes.  Textures loaded before the atlas are unloaded.
+        
+        Packing needs the Python Imaging Library (PIL).  If it is not installed and 
+        the atlas is not in the cache, or the cache cannot be read or written, there is
+        no atlas and every image has its own texture.  When the game is headless, no atlas is 
+        made and this method always returns None.
+        """
+        if cls.HEADLESS:
+            return None
+        if cls.ATLAS is None:
+            from .gatlas import GAtlas
+            try:
+                cls.ATLAS = GAtlas(cls.images,cls.ATLAS_CACHE)
+            except (ImportError, OSError, ValueError):
+                cls.ATLAS = None
+            for name in list(cls.TEXTURE_CACHE.keys()):
+                if cls.ATLAS is not None and name in cls.ATLAS:
+                    del cls.TEXTURE_CACHE[name]
+        return cls.ATLAS
+    
+    @classmethod
+    def init_headless(cls):
+        """
+        Prepares the graphics classes to run without a window.
+        
+        Kivy graphics instructions need an OpenGL context, and that context only exists
+        once the game window is open.  This method switches Kivy to a mock OpenGL 
+        backend, so that game objects can be created and moved without a window (though
+        they cannot be seen). It also stops textures from being loaded.
+        
+        This method must be called before any :class:`GObject` is created, and it cannot 
+        be used in a game that opens a window.  It may be called without making a game 
+        at all, to create game objects for a simulation.  In that case, call it on the 
+        game class (for example ``Invaders.init_headless()``), as the **Images**, 
+        **Fonts** and **Sounds** folders are found next to the module of that class.
+        """
+        cls._setpaths()
+        if cls.HEADLESS:
+            return
+        import os
+        from kivy.graphics.cgl import cgl_init
+        os.environ['KIVY_GL_BACKEND'] = 'mock'
+        cgl_init()
+        cls.HEADLESS = True
+    
     @classmethod
     def unload_texture(cls,name):
         """
@@ -223,6 +376,23 @@ class GameApp(kivy.app.App):
             
             GameApp(width=400,height=400)
         
+        To simulate the game in fixed steps of 1/60 of a second, no matter the frame 
+        rate, add the keyword ``timestep``::
+            
+            GameApp(width=400,height=400,timestep=1/60)
+        
+        To keep the shapes on the canvas from one frame to the next, and only change 
+        the canvas for the shapes that changed, add the keyword ``retained`` (see 
+        :attr:`GView.retained`)::
+            
+            GameApp(width=400,height=400,retained=True)
+        
+        To pack the images into a few large textures when the window opens, so that 
+        drawing different images does not switch textures, add the keyword ``atlas``
+        (see :meth:`load_atlas`)::
+            
+            GameApp(width=400,height=400,atlas=True)
+        
         The game window will not show until you start the game. To start the game, use 
         the method ``run()``.
         
@@ -235,6 +405,10 @@ class GameApp(kivy.app.App):
         w = keywords.pop('width', 0.0)
         h = keywords.pop('height', 0.0)
         f = keywords.pop('fps', 60.0)
+        t = keywords.pop('timestep', None)
+        m = keywords.pop('max_steps', 5)
+        r = keywords.pop('retained', False)
+        a = keywords.pop('atlas', False)
 
         assert type(w) in [int,float], 'width %s is not a number' % repr(w)
         assert type(h) in [int,float], 'height %s is not a number' % repr(h)
@@ -244,6 +418,10 @@ class GameApp(kivy.app.App):
         self._gwidth = w
         self._gheight = h
         self._fps = f
+        self.timestep = t
+        self.max_steps = m
+        self._retained = r
+        self._atlas = a
         
         Config.set('graphics', 'width', str(self.width))
         Config.set('graphics', 'height', str(self.height))
@@ -264,6 +442,9 @@ class GameApp(kivy.app.App):
         from .gview import GInput, GView
         self._view = GView()
         self._view.size_hint = (1,1)
+        self._view.retained = self._retained
+        if self._atlas:
+            self.load_atlas()
         self._input = GInput()
         self._input._register(self._view)
         return self.view
@@ -289,6 +470,24 @@ class GameApp(kivy.app.App):
         kivy.app.App.stop(self)
         sys.exit(0)
     
+    def start_headless(self,input):
+        """
+        Starts the game without a window.
+        
+        This is an alternative to ``run()`` for simulations and automated tests. It 
+        does not open a window or start the clock.  Instead, it uses ``input`` as the 
+        input handler and calls :meth:`start`.  After that, you advance the game by 
+        calling :meth:`update` directly, as often as you like.  There is no view, so 
+        :meth:`draw` should not be called.
+        
+        :param input: the input handler to use in place of the keyboard
+        :type input:  any object with the same methods as :class:`GInput`
+        """
+        self.init_headless()
+        self._view = None
+        self._input = input
+        self.start()
+    
     def start(self):
         """
         Initializes the game state, creating a new game.
@@ -353,10 +552,36 @@ class GameApp(kivy.app.App):
         :type dt:  ``int`` or ``float``
         """
         self.view.clear()
-        self.update(dt)
+        self._advance(dt)
         self.draw()
+        self.view.commit()
     
-    def _setpaths(self):
+    def _advance(self,dt):
+        """
+        Updates the game for the time that has passed since the last frame.
+        
+        If :attr:`timestep` is None, this calls :meth:`update` once with ``dt``. 
+        Otherwise, it takes as many fixed steps as have accumulated, up to ``max_steps``.
+        
+        :param dt: time in seconds since last update
+        :type dt:  ``int`` or ``float``
+        """
+        if self._timestep is None:
+            self.update(dt)
+            return
+        
+        self._accum += dt
+        steps = 0
+        while self._accum >= self._timestep and steps < self._maxsteps:
+            self.update(self._timestep)
+            self._accum -= self._timestep
+            steps += 1
+        if self._accum >= self._timestep:
+            # Too far behind; drop the backlog rather than spiral
+            self._accum %= self._timestep
+    
+    @classmethod
+    def _setpaths(cls):
         """
         Sets the resource paths to the application directory.
         """
@@ -365,7 +590,7 @@ class GameApp(kivy.app.App):
         import os, sys
         import inspect
         
-        path = os.path.abspath(inspect.getfile(self.__class__))
+        path = os.path.abspath(inspect.getfile(cls))
         path = os.path.dirname(path)
         
         GameApp.fonts  = str(os.path.join(path, 'Fonts'))
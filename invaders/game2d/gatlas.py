@@ -0,0 +1,253 @@
+"""
+A module to pack the game images into a few large textures.
+
+Every image file has its own texture, so a frame that draws several images has to
+switch textures for each one.  A texture atlas instead packs many images into one
+large texture (called a page), and each image is a region of that page.  Drawing
+regions of the same page never switches textures.
+
+Packing is slow and needs the Python Imaging Library (PIL), so a packed atlas is saved
+to a cache folder on disk.  The files are named by a hash of the contents of the
+images, so an atlas is packed again only when an image changes.  Loading an atlas from
+the cache does not need PIL.
+
+Author: Jose Vizueth (jdv72)
+Date:   October 18, 2026
+"""
+import hashlib
+import json
+import os.path
+
+# The width and height of an atlas page
+ATLAS_SIZE = 1024
+
+# The pixels between two images on a page (see kivy.atlas.Atlas.create)
+ATLAS_PADDING = 2
+
+# The files that can be packed
+ATLAS_EXTENSIONS = ('.png','.jpg','.jpeg','.bmp','.gif')
+
+
+# #mark -
+class GAtlas(object):
+    """
+    A class representing the images of a folder packed into atlas pages.
+
+    An atlas is made from the image files directly in a folder.  Each image is known
+    by its file name, and :meth:`texture` returns its region of a page.  An image that
+    cannot be packed (because it is larger than a page, or it has the same name as
+    another image but a different extension) is left out, and should be loaded as a
+    texture of its own.
+
+    The pages are Kivy textures, so an atlas can only be made once the game window
+    is open.
+    """
+
+    # IMMUTABLE PROPERTIES
+    @property
+    def names(self):
+        """
+        The file names of the images in this atlas, in sorted order.
+
+        **invariant**: Value is a ``list`` of ``str``
+        """
+        return sorted(self._regions.keys())
+
+    @property
+    def pages(self):
+        """
+        The number of atlas pages (large textures) holding the images.
+
+        **invariant**: Value is an ``int`` >= 0
+        """
+        return len(self._pages)
+
+    @property
+    def key(self):
+        """
+        The hash of the packed images, which names the files of the disk cache.
+
+        **invariant**: Value is a ``str`` of hexadecimal digits
+        """
+        return self._key
+
+    @property
+    def cached(self):
+        """
+        Whether this atlas was loaded from the disk cache, instead of being packed.
+
+        **invariant**: Value is a ``bool``
+        """
+        return self._cached
+
+
+    # BUILT-IN METHODS
+    def __init__(self,folder,cache,size=ATLAS_SIZE,padding=ATLAS_PADDING):
+        """
+        Creates the atlas of the images in a folder, packing them if needed.
+
+        The atlas is loaded from the cache folder if it has been packed before.
+        Otherwise, the images are packed and the atlas is saved to the cache folder,
+        which is made if it does not exist.
+
+        This method raises an ``ImportError`` if the images must be packed and PIL is
+        not installed, and an ``OSError`` if the cache folder cannot be written.
+
+        :param folder: the folder with the image files
+        :type folder:  ``str``
+
+        :param cache: the folder to keep packed atlases in
+        :type cache:  ``str``
+
+        :param size: the width and height of each page
+        :type size:  ``int`` > 0
+
+        :param padding: the pixels between two images on a page
+        :type padding:  ``int`` >= 0
+        """
+        files = _images(folder)
+        self._key = _hash(files,size,padding)
+        self._pages = []
+        self._regions = {}
+        outname = os.path.join(cache,self._key)
+        self._cached = os.path.exists(outname+'.atlas')
+        if not self._cached and len(files) > 0:
+            self._pack(files,outname,size,padding)
+        if os.path.exists(outname+'.atlas'):
+            self._load(files,outname)
+
+    def __contains__(self,name):
+        """
+        Returns True if the image ``name`` is packed in this atlas.
+
+        :param name: the file name of the image
+        :type name:  ``str``
+        """
+        return name in self._regions
+
+
+    # PUBLIC METHODS
+    def texture(self,name):
+        """
+        Returns the region of a page holding the image ``name``.
+
+        The region is a Kivy ``TextureRegion``, which can be used like the texture of
+        the image file.  Its size is the size of the image.
+
+        :param name: the file name of the image
+        :type name:  ``str`` in :attr:`names`
+        """
+        return self._regions[name][1]
+
+    def page(self,name):
+        """
+        Returns the whole page that holds the image ``name``.
+
+        Drawing with the page instead of the region of the image, with the texture
+        coordinates of the region, lets shapes with different images share one texture.
+
+        :param name: the file name of the image
+        :type name:  ``str`` in :attr:`names`
+        """
+        return self._pages[self._regions[name][0]]
+
+
+    # HIDDEN METHODS
+    def _pack(self,files,outname,size,padding):
+        """
+        Packs the images into pages and saves them, with their layout, to the cache
+
+        The layout (the ``.atlas`` file) is written last, so a cache with a layout
+        always has its pages.
+
+        :param files: the images to pack, as a dictionary from name to path
+        :type files:  ``dict``
+
+        :param outname: the cache path of the atlas, without an extension
+        :type outname:  ``str``
+
+        :param size: the width and height of each page
+        :type size:  ``int`` > 0
+
+        :param padding: the pixels between two images on a page
+        :type padding:  ``int`` >= 0
+        """
+        from PIL import Image
+        from kivy.atlas import Atlas
+        paths = []
+        for path in files.values():
+            with Image.open(path) as image:
+                if max(image.size)+padding <= size:
+                    paths.append(path)
+        if len(paths) == 0:
+            return
+        os.makedirs(os.path.dirname(outname),exist_ok=True)
+        Atlas.create(outname,paths,size,padding=padding)
+
+    def _load(self,files,outname):
+        """
+        Loads the pages of an atlas from the cache
+
+        :param files: the images that were packed, as a dictionary from name to path
+        :type files:  ``dict``
+
+        :param outname: the cache path of the atlas, without an extension
+        :type outname:  ``str``
+        """
+        from kivy.core.image import Image
+        with open(outname+'.atlas') as file:
+            layout = json.load(file)
+        regions = {}
+        for (filename, ids) in sorted(layout.items()):
+            page = Image(os.path.join(os.path.dirname(outname),filename)).texture
+            for (uid, region) in ids.items():
+                regions[uid] = (len(self._pages),page.get_region(*region))
+            self._pages.append(page)
+        for name in files:
+            uid = os.path.splitext(name)[0]
+            if uid in regions:
+                self._regions[name] = regions[uid]
+
+
+# #mark -
+def _images(folder):
+    """
+    Returns the image files in a folder that can be packed together
+
+    The result is a dictionary from file name to path.  Images with the same name but a
+    different extension are left out, as an atlas knows them only by the name.
+
+    :param folder: the folder with the image files
+    :type folder:  ``str``
+    """
+    files = {}
+    stems = {}
+    for name in sorted(os.listdir(folder)):
+        path = os.path.join(folder,name)
+        (stem, ext) = os.path.splitext(name)
+        if os.path.isfile(path) and ext.lower() in ATLAS_EXTENSIONS:
+            stems[stem] = stems.get(stem,0)+1
+            files[name] = path
+    return {name : path for (name, path) in files.items()
+            if stems[os.path.splitext(name)[0]] == 1}
+
+
+def _hash(files,size,padding):
+    """
+    Returns the hash of the contents of some image files and the page layout
+
+    :param files: the images, as a dictionary from name to path
+    :type files:  ``dict``
+
+    :param size: the width and height of each page
+    :type size:  ``int`` > 0
+
+    :param padding: the pixels between two images on a page
+    :type padding:  ``int`` >= 0
+    """
+    digest = hashlib.sha1(('%d,%d' % (size,padding)).encode())
+    for name in sorted(files):
+        digest.update(name.encode()+b'\0')
+        with open(files[name],'rb') as file:
+            digest.update(hashlib.sha1(file.read()).digest())
+    return digest.hexdigest()
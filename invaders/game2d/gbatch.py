@@ -0,0 +1,332 @@
+"""
+A module to support drawing many rectangles at once.
+
+Every :class:`GImage` or :class:`GRectangle` has its own group of Kivy instructions,
+so a screen with thousands of shapes costs thousands of instructions every frame.  A
+sprite batch instead collects many rectangles (called quads) and writes them into one
+vertex buffer, drawn with a single ``Mesh``.  The number of instructions depends only
+on the number of textures and colors used, not on the number of quads.
+
+The quads are usually refilled every frame: clear the batch, add the quads, and draw
+it.  Quads that only move together can instead be added once, placed relative to the
+batch, and moved by moving the batch.
+
+Author: Jose Vizueth (jdv72)
+Date:   October 18, 2026
+"""
+from kivy.graphics import *
+from kivy.graphics.instructions import *
+from .gobject import GObject, is_color, to_rgba
+from .app import GameApp
+import numpy as np
+
+# The most quads in one Mesh (Kivy indices are unsigned shorts)
+QUADS_PER_MESH = 65536//4
+
+# The vertex format of a quad corner: position and texture coordinate
+_FORMAT = [(b'v_pos', 2, 'float'), (b'v_tc', 2, 'float')]
+
+# The indices of the two triangles of every quad, for the largest Mesh
+_INDICES = (np.arange(QUADS_PER_MESH,dtype=np.uint16)[:,None]*4 +
+            np.array([0,1,2,2,3,0],dtype=np.uint16)).reshape(-1)
+
+# The texture coordinates of a whole texture (bottom left, counter-clockwise)
+_WHOLE = (0.0,0.0,1.0,0.0,1.0,1.0,0.0,1.0)
+
+
+# #mark -
+class GSpriteBatch(GObject):
+    """
+    A class representing many textured rectangles drawn at once.
+
+    A quad has a center, a size, a texture (an image file, or none for a solid
+    rectangle), an optional region of that texture, and a color that tints it.  Quads
+    with the same texture and color share one ``Mesh`` (or more, if there are over
+    :data:`QUADS_PER_MESH` of them).  Like :class:`GScene`, the quads are drawn as if
+    the point (x,y) is the origin, so moving, rotating or scaling the batch moves all
+    of them at once.
+
+    The batch is meant to be refilled every animation frame.  Call :meth:`clear`, then
+    :meth:`add` or :meth:`extend` for the quads, and then :meth:`draw`.  The vertex
+    buffers are kept from one frame to the next, so a steady number of quads does not
+    allocate any memory.  A batch that is not refilled is not sent to the meshes again,
+    so moving the whole batch costs the same no matter how many quads it has.  Use
+    :meth:`hide` to remove one quad from such a batch.
+
+    The attributes ``width`` and ``height`` are present in this object, but they are
+    not used for drawing.
+    """
+
+    # IMMUTABLE PROPERTIES
+    @property
+    def count(self):
+        """
+        The number of quads in this batch.
+
+        Hidden quads (see :meth:`hide`) are still counted.
+
+        **invariant**: Value is an ``int`` >= 0
+        """
+        return sum(group[1] for group in self._groups.values())
+
+    @property
+    def instructions(self):
+        """
+        The number of Kivy instructions used to draw this batch.
+
+        This is the number of meshes and colors, plus the transforms.  It does not
+        depend on the number of quads.
+
+        **invariant**: Value is an ``int`` > 0
+        """
+        return len(self._cache.children) + len(self._body.children)
+
+
+    # BUILT-IN METHODS
+    def __init__(self,**keywords):
+        """
+        Creates a new, empty sprite batch.
+
+        To use the constructor for this class, you should provide it with a list of
+        keyword arguments that initialize various attributes. For example, to create a
+        batch whose quads are placed relative to (100,50), use the constructor::
+
+            GSpriteBatch(x=100,y=50)
+
+        This class supports the same keywords as :class:`GObject`.  The colors are
+        unused, as each quad has its own color.
+
+        :param keywords: dictionary of keyword arguments
+        :type keywords:  keys are attribute names
+        """
+        self._defined = False
+        self._groups = {}
+        self._regions = {}
+        self._colors = {}
+        self._body = InstructionGroup()
+        GObject.__init__(self,**keywords)
+        self._reset()
+        self._defined = True
+
+
+    # PUBLIC METHODS
+    def clear(self):
+        """
+        Removes every quad from this batch.
+
+        The memory of the quads is kept, to be reused by the next quads added.
+        """
+        for group in self._groups.values():
+            group[1] = 0
+            group[4] = True
+
+    def add(self,x,y,width,height,source=None,region=None,color=None):
+        """
+        Adds a single quad to this batch.
+
+        To add many quads that differ only in position, :meth:`extend` is much faster.
+
+        :param x: the horizontal coordinate of the quad center
+        :type x:  ``int`` or ``float``
+
+        :param y: the vertical coordinate of the quad center
+        :type y:  ``int`` or ``float``
+
+        :param width: the width of the quad
+        :type width:  ``int`` or ``float`` > 0
+
+        :param height: the height of the quad
+        :type height:  ``int`` or ``float`` > 0
+
+        :param source: the image file to texture the quad (None for a solid quad)
+        :type source:  ``str`` or ``None``
+
+        :param region: the part of the image to use as (x,y,width,height), in pixels
+            with the origin at the bottom left (None for the whole image)
+        :type region:  4-element tuple of ``int`` or ``None``
+
+        :param color: the color to tint the quad (None for white)
+        :type color:  a color (see :attr:`GObject.fillcolor`) or ``None``
+        """
+        self.extend((x,),(y,),width,height,source,region,color)
+
+    def extend(self,xs,ys,width,height,source=None,region=None,color=None):
+        """
+        Adds many quads of the same size, texture and color to this batch.
+
+        :param xs: the horizontal coordinates of the quad centers
+        :type xs:  a sequence or ``numpy`` array of numbers
+
+        :param ys: the vertical coordinates of the quad centers
+        :type ys:  a sequence or ``numpy`` array of numbers, as long as xs
+
+        :param width: the width of every quad
+        :type width:  ``int`` or ``float`` > 0
+
+        :param height: the height of every quad
+        :type height:  ``int`` or ``float`` > 0
+
+        :param source: the image file to texture the quads (None for solid quads)
+        :type source:  ``str`` or ``None``
+
+        :param region: the part of the image to use as (x,y,width,height), in pixels
+            with the origin at the bottom left (None for the whole image)
+        :type region:  4-element tuple of ``int`` or ``None``
+
+        :param color: the color to tint the quads (None for white)
+        :type color:  a color (see :attr:`GObject.fillcolor`) or ``None``
+        """
+        assert source is None or GameApp.is_image(source), '%s is not an image file' % repr(source)
+        assert color is None or is_color(color), '%s is not a valid color' % repr(color)
+        n = len(xs)
+        if n == 0:
+            return
+        group = self._group(source,self._tint(color))
+        count = group[1]
+        if count+n > len(group[0])//16:
+            size = max(2*len(group[0]),(count+n)*16)
+            grown = np.zeros(size,dtype=np.float32)
+            grown[:count*16] = group[0][:count*16]
+            group[0] = grown
+        quads = group[0][count*16:(count+n)*16].reshape(n,4,4)
+        left   = np.asarray(xs)-width/2.0
+        right  = left+width
+        bottom = np.asarray(ys)-height/2.0
+        top    = bottom+height
+        quads[:,0,0] = left
+        quads[:,0,1] = bottom
+        quads[:,1,0] = right
+        quads[:,1,1] = bottom
+        quads[:,2,0] = right
+        quads[:,2,1] = top
+        quads[:,3,0] = left
+        quads[:,3,1] = top
+        quads[:,:,2:] = self._coords(source,region)
+        group[1] = count+n
+        group[4] = True
+
+    def hide(self,index,source=None,color=None):
+        """
+        Hides a single quad of this batch, without moving the others.
+
+        The quads of a texture and color are numbered in the order they were added,
+        starting at 0.  A hidden quad keeps its number, but it is shrunk to a point so
+        that it draws nothing.  It is only removed by :meth:`clear`.
+
+        :param index: the number of the quad among those of its texture and color
+        :type index:  ``int`` >= 0 and less than the quads of that texture and color
+
+        :param source: the image file that textures the quad (None for a solid quad)
+        :type source:  ``str`` or ``None``
+
+        :param color: the color that tints the quad (None for white)
+        :type color:  a color (see :attr:`GObject.fillcolor`) or ``None``
+        """
+        group = self._groups[(source,self._tint(color))]
+        assert 0 <= index < group[1], '%s is not a quad of this batch' % repr(index)
+        corners = group[0][index*16:(index+1)*16].reshape(4,4)
+        corners[:,:2] = corners[0,:2]
+        group[4] = True
+
+    def draw(self, view, layer=None):
+        """
+        Draws the quads of this batch in the provide view.
+
+        Ideally, the view should be the one provided by :class:`GameApp`.
+
+        :param view: view to draw to
+        :type view:  :class:`GView`
+
+        :param layer: the name of the layer of the view to draw in (None for the
+            default layer; see :meth:`GView.addLayer`)
+        :type layer:  ``str`` or ``None``
+        """
+        for group in self._groups.values():
+            (vertices, count, meshes, tint, dirty) = group
+            if not dirty:
+                continue
+            while len(meshes)*QUADS_PER_MESH < count:
+                mesh = Mesh(fmt=_FORMAT,mode='triangles',texture=meshes[0].texture)
+                meshes.append(mesh)
+                self._body.insert(self._body.indexof(meshes[-2])+1,mesh)
+            for (i, mesh) in enumerate(meshes):
+                quads = min(max(count-i*QUADS_PER_MESH,0),QUADS_PER_MESH)
+                start = i*QUADS_PER_MESH*16
+                mesh.vertices = vertices[start:start+quads*16]
+                mesh.indices  = _INDICES[:quads*6]
+            group[4] = False
+        GObject.draw(self,view,layer)
+
+
+    # HIDDEN METHODS
+    def _group(self,source,rgba):
+        """
+        Returns the group of quads with the given texture and color, making it if needed
+
+        The meshes draw with the whole atlas page of the texture (see
+        :meth:`GameApp.load_page`), so groups of different images on the same page
+        share one texture.
+
+        A group is a list [vertices, count, meshes, tint, dirty], where vertices is a
+        numpy float array with 16 floats (4 corners) per quad, count is the number of
+        quads, meshes is a nonempty list of Mesh, tint is a Color, and dirty is True if
+        the quads have changed since the meshes were last given them.
+
+        :param source: the image file of the texture
+        :type source:  ``str`` or ``None``
+
+        :param rgba: the color of the quads
+        :type rgba:  4-element tuple of floats
+        """
+        key = (source,rgba)
+        if not key in self._groups:
+            texture = None if source is None else GameApp.load_page(source)
+            tint = Color(*rgba)
+            mesh = Mesh(fmt=_FORMAT,mode='triangles',texture=texture)
+            self._body.add(tint)
+            self._body.add(mesh)
+            self._groups[key] = [np.zeros(16*64,dtype=np.float32),0,[mesh],tint,True]
+        return self._groups[key]
+
+    def _tint(self,color):
+        """
+        Returns a color as a tuple of four floats, remembering the conversion
+
+        :param color: the color to convert
+        :type color:  a color (see :attr:`GObject.fillcolor`) or ``None``
+        """
+        key = tuple(color) if type(color) == list else color
+        if not key in self._colors:
+            self._colors[key] = to_rgba(color)
+        return self._colors[key]
+
+    def _coords(self,source,region):
+        """
+        Returns the texture coordinates of the corners of a quad
+
+        The result is a numpy array of shape (4,2), in the order of the corners of a
+        quad (bottom left, counter-clockwise).
+
+        :param source: the image file of the texture
+        :type source:  ``str`` or ``None``
+
+        :param region: the part of the image to use (None for the whole image)
+        :type region:  4-element tuple of ``int`` or ``None``
+        """
+        key = (source,region)
+        if not key in self._regions:
+            texture = None if source is None else GameApp.load_texture(source)
+            coords = _WHOLE
+            if texture is not None:
+                coords = texture.tex_coords if region is None else \
+                         texture.get_region(*region).tex_coords
+            self._regions[key] = np.array(coords,dtype=np.float32).reshape(4,2)
+        return self._regions[key]
+
+    def _reset(self):
+        """
+        Resets the drawing cache
+        """
+        GObject._reset(self)
+        self._cache.add(self._body)
+        self._cache.add(PopMatrix())
@@ -38,6 +38,32 @@ def is_color(c):
     return type(c) == str and (introcs.is_tkcolor(c) or introcs.is_webcolor(c))
 
 
+def to_rgba(c):
+    """
+    Converts a color to a tuple of four floats (red, green, blue and alpha).
+
+    The value None is converted to white.
+
+    :return: the color as a tuple of four floats in 0..1
+    :rtype:  ``tuple``
+
+    :param c: The color to convert
+    :type c:  a color (see :func:`is_color`) or ``None``
+    """
+    import introcs
+    if c is None:
+        return (1.0,1.0,1.0,1.0)
+    if type(c) in [tuple, list]:
+        c = list(c)+[1.0] if len(c) == 3 else c
+    elif type(c) in [introcs.RGB, introcs.HSV]:
+        c = c.glColor()
+    elif c[0] == '#':
+        c = introcs.RGB.CreateWebColor(c).glColor()
+    else:
+        c = introcs.RGB.CreateName(c).glColor()
+    return tuple(float(x) for x in c)
+
+
 def is_num_tuple(t,size):
     """
     Checks whether a value is a sequence of numbers.
@@ -586,7 +612,7 @@ class GObject(object):
             p = self.inverse._transform(point[0],point[2])
             return Point2(p[0],p[1])
 
-    def draw(self, view):
+    def draw(self, view, layer=None):
         """
         Draws this shape in the provide view.
 
@@ -594,9 +620,13 @@ class GObject(object):
 
         :param view: view to draw to
         :type view:  :class:`GView`
+
+        :param layer: the name of the layer of the view to draw in (None for the
+            default layer; see :meth:`GView.addLayer`)
+        :type layer:  ``str`` or ``None``
         """
         try:
-            view.draw(self._cache)
+            view.draw(self._cache,layer)
         except:
             raise IOError('Cannot draw %s since it was not initialized properly' % repr(self))
 
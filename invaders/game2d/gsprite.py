@@ -142,7 +142,7 @@ class GSprite(GRectangle):
                     self._images[row*self._format[1]+col] = texture.get_region(int(tx),texture.height-int(ty)-int(height),int(width),int(height))
                     tx += width
                 ty += width
-        else:
+        elif not GameApp.HEADLESS:
             print('Failed to load',repr(self.source))
         
         self._texture = self._images[self._frame]
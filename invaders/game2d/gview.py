@@ -319,12 +319,98 @@ class GView(FloatLayout):
     :class:`GObject` instances to the :meth:`draw` method.  You must do this every
     animation frame, as the game is constantly clearing the window.
 
+    The window is a stack of named layers, drawn in order of their depth (see
+    :meth:`addLayer`), so the order of the shapes on the screen does not depend on the
+    order of the calls to :meth:`draw` in different layers.  There is always a dynamic
+    layer named ``'default'`` at depth 0, used when no layer is given.  A dynamic layer
+    is emptied at the start of every frame, and must be drawn again.  A static layer
+    keeps its shapes until it is invalidated (see :meth:`invalidate`).  Drawing a shape
+    that is already in a static layer does nothing, so scenery drawn into a static
+    layer costs nothing per frame.
+
+    By default, clearing the window removes every shape in a dynamic layer from the
+    Kivy canvas, and drawing adds them all back.  In retained mode (see
+    :attr:`retained`) the shapes stay on the canvas from one frame to the next.  The
+    shapes drawn in a frame are compared to those of the frame before, and only the
+    shapes that were added, removed (not drawn) or drawn in a different order change
+    the canvas.  You still draw every shape every frame, so a game does not need to
+    change to use retained mode.
+
     **You should never construct an object of this class**.  Creating a new instance
     of this class will not properly display it on the screen.  Instead, you should
     only use the one provided in the `view` attribute of :class:`GameApp`.
     See the documentation of that class for more information.
     """
 
+    # MUTABLE ATTRIBUTES
+    @property
+    def retained(self):
+        """
+        Whether the shapes stay on the canvas from one frame to the next.
+
+        Changing this value clears every dynamic layer.  The value is False by default.
+
+        **Invariant**: Must be a bool
+        """
+        return self._retained
+
+    @retained.setter
+    def retained(self,value):
+        assert type(value) == bool, 'value %s is not a bool' % repr(value)
+        self._retained = value
+        for layer in self._layers.values():
+            if not layer.static:
+                layer.reset()
+
+    @property
+    def background(self):
+        """
+        The color of the window behind every layer.
+
+        The value is white by default.  As with :attr:`GObject.fillcolor`, you may
+        assign a color name, an `RGB` or `HSV` object, or a sequence of 3 or 4 numbers.
+
+        **Invariant**: Must be a 4-element tuple of floats between 0 and 1.
+        """
+        return self._background
+
+    @background.setter
+    def background(self,value):
+        from .gobject import is_color, to_rgba
+        assert is_color(value), '%s is not a valid color' % repr(value)
+        self._background = to_rgba(value)
+        self._reset()
+
+
+    # IMMUTABLE ATTRIBUTES
+    @property
+    def changes(self):
+        """
+        The number of canvas changes made by the last call to :meth:`commit`.
+
+        A change is one command added to or removed from the canvas.  In retained mode,
+        a frame that draws the same shapes in the same order as the frame before makes
+        no changes.  Outside of retained mode, this is always 0, as the canvas is
+        changed directly by :meth:`clear` and :meth:`draw`.
+
+        **Immutable**: This value cannot be altered.
+
+        **Invariant**: Must be an int >= 0
+        """
+        return self._changes
+
+    @property
+    def layers(self):
+        """
+        The names of the layers, in the order they are drawn (back to front).
+
+        **Immutable**: This value cannot be altered.
+
+        **Invariant**: Must be a tuple of strings
+        """
+        return tuple(layer.name for layer in self._order)
+
+
     # BUILT-IN METHODS
     def __init__(self):
         """
@@ -337,14 +423,70 @@ class GView(FloatLayout):
         """
         FloatLayout.__init__(self)
         self._frame = InstructionGroup()
+        self._layers = {}
+        self._order = []
+        self._retained = False
+        self._changes = 0
+        self._background = (1.0,1.0,1.0,1.0)
+        self.addLayer('default')
         self.bind(pos=self._reset)
         self.bind(size=self._reset)
         self._reset()
-        self._contents = set()
 
 
     # PUBLIC METHODS
-    def draw(self,cmd):
+    def addLayer(self,name,depth=0,static=False):
+        """
+        Adds a new, empty layer to this view.
+
+        Layers are drawn from the lowest depth to the highest, so a shape in a layer of
+        higher depth is drawn on top.  Layers of the same depth are drawn in the order
+        they were added.
+
+        :param name: the name of the layer
+        :type name:  ``str``, not the name of another layer
+
+        :param depth: the depth of the layer
+        :type depth:  ``int`` or ``float``
+
+        :param static: whether the layer keeps its shapes until invalidated
+        :type static:  ``bool``
+        """
+        assert type(name) == str, '%s is not a string' % repr(name)
+        assert not name in self._layers, 'there is already a layer %s' % repr(name)
+        assert type(depth) in [int,float], '%s is not a number' % repr(depth)
+        assert type(static) == bool, '%s is not a bool' % repr(static)
+        layer = _Layer(name,depth,static)
+        self._layers[name] = layer
+        self._order.append(layer)
+        self._order.sort(key=lambda layer: layer.depth)
+        self._frame.clear()
+        for layer in self._order:
+            self._frame.add(layer.group)
+
+    def hasLayer(self,name):
+        """
+        Returns True if this view has a layer with the given name.
+
+        :param name: the name of the layer
+        :type name:  ``str``
+        """
+        return name in self._layers
+
+    def invalidate(self,name):
+        """
+        Empties a layer, so that it is drawn again.
+
+        This is meant for static layers, whose shapes are otherwise kept forever.  Call
+        it when the scenery has changed (for example, when a new level starts).
+
+        :param name: the name of the layer
+        :type name:  ``str``, the name of a layer of this view
+        """
+        assert name in self._layers, '%s is not a layer' % repr(name)
+        self._layers[name].reset()
+
+    def draw(self,cmd,layer=None):
         """
         Draws the given Kivy graphics command to this view.
 
@@ -353,20 +495,50 @@ class GView(FloatLayout):
 
         :param cmd: the command to draw
         :type cmd:  A Kivy graphics command
+
+        :param layer: the name of the layer to draw in (None for ``'default'``)
+        :type layer:  ``str`` or ``None``
         """
-        if not cmd in self._contents:
-            self._frame.add(cmd)
-            self._contents.add(cmd)
+        layer = self._layers['default' if layer is None else layer]
+        if not cmd in layer.contents:
+            layer.contents.add(cmd)
+            if self._retained and not layer.static:
+                layer.order.append(cmd)
+            else:
+                layer.group.add(cmd)
 
     def clear(self):
         """
-        Clears the contents of the view.
+        Clears the contents of the dynamic layers of the view.
 
         This method is called for you automatically at the start of the animation
-        frame.  That way, you are not drawing images on top of one another.
-        """
-        self._frame.clear()
-        self._contents.clear()
+        frame.  That way, you are not drawing images on top of one another.  In retained
+        mode, the canvas is not changed until :meth:`commit`.  The static layers are
+        not changed.
+        """
+        for layer in self._order:
+            if layer.static:
+                continue
+            if not self._retained:
+                layer.group.clear()
+            layer.contents.clear()
+            layer.order = []
+
+    def commit(self):
+        """
+        Makes the canvas show exactly the commands drawn since the last :meth:`clear`.
+
+        This method is called for you automatically at the end of the animation frame.
+        It only does something in retained mode, where it changes the canvas as little
+        as it can.  Commands that were drawn the frame before and not this frame are
+        removed, and new commands are inserted where they were drawn.  A command drawn
+        in a new place is removed and inserted again.
+        """
+        self._changes = 0
+        if self._retained:
+            for layer in self._order:
+                if not layer.static:
+                    self._changes += layer.commit()
 
     # HIDDEN METHODS
     def _reset(self,obj=None,value=None):
@@ -374,8 +546,86 @@ class GView(FloatLayout):
         Resets the view canvas in response to a resizing event
         """
         self.canvas.clear()
-        self.canvas.add(Color(1,1,1))
+        self.canvas.add(Color(*self._background))
         self.canvas.add(Rectangle(pos=self.pos,size=self.size))
         # Work-around for Retina Macs
         self.canvas.add(Scale(dp(1),dp(1),dp(1)))
         self.canvas.add(self._frame)
+
+
+# #mark -
+class _Layer(object):
+    """
+    A class representing one layer of a :class:`GView`.
+
+    This class is hidden, and only used by :class:`GView`.  Its attributes are
+    accessed directly.
+    """
+    # ATTRIBUTES:
+    # Attribute name: the name of the layer
+    # Attribute depth: the depth of the layer (higher is drawn on top)
+    # Attribute static: whether the layer keeps its commands from frame to frame
+    # Attribute group: the commands on the canvas, as an InstructionGroup
+    # Attribute contents: the set of commands drawn since the layer was cleared
+    # Attribute order: the commands drawn since the layer was cleared, in order
+    #   (only in retained mode)
+    # Attribute drawn: the commands on the canvas, in order (only in retained mode)
+
+    def __init__(self,name,depth,static):
+        """
+        Creates a new, empty layer
+
+        :param name: the name of the layer
+        :type name:  ``str``
+
+        :param depth: the depth of the layer
+        :type depth:  ``int`` or ``float``
+
+        :param static: whether the layer keeps its commands from frame to frame
+        :type static:  ``bool``
+        """
+        self.name = name
+        self.depth = depth
+        self.static = static
+        self.group = InstructionGroup()
+        self.reset()
+
+    def reset(self):
+        """
+        Removes every command from this layer, and from the canvas
+        """
+        self.group.clear()
+        self.contents = set()
+        self.order = []
+        self.drawn = []
+
+    def commit(self):
+        """
+        Returns the number of canvas changes made to show the commands in order
+
+        This is the retained mode of :meth:`GView.commit`.
+        """
+        if self.order == self.drawn:
+            self.order = []
+            return 0
+
+        changes = 0
+        for cmd in self.drawn:
+            if not cmd in self.contents:
+                self.group.remove(cmd)
+                changes += 1
+        drawn = [cmd for cmd in self.drawn if cmd in self.contents]
+        placed = set(drawn)
+        for (pos, cmd) in enumerate(self.order):
+            if pos < len(drawn) and drawn[pos] is cmd:
+                continue
+            if cmd in placed:
+                drawn.remove(cmd)
+                self.group.remove(cmd)
+                changes += 1
+            drawn.insert(pos,cmd)
+            self.group.insert(pos,cmd)
+            changes += 1
+        self.drawn = self.order
+        self.order = []
+        return changes
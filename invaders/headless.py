@@ -0,0 +1,310 @@
+"""
+Headless simulation runner for Alien Invaders
+
+This module runs the game without a window.  It builds an Invaders application
+but never opens it.  Instead, it feeds the game a scripted input object and
+calls update directly, as fast as the CPU allows.  This is used for balancing
+and regression runs, which would otherwise cost real time at 60 FPS.
+
+Run it from the command line with
+
+    python invaders --headless --frames 3600 --seed 7 --input sweep
+
+The input is either the name of a built-in script (see SCRIPTS) or a script
+file.  A script file has one entry per line of the form
+
+    FRAME KEY KEY ...
+
+meaning that, starting at animation frame FRAME, exactly the listed keys are
+held down.  A line with only a frame number releases every key.  Blank lines
+and lines starting with # are ignored.  Remember that the game waits for the
+'s' key before every new game or life.
+
+Jose Vizueth jdv72
+10/18/2026
+"""
+from consts import *
+from app import *
+import numpy as np
+import time
+
+# the number of frames to simulate if not given on the command line
+FRAMES = 3600
+
+
+class ScriptInput(object):
+    """
+    A class that stands in for GInput when there is no keyboard.
+
+    It has the same methods and attributes as GInput that the game uses, but the
+    keys held down are set by a script instead of a keyboard.  There is never a
+    touch (mouse press).
+    """
+    # HIDDEN ATTRIBUTES:
+    # Attribute _down: the keys currently held down
+    # Invariant: _down is a frozenset of strings
+    #
+    # Attribute _script: the key changes, sorted by frame
+    # Invariant: _script is a list of (frame, frozenset of strings) pairs
+    #
+    # Attribute _next: the position in _script of the next change
+    # Invariant: _next is an int >= 0
+    #
+    # Attribute _dt: the time in seconds of each animation frame
+    # Invariant: _dt is a float > 0
+
+    @property
+    def touch(self):
+        """
+        The mouse position; always None, as there is no mouse
+        """
+        return None
+
+    @property
+    def key_count(self):
+        """
+        The number of keys currently held down
+        """
+        return len(self._down)
+
+    @property
+    def keys(self):
+        """
+        The keys currently held down, as a tuple of strings
+        """
+        return tuple(self._down)
+
+    def __init__(self, script = (), dt = 1/60):
+        """
+        Initializes a scripted input with no keys held down
+
+        Parameter script: the key changes to make
+        Precondition: script is a sequence of (frame, keys) pairs, where frame is
+        an int >= 0 and keys is a sequence of key names
+
+        Parameter dt: the time in seconds of each animation frame
+        Precondition: dt is a float > 0
+        """
+        self._down = frozenset()
+        self._script = sorted((f, frozenset(k)) for (f, k) in script)
+        self._next = 0
+        self._dt = dt
+
+    def getDt(self):
+        """
+        Returns the time in seconds of the current animation frame
+        """
+        return self._dt
+
+    def is_key_down(self, key):
+        """
+        Returns True if key is currently held down
+
+        Parameter key: the key to test
+        Precondition: key is a string
+        """
+        return key in self._down
+
+    def is_touch_down(self):
+        """
+        Returns False, as there is no mouse
+        """
+        return False
+
+    def setKeys(self, keys):
+        """
+        Sets the keys currently held down
+
+        Parameter keys: the keys to hold down
+        Precondition: keys is a sequence of strings
+        """
+        self._down = frozenset(keys)
+
+    def advance(self, frame):
+        """
+        Applies every change in the script up to (and including) frame
+
+        Parameter frame: the current animation frame
+        Precondition: frame is an int >= 0, never less than in an earlier call
+        """
+        while self._next < len(self._script) and \
+        self._script[self._next][0] <= frame:
+            self._down = self._script[self._next][1]
+            self._next += 1
+
+
+def _sweep(length):
+    """
+    Returns a script that fires while moving back and forth across the screen
+
+    Parameter length: the number of frames in the script
+    Precondition: length is an int >= 0
+    """
+    script = []
+    side = 'left'
+    for frame in range(0, length, 90):
+        script.append((frame, ('s', 'spacebar', side)))
+        side = 'right' if side == 'left' else 'left'
+    return script
+
+
+# the built-in scripts, as functions from a number of frames to a script
+SCRIPTS = {
+    'idle':  lambda length: [(0, ('s',))],
+    'fire':  lambda length: [(0, ('s', 'spacebar'))],
+    'sweep': _sweep,
+}
+
+
+def load_script(name, length):
+    """
+    Returns the script with the given name, or the script in the given file
+
+    Parameter name: a key of SCRIPTS, or the name of a script file
+    Precondition: name is a string
+
+    Parameter length: the number of frames the script should cover
+    Precondition: length is an int >= 0
+    """
+    if name in SCRIPTS:
+        return SCRIPTS[name](length)
+    script = []
+    with open(name) as file:
+        for line in file:
+            line = line.strip()
+            if line != '' and not line.startswith('#'):
+                words = line.split()
+                script.append((int(words[0]), tuple(words[1:])))
+    return script
+
+
+def seeds(seed, n):
+    """
+    Returns a list of n independent seeds derived from seed
+
+    Use this to give every parallel worker its own random stream.  The streams
+    do not overlap, and the same seed always gives the same list.
+
+    Parameter seed: the seed to derive from
+    Precondition: seed is an int >= 0 or None (for a random seed)
+
+    Parameter n: the number of seeds
+    Precondition: n is an int >= 0
+    """
+    return np.random.SeedSequence(seed).spawn(n)
+
+
+def outcome(app):
+    """
+    Returns the outcome of the game: 'won', 'lost' or 'running'
+
+    Parameter app: the game being simulated
+    Precondition: app is an Invaders object
+    """
+    wave = app.getWave()
+    if app.getState() != STATE_COMPLETE or wave is None:
+        return 'running'
+    if wave.aliensWon() or wave.getLives() <= 0:
+        return 'lost'
+    return 'won'
+
+
+def simulate(app, input, frames):
+    """
+    Returns the statistics of a game simulated without a window
+
+    The game runs until it is complete or until frames animation frames have
+    passed, whichever comes first.  The result is a dictionary with the keys
+    'frames', 'seconds', 'fps', 'outcome' and 'lives'.
+
+    Parameter app: the game to simulate, already started with start_headless
+    Precondition: app is an Invaders object
+
+    Parameter input: the input of the game
+    Precondition: input is a ScriptInput (or subclass) given to start_headless
+
+    Parameter frames: the largest number of animation frames to simulate
+    Precondition: frames is an int >= 0
+    """
+    start = time.perf_counter()
+    frame = 0
+    while frame < frames and app.getState() != STATE_COMPLETE:
+        input.advance(frame)
+        app.update(input.getDt())
+        frame += 1
+    seconds = time.perf_counter() - start
+    wave = app.getWave()
+    return {'frames': frame, 'seconds': seconds,
+            'fps': frame/seconds if seconds > 0 else float('inf'),
+            'outcome': outcome(app),
+            'lives': app.getConfig().ship_lives if wave is None
+                else wave.getLives()}
+
+
+def run(frames, seed = None, script = (), dt = 1/60, recorder = None,
+config = DEFAULT_CONFIG):
+    """
+    Returns the statistics of a game simulated without a window
+
+    The game runs until it is complete or until frames animation frames have
+    passed, whichever comes first.  The result is a dictionary with the keys
+    'frames', 'seconds', 'fps', 'outcome' and 'lives'.
+
+    Parameter frames: the largest number of animation frames to simulate
+    Precondition: frames is an int >= 0
+
+    Parameter seed: the seed for the random number generator
+    Precondition: seed is an int >= 0, a numpy SeedSequence, or None (for a
+    random seed)
+
+    Parameter script: the key changes to make
+    Precondition: script is a sequence of (frame, keys) pairs (see ScriptInput)
+
+    Parameter dt: the time in seconds of each animation frame
+    Precondition: dt is a float > 0
+
+    Parameter recorder: the recorder for the game (see replay.py)
+    Precondition: recorder is a Recorder object, or None to not record
+
+    Parameter config: the settings of every wave
+    Precondition: config is a GameConfig object
+    """
+    input = ScriptInput(script, dt)
+    app = Invaders(width=GAME_WIDTH,height=GAME_HEIGHT)
+    app.setConfig(config)
+    app.setSeed(seed)
+    app.setRecorder(recorder)
+    app.start_headless(input)
+    return simulate(app, input, frames)
+
+
+def report(stats):
+    """
+    Prints the statistics of a simulated game
+
+    Parameter stats: the statistics of the game
+    Precondition: stats is a dictionary returned by simulate
+    """
+    print('frames:  %d' % stats['frames'])
+    print('seconds: %.3f' % stats['seconds'])
+    print('fps:     %.1f' % stats['fps'])
+    print('outcome: %s' % stats['outcome'])
+    print('lives:   %d' % stats['lives'])
+
+
+def main(args, recorder = None, config = DEFAULT_CONFIG):
+    """
+    Runs a headless simulation from the command line and prints the results
+
+    Parameter args: the parsed command line arguments
+    Precondition: args has the attributes frames, seed, input and dt
+
+    Parameter recorder: the recorder for the game (see replay.py)
+    Precondition: recorder is a Recorder object, or None to not record
+
+    Parameter config: the settings of every wave
+    Precondition: config is a GameConfig object
+    """
+    frames = FRAMES if args.frames is None else args.frames
+    script = load_script(args.input, frames)
+    report(run(frames, args.seed, script, args.dt, recorder, config))
@@ -6,17 +6,10 @@ that you interact with on the screen is model: the ship, the laser bolts, and
 the aliens.
 
 Just because something is a model does not mean there has to be a special
-class for it. Unless you need something special for your extra gameplay
-features, Ship and Aliens could just be an instance of GImage that you move
-across the screen. You only need a new class when you add extra features to
-an object. So technically Bolt, which has a velocity, is really the only model
-that needs to have its own class.
-
-With that said, we have included the subclasses for Ship and Aliens. That is
-because there are a lot of constants in consts.py for initializing the
-objects, and you might want to add a custom initializer.  With that said,
-feel free to keep the pass underneath the class definitions if you do not want
-to do that.
+class for it.  The ship is a Ship, as it has an initializer and an explosion.
+The aliens are not objects at all: a Formation keeps the living cells of the
+grid and computes their positions.  The laser bolts are all kept in one
+BoltPool, which also has the rules for bolts hitting the ship and the aliens.
 
 You are free to add even more models to this module.  You may wish to do this
 when you add new features to your game, such as power-ups.  If you are unsure
@@ -27,12 +20,19 @@ Jose Vizueth jdv72
 """
 from consts import *
 from game2d import *
+import numpy as np
+import bisect
+import struct
+import zlib
 
 # PRIMARY RULE: Models are not allowed to access anything in any module other
 # than consts.py.  If you need extra information from Gameplay, then it should
 # be a parameter in your method, and Wave should pass it as a argument when it
 # calls the method.
 
+# the layout of the offset and direction of a formation, for hashing
+_FORMATION = struct.Struct('<dd?')
+
 
 class Ship(GSprite):
     """
@@ -46,12 +46,8 @@ class Ship(GSprite):
     you want to prevent the player from moving the ship offscreen.  This
     is an ideal thing to do in a method.
 
-    You also MIGHT want to add code to detect a collision with a bolt. We
-    do not require this.  You could put this method in Wave if you wanted to.
-    But the advantage of putting it here is that Ships and Aliens collide
-    with different bolts.  Ships collide with Alien bolts, not Ship bolts.
-    And Aliens collide with Ship bolts, not Alien bolts. An easy way to
-    keep this straight is for this class to have its own collision method.
+    The ship does not check for collisions itself.  Wave asks the BoltPool
+    for the alien bolts that touch the ship (see BoltPool.collide).
 
     However, there is no need for any more attributes other than those
     inherited by GImage. You would only add attributes if you needed them
@@ -60,195 +56,1035 @@ class Ship(GSprite):
     #  IF YOU ADD ATTRIBUTES, LIST THEM BELOW
     #Attribute _frame: the frame that the ship has
     #Invariant: _frame is an int
+    #
+    #Attribute _config: the settings of the wave of this ship
+    #Invariant: _config is a GameConfig object
     # GETTERS AND SETTERS (ONLY ADD IF YOU NEED THEM)
 
     # INITIALIZER TO CREATE A NEW SHIP
-    def __init__(self):
+    def __init__(self, config = DEFAULT_CONFIG):
         """
         Initializes the ship subcontroller
-        """
-        super().__init__(x = GAME_WIDTH/2, y = (SHIP_BOTTOM + (SHIP_HEIGHT/2)),\
-        width = SHIP_WIDTH, height=SHIP_HEIGHT,source=SHIP_ANIMATION,format=(2,4))
-
-    # METHODS TO MOVE THE SHIP AND CHECK FOR COLLISIONS
-    def collides(self, bolt):
-        """
-        Returns True if the enemy bolt collides with ship
 
-        This method returns False if bolt was fired by the player
-
-        Parameter bolt: The laser bolt to check
-        Precondition: bolt is of class Bolt
+        Parameter config: the settings of the wave
+        Precondition: config is a GameConfig object
         """
-        if not bolt.isPlayerBolt():
-            corner1 = self.contains((bolt.x+(BOLT_WIDTH/2), \
-            bolt.y+(BOLT_HEIGHT/2)))
-            corner2 = self.contains((bolt.x+(BOLT_WIDTH/2), \
-            bolt.y-(BOLT_HEIGHT/2)))
-            corner3 = self.contains((bolt.x-(BOLT_WIDTH/2), \
-            bolt.y+(BOLT_HEIGHT/2)))
-            corner4 = self.contains((bolt.x-(BOLT_WIDTH/2), \
-            bolt.y-(BOLT_HEIGHT/2)))
-            if corner1 or corner2 or corner3 or corner4:
-                return True
-        else:
-            return False
+        super().__init__(x = GAME_WIDTH/2, y = config.ship_y,\
+        width = config.ship_width, height=config.ship_height,\
+        source=SHIP_ANIMATION, format=SHIP_FORMAT)
+        self._config = config
 
     # COROUTINE METHOD TO ANIMATE THE SHIP
-    def animateExplosion(self):
+    def animateExplosion(self, start = 0):
         """
-        Animates the explosion of the ship over DEATH_SPEED seconds
+        Animates the explosion of the ship over death_speed seconds (see
+        GameConfig)
 
         Parameter dt: THe time since the last animation frame
         Precondition: dt is a float
+
+        Parameter start: the time the explosion has already run, used to pick
+        up an explosion again after Wave.restore
+        Precondition: start is a float >= 0
         """
-        totaltime = 0
+        totaltime = start
         animating = True
         while animating:
             dt = (yield)
             totaltime += dt
-            dividedtime = totaltime/DEATH_SPEED
+            dividedtime = totaltime/self._config.death_speed
             self.frame = int(dividedtime * (self.count - 1))
     # ADD MORE METHODS (PROPERLY SPECIFIED) AS NECESSARY
 
 
-class Alien(GImage):
+# IF YOU NEED ADDITIONAL MODEL CLASSES, THEY GO HERE
+
+
+class Formation(object):
     """
-    A class to represent a single alien.
+    A class representing the marching formation of aliens as an implicit grid.
 
-    At the very least, you want a __init__ method to initialize the alien
-    dimensions. These dimensions are all specified in consts.py.
+    The formation does not store a position for every alien.  Instead, it keeps
+    a single offset (the center of the bottom-left cell) and a mask saying which
+    cells still hold a living alien.  The center of any cell can be computed
+    from the offset with arithmetic, so moving the formation only changes the
+    offset, and a bolt can be mapped to the one cell it could be touching
+    without looking at any other alien.
 
-    You also MIGHT want to add code to detect a collision with a bolt. We
-    do not require this.  You could put this method in Wave if you wanted to.
-    But the advantage of putting it here is that Ships and Aliens collide
-    with different bolts.  Ships collide with Alien bolts, not Ship bolts.
-    And Aliens collide with Ship bolts, not Alien bolts. An easy way to
-    keep this straight is for this class to have its own collision method.
+    The formation also keeps aggregates that are updated whenever an alien is
+    killed: the number of living aliens, the number of living aliens in each
+    row and column, and the leftmost, rightmost and bottom occupied lines.
+    These are enough to detect edge bounces and the defense line without
+    scanning the grid.
 
-    However, there is no need for any more attributes other than those
-    inherited by GImage. You would only add attributes if you needed them
-    for extra gameplay features (like giving each alien a score value).
+    Row 0 is the bottom row and column 0 is the left column.
     """
-    #  IF YOU ADD ATTRIBUTES, LIST THEM BELOW
-    #Attribute _x: The horizontal coordinate of the object center
-    #Invariant: _x is an int or float
+    # HIDDEN ATTRIBUTES:
+    # Attribute _rows: the number of rows in the formation
+    # Invariant: _rows is an int > 0
+    #
+    # Attribute _cols: the number of aliens in each row
+    # Invariant: _cols is an int > 0
+    #
+    # Attribute _config: the settings of the wave (for the sizes and steps)
+    # Invariant: _config is a GameConfig object
+    #
+    # Attribute _x: the horizontal coordinate of the center of cell (0,0)
+    # Invariant: _x is an int or float
+    #
+    # Attribute _y: the vertical coordinate of the center of cell (0,0)
+    # Invariant: _y is an int or float
+    #
+    # Attribute _right: True if the formation is marching to the right
+    # Invariant: _right is a bool
+    #
+    # Attribute _alive: the cells that hold a living alien
+    # Invariant: _alive is a numpy bool array of shape (_rows,_cols)
+    #
+    # Attribute _count: the number of living aliens
+    # Invariant: _count is an int, equal to the number of True cells in _alive
+    #
+    # Attribute _rowcount: the number of living aliens in each row
+    # Invariant: _rowcount is a numpy int array of length _rows
+    #
+    # Attribute _colcount: the number of living aliens in each column
+    # Invariant: _colcount is a numpy int array of length _cols
+    #
+    # Attribute _left: the leftmost column with a living alien
+    # Invariant: _left is an int in 0.._cols-1, or _cols if _count is 0
+    #
+    # Attribute _rightcol: the rightmost column with a living alien
+    # Invariant: _rightcol is an int in 0.._cols-1, or -1 if _count is 0
+    #
+    # Attribute _bottom: the bottom row with a living alien
+    # Invariant: _bottom is an int in 0.._rows-1, or _rows if _count is 0
+    #
+    # Attribute _front: the bottom row with a living alien in each column
+    # Invariant: _front is a numpy int array of length _cols, where _front[col]
+    # is _rows if column col is empty
+    #
+    # Attribute _columns: the columns that still have a living alien
+    # Invariant: _columns is a sorted list of ints in 0.._cols-1
+    #
+    # Attribute _tree: a Fenwick (binary indexed) tree of _colcount
+    # Invariant: _tree is a list of _cols+1 ints, where _tree[i] is the sum of
+    # _colcount over the columns i-(i & -i)..i-1
+    #
+    # Attribute _version: a counter that changes whenever the formation moves
+    # or loses an alien
+    # Invariant: _version is an int >= 0
+    #
+    # Attribute _hash: the hash of the formation when it was last hashed
+    # Invariant: _hash is an int (a CRC-32)
+    #
+    # Attribute _hashed: the version of the formation when it was last hashed
+    # Invariant: _hashed is an int, or None if _hash is out of date
+    #
+    # Attribute _aliveview: a read-only view of _alive
+    # Invariant: _aliveview is a numpy bool array backed by _alive
+    #
+    # Attribute _centers: the center of every cell, as (x, y) pairs
+    # Invariant: _centers is a numpy float array of shape (_rows,_cols,2),
+    # up to date when _centered is _version
+    #
+    # Attribute _centerview: a read-only view of _centers
+    # Invariant: _centerview is a numpy float array backed by _centers
+    #
+    # Attribute _centered: the version of the formation when _centers was
+    # last computed
+    # Invariant: _centered is an int, or None if _centers is out of date
 
-    #Attribute _y: The vertical coordinate of the object center
-    #Invariant: _y is an int or float
+    # GETTERS AND SETTERS
+    def getRows(self):
+        """
+        Returns the number of rows in the formation
+        """
+        return self._rows
 
-    #Attribute _width: The width of the image
-    #Invariant: _width is an int or float >= 0
+    def getCols(self):
+        """
+        Returns the number of aliens in each row
+        """
+        return self._cols
 
-    #Attribute _height: The height of the image
-    #Invariant: _height is an int or float >= 0
+    def getCount(self):
+        """
+        Returns the number of living aliens
+        """
+        return self._count
 
-    #Attribute _source: The source file of this image
-    #Invariant: _source must be a string refering to a valid file
+    def getVersion(self):
+        """
+        Returns a counter that changes whenever the formation moves or loses
+        an alien
 
-    #Attribute _alien: The alien to animate
-    #Invariant: _alien is a GImage
+        Two equal versions mean that no alien has to be redrawn.
+        """
+        return self._version
 
-    # GETTERS AND SETTERS (ONLY ADD IF YOU NEED THEM)
+    def isMovingRight(self):
+        """
+        Returns True if the formation is marching to the right
+        """
+        return self._right
+
+    def isAlive(self, row, col):
+        """
+        Returns True if the cell (row,col) holds a living alien
+
+        Parameter row: the row of the cell
+        Precondition: row is an int in 0..getRows()-1
+
+        Parameter col: the column of the cell
+        Precondition: col is an int in 0..getCols()-1
+        """
+        return bool(self._alive[row, col])
+
+    def getFront(self, col):
+        """
+        Returns the bottom row with a living alien in column col, or None
+
+        This is the only alien in the column that can shoot.  This method
+        returns None if the column is empty.
+
+        Parameter col: the column to check
+        Precondition: col is an int in 0..getCols()-1
+        """
+        row = int(self._front[col])
+        return None if row == self._rows else row
+
+    def getShooterCount(self):
+        """
+        Returns the number of columns that still have a living alien
+        """
+        return len(self._columns)
+
+    def getShooter(self, index):
+        """
+        Returns the column at position index among the non-empty columns
+
+        The non-empty columns are ordered from left to right.
+
+        Parameter index: the position of the column
+        Precondition: index is an int in 0..getShooterCount()-1
+        """
+        return self._columns[index]
+
+    def getLeft(self):
+        """
+        Returns the left edge of the leftmost living alien
+
+        If no alien is alive, this returns GAME_WIDTH.
+        """
+        if self._count == 0:
+            return GAME_WIDTH
+        return self.cellX(self._left) - self._config.alien_half_width
+
+    def getRight(self):
+        """
+        Returns the right edge of the rightmost living alien
+
+        If no alien is alive, this returns 0.
+        """
+        if self._count == 0:
+            return 0
+        return self.cellX(self._rightcol) + self._config.alien_half_width
+
+    def getBottom(self):
+        """
+        Returns the bottom edge of the lowest living alien
+
+        If no alien is alive, this returns GAME_HEIGHT.
+        """
+        if self._count == 0:
+            return GAME_HEIGHT
+        return self.cellY(self._bottom) - self._config.alien_half_height
+
+    def getOrigin(self):
+        """
+        Returns (x, y), the center of cell (0,0)
+
+        Every other cell is a fixed distance from this point, so this is the
+        only position that changes when the formation marches.
+        """
+        return (self._x, self._y)
+
+    # INITIALIZER TO CREATE A FULL FORMATION
+    def __init__(self, rows, cols, config = DEFAULT_CONFIG):
+        """
+        Initializes a formation where every cell holds a living alien
 
-    # INITIALIZER TO CREATE AN ALIEN
-    def __init__(self, x, y, width, height, source):
+        The top row is alien_ceiling pixels below the top of the window.
+
+        Parameter rows: the number of rows in the formation
+        Precondition: rows is an int > 0
+
+        Parameter cols: the number of aliens in each row
+        Precondition: cols is an int > 0
+
+        Parameter config: the settings of the wave
+        Precondition: config is a GameConfig object
+        """
+        self._rows = rows
+        self._cols = cols
+        self._config = config
+        self._x = config.alien_h_sep + config.alien_half_width + \
+        config.alien_h_pitch
+        self._y = GAME_HEIGHT - config.alien_ceiling - \
+        config.alien_half_height - ((rows-1) * config.alien_v_pitch)
+        self._right = True
+        self._alive = np.ones((rows, cols), dtype=bool)
+        self._count = rows * cols
+        self._rowcount = np.full(rows, cols, dtype=int)
+        self._colcount = np.full(cols, rows, dtype=int)
+        self._left = 0
+        self._rightcol = cols - 1
+        self._bottom = 0
+        self._front = np.zeros(cols, dtype=int)
+        self._columns = list(range(cols))
+        self._tree = [0] * (cols + 1)
+        for col in range(cols):
+            self._treeadd(col, rows)
+        self._version = 0
+        self._hash = 0
+        self._hashed = None
+        self._aliveview = _readonly(self._alive)
+        self._centers = np.zeros((rows, cols, 2))
+        self._centerview = _readonly(self._centers)
+        self._centered = None
+
+    # METHODS TO FIND THE ALIENS IN THE GRID
+    def cellX(self, col):
+        """
+        Returns the horizontal coordinate of the center of column col
+
+        Parameter col: the column of the cell
+        Precondition: col is an int
+        """
+        return self._x + col * self._config.alien_h_pitch
+
+    def cellY(self, row):
+        """
+        Returns the vertical coordinate of the center of row row
+
+        Parameter row: the row of the cell
+        Precondition: row is an int
+        """
+        return self._y + row * self._config.alien_v_pitch
+
+    def hit(self, x, y):
         """
-        Initializes the Alien subcontroller
+        Returns the (row,col) cell of the living alien hit by a bolt, or None
+
+        A bolt hits an alien when one of its corners is inside of the alien.
+        As the gaps between aliens are wider than a bolt, each corner can only
+        be inside of the alien in the cell nearest to it.  Hence this method
+        only has to look at one cell per corner.
 
-        Parameter x: The horizontal coordinate of the object center
-        Precondition: x must be an int or float
+        Parameter x: the horizontal coordinate of the bolt center
+        Precondition: x is an int or float
 
-        Parameter y: The verical coordinate of the object center
-        Precondition: y must be an int or float
+        Parameter y: the vertical coordinate of the bolt center
+        Precondition: y is an int or float
+        """
+        config = self._config
+        for px in (x + config.bolt_half_width, x - config.bolt_half_width):
+            col = round((px - self._x) / config.alien_h_pitch)
+            if 0 <= col < self._cols and self._colcount[col] > 0 and \
+            abs(px - self.cellX(col)) < config.alien_half_width:
+                for py in (y + config.bolt_half_height,
+                           y - config.bolt_half_height):
+                    row = round((py - self._y) / config.alien_v_pitch)
+                    if 0 <= row < self._rows and self._alive[row, col] and \
+                    abs(py - self.cellY(row)) < config.alien_half_height:
+                        return (row, col)
+        return None
 
-        Parameter width: The width of the image
-        Precondition: width must be an int or float >= 0
+    def columnAt(self, k):
+        """
+        Returns the column of the k-th living alien, counting column by column
 
-        Parameter height: The height of the image
-        Precondition: height must be an int or float >= 0
+        Columns are counted from left to right, so a uniformly random k picks
+        each column with a probability proportional to the number of aliens in
+        it.  This takes O(log n) time for n columns.
 
-        Parameter source: The source file for this image
-        Precondition: source must be a string refering to a valid file
+        Parameter k: the position of the alien
+        Precondition: k is an int in 0..getCount()-1
         """
-        super().__init__(x = x, y = y, width = width, height = height, \
-        source = source)
+        pos = 0
+        step = 1
+        while step * 2 <= self._cols:
+            step *= 2
+        while step > 0:
+            if pos + step <= self._cols and self._tree[pos + step] <= k:
+                pos += step
+                k -= self._tree[pos]
+            step //= 2
+        return pos
 
-    # METHOD TO CHECK FOR COLLISION (IF DESIRED)
-    def collides(self, bolt):
+    def nearestColumn(self, x):
         """
-        Returns True if the player bolt collides with this alien
+        Returns the non-empty column whose center is closest to x, or None
 
-        This method returns False if bolt was not fired by the player
+        This uses a binary search over the non-empty columns, so it takes
+        O(log n) time for n columns.  It returns None if no alien is alive.
 
-        Parameter bolt: The laser bolt to check
-        Precondition: bolt is of class Bolt
+        Parameter x: the horizontal coordinate to compare to
+        Precondition: x is an int or float
         """
-        if bolt.isPlayerBolt():
-            corner1 = self.contains((bolt.x+(BOLT_WIDTH/2), \
-            bolt.y+(BOLT_HEIGHT/2)))
-            corner2 = self.contains((bolt.x+(BOLT_WIDTH/2), \
-            bolt.y-(BOLT_HEIGHT/2)))
-            corner3 = self.contains((bolt.x-(BOLT_WIDTH/2), \
-            bolt.y+(BOLT_HEIGHT/2)))
-            corner4 = self.contains((bolt.x-(BOLT_WIDTH/2), \
-            bolt.y-(BOLT_HEIGHT/2)))
-            if corner1 or corner2 or corner3 or corner4:
-                return True
+        if len(self._columns) == 0:
+            return None
+        col = round((x - self._x) / self._config.alien_h_pitch)
+        i = bisect.bisect_left(self._columns, col)
+        best = None
+        for j in (i - 1, i):
+            if 0 <= j < len(self._columns):
+                c = self._columns[j]
+                if best is None or \
+                abs(self.cellX(c) - x) < abs(self.cellX(best) - x):
+                    best = c
+        return best
+
+    # METHODS TO CHANGE THE FORMATION
+    def kill(self, row, col):
+        """
+        Removes the alien in cell (row,col), updating the aggregates
+
+        Parameter row: the row of the cell
+        Precondition: row is an int in 0..getRows()-1 and the cell is alive
+
+        Parameter col: the column of the cell
+        Precondition: col is an int in 0..getCols()-1 and the cell is alive
+        """
+        self._alive[row, col] = False
+        self._count -= 1
+        self._rowcount[row] -= 1
+        self._colcount[col] -= 1
+        self._treeadd(col, -1)
+        if self._front[col] == row:
+            front = row + 1
+            while front < self._rows and not self._alive[front, col]:
+                front += 1
+            self._front[col] = front
+        if self._colcount[col] == 0:
+            del self._columns[bisect.bisect_left(self._columns, col)]
+        while self._left < self._cols and self._colcount[self._left] == 0:
+            self._left += 1
+        while self._rightcol >= 0 and self._colcount[self._rightcol] == 0:
+            self._rightcol -= 1
+        while self._bottom < self._rows and self._rowcount[self._bottom] == 0:
+            self._bottom += 1
+        self._version += 1
+
+    def march(self):
+        """
+        Moves the formation one step
+
+        The formation walks alien_h_walk pixels in its current direction. If
+        that would take a living alien closer than alien_h_sep to the side of
+        the window, it instead drops alien_v_sep pixels and turns around (see
+        GameConfig).
+        """
+        config = self._config
+        if self._right:
+            bounce = self.getRight() + config.alien_h_walk > \
+            GAME_WIDTH - config.alien_h_sep
         else:
-            return False
-    # ADD MORE METHODS (PROPERLY SPECIFIED) AS NECESSARY
+            bounce = self.getLeft() - config.alien_h_walk < config.alien_h_sep
+        if bounce:
+            self._y -= config.alien_v_sep
+            self._right = not self._right
+        elif self._right:
+            self._x += config.alien_h_walk
+        else:
+            self._x -= config.alien_h_walk
+        self._version += 1
+
+    # METHODS TO SAVE AND RESTORE THE FORMATION
+    def snapshot(self):
+        """
+        Returns a copy of the state of the formation, to give to restore
+
+        The state is the tuple (x, y, right, alive, version), where alive is a
+        copy of the living cells.  The aggregates are not saved, as they all
+        follow from alive.
+        """
+        return (self._x, self._y, self._right, self._alive.copy(), self._version)
+
+    def restore(self, state):
+        """
+        Returns the formation to a state saved by snapshot
+
+        Aliens killed since the snapshot come back to life, as only the living
+        cells changed.  The aggregates are rebuilt from the living cells.
+
+        Parameter state: the state to return to
+        Precondition: state is a tuple returned by snapshot on a formation of
+        the same size
+        """
+        (self._x, self._y, self._right, alive, self._version) = state
+        self._alive[:] = alive
+        self._hashed = None
+        self._rebuild()
+
+    def getAliveView(self):
+        """
+        Returns a read-only view of the living cells, of shape (rows,cols)
+
+        The view shares memory with the formation, so it always shows the
+        current cells and costs nothing to get.  Row 0 is the bottom row.
+        """
+        return self._aliveview
+
+    def getCenterView(self):
+        """
+        Returns a read-only view of the center of every cell, as (x, y) pairs
+
+        The array has shape (rows,cols,2) and is owned by the formation.  It
+        is recomputed in place when the formation has moved since the last
+        call, so it must be asked for again after every update.
+        """
+        if self._centered != self._version:
+            config = self._config
+            self._centers[:, :, 0] = self._x + \
+                np.arange(self._cols) * config.alien_h_pitch
+            self._centers[:, :, 1] = self._y + \
+                np.arange(self._rows)[:, None] * config.alien_v_pitch
+            self._centered = self._version
+        return self._centerview
+
+    def copyAlive(self, out):
+        """
+        Copies the living cells into out, without allocating
+
+        Parameter out: the array to copy into
+        Precondition: out is a numpy bool array of shape (getRows(),getCols())
+        """
+        np.copyto(out, self._alive)
+
+    def getHash(self):
+        """
+        Returns a CRC-32 of the offset, direction and living cells
+
+        The hash is only recomputed when the formation has changed since the
+        last call, which is at most once per alien step or kill.
+        """
+        if self._hashed != self._version:
+            crc = zlib.crc32(_FORMATION.pack(self._x, self._y, self._right))
+            self._hash = zlib.crc32(self._alive.tobytes(), crc)
+            self._hashed = self._version
+        return self._hash
+
+    # METHOD TO CHECK THE AGGREGATES (see fuzz.py)
+    def check(self):
+        """
+        Returns the names of the aggregates that do not follow from _alive
+
+        The list is empty if the formation is consistent.  The aggregates are
+        rebuilt from the living cells to compare them, so a formation that
+        fails the check is repaired by it.
+        """
+        before = [self._count, self._rowcount.tolist(), self._colcount.tolist(),
+            self._left, self._rightcol, self._bottom, self._front.tolist(),
+            list(self._columns), list(self._tree)]
+        self._rebuild()
+        after = [self._count, self._rowcount.tolist(), self._colcount.tolist(),
+            self._left, self._rightcol, self._bottom, self._front.tolist(),
+            list(self._columns), list(self._tree)]
+        names = ('_count', '_rowcount', '_colcount', '_left', '_rightcol',
+            '_bottom', '_front', '_columns', '_tree')
+        return [name for (name, old, new) in zip(names, before, after)
+            if old != new]
+
+    # HIDDEN METHODS
+    def _rebuild(self):
+        """
+        Recomputes every aggregate from the living cells in _alive
+        """
+        self._rowcount = self._alive.sum(axis=1)
+        self._colcount = self._alive.sum(axis=0)
+        self._count = int(self._rowcount.sum())
+        self._columns = np.flatnonzero(self._colcount).tolist()
+        rows = np.flatnonzero(self._rowcount)
+        if self._count == 0:
+            self._left = self._cols
+            self._rightcol = -1
+            self._bottom = self._rows
+        else:
+            self._left = self._columns[0]
+            self._rightcol = self._columns[-1]
+            self._bottom = int(rows[0])
+        self._front = np.where(self._colcount > 0, self._alive.argmax(axis=0),
+        self._rows)
+        # Build the Fenwick tree in place, pushing each node into its parent
+        self._tree = [0] + self._colcount.tolist()
+        for i in range(1, self._cols + 1):
+            parent = i + (i & -i)
+            if parent <= self._cols:
+                self._tree[parent] += self._tree[i]
+
+    def _treeadd(self, col, delta):
+        """
+        Adds delta to the count of column col in the Fenwick tree
+
+        Parameter col: the column to change
+        Precondition: col is an int in 0..getCols()-1
+
+        Parameter delta: the amount to add
+        Precondition: delta is an int
+        """
+        i = col + 1
+        while i <= self._cols:
+            self._tree[i] += delta
+            i += i & -i
 
 
-class Bolt(GRectangle):
+class Shooter(object):
     """
-    A class representing a laser bolt.
+    A class representing a policy for picking which alien fires next.
+
+    Only the bottom alien of a column can shoot, so a policy picks a column and
+    the formation supplies the alien at its front.  This base class picks a
+    column uniformly at random, in O(1) time.  Subclasses override the method
+    choose to implement other policies.
+    """
+
+    def choose(self, formation, x, rng):
+        """
+        Returns the column of the alien that fires next, or None
 
-    Laser bolts are often just thin, white rectangles. The size of the bolt
-    is determined by constants in consts.py. We MUST subclass GRectangle,
-    because we need to add an extra (hidden) attribute for the velocity of
-    the bolt.
+        This method returns None if there is no alien left to fire.
 
-    The class Wave will need to look at these attributes, so you will need
-    getters for them.  However, it is possible to write this assignment with
-    no setters for the velocities.  That is because the velocity is fixed and
-    cannot change once the bolt is fired.
+        Parameter formation: the formation of aliens
+        Precondition: formation is a Formation object
 
-    In addition to the getters, you need to write the __init__ method to set
-    the starting velocity. This __init__ method will need to call the __init__
-    from GRectangle as a  helper.
+        Parameter x: the horizontal coordinate of the ship, or None
+        Precondition: x is an int, float or None (if there is no ship)
 
-    You also MIGHT want to create a method to move the bolt.  You move the
-    bolt by adding the velocity to the y-position.  However, the getter
-    allows Wave to do this on its own, so this method is not required.
+        Parameter rng: the random generator to use
+        Precondition: rng is a numpy Generator
+        """
+        n = formation.getShooterCount()
+        if n == 0:
+            return None
+        return formation.getShooter(int(rng.integers(0, n)))
+
+
+class UniformShooter(Shooter):
     """
-    # INSTANCE ATTRIBUTES:
-    # Attribute _velocity: the velocity in y direction
-    # Invariant: _velocity is an int or float
+    A shooter policy where every non-empty column is equally likely to fire.
 
-    # LIST MORE ATTRIBUTES (AND THEIR INVARIANTS) HERE IF NECESSARY
-    # Attribute _fromplayer: is true if the bolt is from the player
-    # Invariant: _fromplayer is a bool
+    This is the original behavior of the game.
+    """
+    pass
 
-    # GETTERS AND SETTERS (ONLY ADD IF YOU NEED THEM)
 
-    # INITIALIZER TO SET THE VELOCITY
-    def __init__(self, x, y, velocity, fromplayer = False):
-        super().__init__(x = x, y = y, width = BOLT_WIDTH, height = BOLT_HEIGHT\
-        , fillcolor = 'red', linecolor = 'red')
-        self._velocity = velocity
-        self._fromplayer = fromplayer
+class WeightedShooter(Shooter):
+    """
+    A shooter policy where a column fires in proportion to its living aliens.
 
-    # ADD MORE METHODS (PROPERLY SPECIFIED) AS NECESSARY
-    def movingbolt(self):
+    Full columns fire more often than columns that have been shot down.  The
+    choice takes O(log n) time for n columns.
+    """
+
+    def choose(self, formation, x, rng):
         """
-        Moves the bolt by the velocity of the bolt
+        Returns the column of the alien that fires next, or None
+
+        Parameter formation: the formation of aliens
+        Precondition: formation is a Formation object
+
+        Parameter x: the horizontal coordinate of the ship, or None
+        Precondition: x is an int, float or None (if there is no ship)
+
+        Parameter rng: the random generator to use
+        Precondition: rng is a numpy Generator
         """
-        self.y += self._velocity
+        if formation.getCount() == 0:
+            return None
+        return formation.columnAt(int(rng.integers(0, formation.getCount())))
 
-    def isPlayerBolt(self):
+
+class NearestShooter(Shooter):
+    """
+    A shooter policy where the column closest to the ship fires.
+
+    If there is no ship, this falls back to a uniform choice.  The choice
+    takes O(log n) time for n columns.
+    """
+
+    def choose(self, formation, x, rng):
         """
-        Returns True if the bolt is from the player
+        Returns the column of the alien that fires next, or None
+
+        Parameter formation: the formation of aliens
+        Precondition: formation is a Formation object
+
+        Parameter x: the horizontal coordinate of the ship, or None
+        Precondition: x is an int, float or None (if there is no ship)
+
+        Parameter rng: the random generator to use
+        Precondition: rng is a numpy Generator
         """
-        return self._fromplayer
-# IF YOU NEED ADDITIONAL MODEL CLASSES, THEY GO HERE
+        if x is None:
+            return Shooter.choose(self, formation, x, rng)
+        return formation.nearestColumn(x)
+
+
+class BoltPool(object):
+    """
+    A class representing every laser bolt on screen, stored as parallel arrays.
+
+    Allocating a GRectangle for every shot is expensive, and so is deleting
+    bolts from the middle of a list.  Instead, the pool keeps the position,
+    velocity and owner of each bolt in fixed-size numpy arrays.  The bolts
+    in play are always the first getCount() entries.  When a bolt is removed,
+    the last bolt is moved into its slot, so removal takes O(1) time.  Moving
+    the bolts and removing the ones off screen are single array operations.
+
+    The pool only creates GRectangles to draw, and it reuses them every frame.
+    """
+    # HIDDEN ATTRIBUTES:
+    # Attribute _x: the horizontal coordinate of each bolt center
+    # Invariant: _x is a numpy float array of length bolt_capacity
+    #
+    # Attribute _y: the vertical coordinate of each bolt center
+    # Invariant: _y is a numpy float array of length bolt_capacity
+    #
+    # Attribute _vy: the velocity of each bolt in the y direction
+    # Invariant: _vy is a numpy float array of length bolt_capacity
+    #
+    # Attribute _player: whether each bolt was fired by the player
+    # Invariant: _player is a numpy bool array of length bolt_capacity
+    #
+    # Attribute _count: the number of bolts in play
+    # Invariant: _count is an int in 0..bolt_capacity; only the first _count
+    # entries of the arrays are bolts in play
+    #
+    # Attribute _config: the settings of the wave (for the bolt size and the
+    # capacity bolt_capacity)
+    # Invariant: _config is a GameConfig object
+    #
+    # Attribute _players: the number of bolts in play fired by the player
+    # Invariant: _players is an int in 0.._count
+    #
+    # Attribute _batch: the batch the bolts are drawn with, made when first
+    # drawn
+    # Invariant: _batch is a GSpriteBatch object, or None if never drawn
+    #
+    # Attribute _views: read-only views of _x, _y, _vy and _player
+    # Invariant: _views is a tuple of four numpy arrays backed by the pool
+
+    # GETTERS AND SETTERS
+    def getCount(self):
+        """
+        Returns the number of bolts in play
+        """
+        return self._count
+
+    def getPlayerCount(self):
+        """
+        Returns the number of bolts in play fired by the player
+        """
+        return self._players
+
+    def getX(self, i):
+        """
+        Returns the horizontal coordinate of the center of bolt i
+
+        Parameter i: the bolt index
+        Precondition: i is an int in 0..getCount()-1
+        """
+        return float(self._x[i])
+
+    def getY(self, i):
+        """
+        Returns the vertical coordinate of the center of bolt i
+
+        Parameter i: the bolt index
+        Precondition: i is an int in 0..getCount()-1
+        """
+        return float(self._y[i])
+
+    def getViews(self):
+        """
+        Returns read-only views of the bolts in play, as (x, y, vy, player)
+
+        Each array has getCount() entries and shares memory with the pool, so
+        nothing is copied.  vy is the velocity, and player says whether each
+        bolt was fired by the player.  Removing a bolt moves the last bolt
+        into its slot, so ask for the views again after every update.
+        """
+        n = self._count
+        (x, y, vy, player) = self._views
+        return (x[:n], y[:n], vy[:n], player[:n])
+
+    def isPlayerBolt(self, i):
+        """
+        Returns True if bolt i was fired by the player
+
+        Parameter i: the bolt index
+        Precondition: i is an int in 0..getCount()-1
+        """
+        return bool(self._player[i])
+
+    # INITIALIZER TO CREATE AN EMPTY POOL
+    def __init__(self, config = DEFAULT_CONFIG):
+        """
+        Initializes an empty pool of bolts
+
+        The pool holds up to bolt_capacity bolts at once (see GameConfig).
+
+        Parameter config: the settings of the wave
+        Precondition: config is a GameConfig object
+        """
+        capacity = config.bolt_capacity
+        self._config = config
+        self._x = np.zeros(capacity)
+        self._y = np.zeros(capacity)
+        self._vy = np.zeros(capacity)
+        self._player = np.zeros(capacity, dtype=bool)
+        self._count = 0
+        self._players = 0
+        self._batch = None
+        self._views = tuple(_readonly(array) for array in
+            (self._x, self._y, self._vy, self._player))
+
+    # METHODS TO ADD, MOVE AND REMOVE BOLTS
+    def add(self, x, y, velocity, fromplayer = False):
+        """
+        Adds a bolt to the pool, returning True if there was room for it
+
+        Parameter x: the horizontal coordinate of the bolt center
+        Precondition: x is an int or float
+
+        Parameter y: the vertical coordinate of the bolt center
+        Precondition: y is an int or float
+
+        Parameter velocity: the velocity of the bolt in the y direction
+        Precondition: velocity is an int or float
+
+        Parameter fromplayer: True if the bolt was fired by the player
+        Precondition: fromplayer is a bool
+        """
+        if self._count == len(self._x):
+            return False
+        i = self._count
+        self._x[i] = x
+        self._y[i] = y
+        self._vy[i] = velocity
+        self._player[i] = fromplayer
+        self._count += 1
+        if fromplayer:
+            self._players += 1
+        return True
+
+    def remove(self, i):
+        """
+        Removes bolt i, moving the last bolt into its slot
+
+        Parameter i: the bolt index
+        Precondition: i is an int in 0..getCount()-1
+        """
+        if self._player[i]:
+            self._players -= 1
+        last = self._count - 1
+        if i != last:
+            self._x[i] = self._x[last]
+            self._y[i] = self._y[last]
+            self._vy[i] = self._vy[last]
+            self._player[i] = self._player[last]
+        self._count = last
+
+    def move(self):
+        """
+        Moves every bolt by its velocity
+        """
+        n = self._count
+        self._y[:n] += self._vy[:n]
+
+    def cull(self):
+        """
+        Removes every bolt that has left the window
+        """
+        n = self._count
+        if n == 0:
+            return
+        y = self._y[:n]
+        gone = np.flatnonzero((y > GAME_HEIGHT) |
+            (y + self._config.bolt_half_height < 0))
+        for i in gone[::-1]:
+            self.remove(i)
+
+    def collide(self, obj, fromplayer):
+        """
+        Removes the bolts that touch obj, returning the number removed
+
+        Only the bolts with the given owner are considered.  A bolt touches
+        obj when one of its corners is inside of obj, which is treated as an
+        unrotated rectangle.  As obj is larger than a bolt, this is the same
+        as the two rectangles overlapping.
+
+        Parameter obj: the object to check
+        Precondition: obj is a GObject with angle 0, wider and taller than a bolt
+
+        Parameter fromplayer: True to check player bolts, False for alien bolts
+        Precondition: fromplayer is a bool
+        """
+        n = self._count
+        owned = self._players if fromplayer else n - self._players
+        if owned == 0:
+            return 0
+        hw = (obj.width + self._config.bolt_width)/2
+        hh = (obj.height + self._config.bolt_height)/2
+        near = np.abs(self._y[:n] - obj.y) < hh
+        near &= np.abs(self._x[:n] - obj.x) < hw
+        near &= self._player[:n] == fromplayer
+        hits = np.flatnonzero(near)
+        for i in hits[::-1]:
+            self.remove(i)
+        return len(hits)
+
+    def strike(self, formation):
+        """
+        Removes every player bolt that hits a living alien, killing that alien
+
+        Each player bolt is mapped to the one cell it could be touching, so
+        this does not depend on the number of aliens.  This returns the list
+        of (row,col) cells killed, which is usually empty.
+
+        Parameter formation: the formation of aliens
+        Precondition: formation is a Formation object
+        """
+        killed = []
+        if self._players == 0:
+            return killed
+        for i in np.flatnonzero(self._player[:self._count])[::-1]:
+            cell = formation.hit(self._x[i], self._y[i])
+            if cell != None:
+                formation.kill(cell[0], cell[1])
+                self.remove(i)
+                killed.append(cell)
+        return killed
+
+    # METHODS TO SAVE AND RESTORE THE BOLTS
+    def snapshot(self):
+        """
+        Returns a copy of the bolts in play, to give to restore
+
+        The state is the tuple (x, y, vy, player) of copies of the arrays,
+        cut to the bolts in play.
+        """
+        n = self._count
+        return (self._x[:n].copy(), self._y[:n].copy(), self._vy[:n].copy(),
+        self._player[:n].copy())
+
+    def restore(self, state):
+        """
+        Replaces the bolts in play with the bolts saved by snapshot
+
+        Parameter state: the bolts to put in play
+        Precondition: state is a tuple returned by snapshot on a pool with the
+        same capacity
+        """
+        (x, y, vy, player) = state
+        n = len(x)
+        self._x[:n] = x
+        self._y[:n] = y
+        self._vy[:n] = vy
+        self._player[:n] = player
+        self._count = n
+        self._players = int(np.count_nonzero(player))
+
+    def copyBolts(self, out):
+        """
+        Copies the bolts in play into the first rows of out, returning how many
+
+        Row i of out becomes (x, y, vy) of bolt i.  The other rows are not
+        changed.
+
+        Parameter out: the array to copy into
+        Precondition: out is a numpy float array with at least getCount() rows
+        and 3 columns
+        """
+        n = self._count
+        out[:n, 0] = self._x[:n]
+        out[:n, 1] = self._y[:n]
+        out[:n, 2] = self._vy[:n]
+        return n
+
+    def getHash(self, crc = 0):
+        """
+        Returns a CRC-32 of the bolts in play, continuing from crc
+
+        Parameter crc: the CRC-32 of the data before the bolts
+        Precondition: crc is an int
+        """
+        n = self._count
+        crc = zlib.crc32(self._x[:n].tobytes(), crc)
+        crc = zlib.crc32(self._y[:n].tobytes(), crc)
+        crc = zlib.crc32(self._vy[:n].tobytes(), crc)
+        return zlib.crc32(self._player[:n].tobytes(), crc)
+
+    # METHOD TO CHECK THE BOLTS (see fuzz.py)
+    def check(self):
+        """
+        Returns a description of every broken invariant of the pool
+
+        The list is empty if the pool is consistent.  Every bolt must be in
+        the window, except that a bolt may be one move past it (the bolts move
+        after they are culled in Wave.update).
+        """
+        n = self._count
+        config = self._config
+        problems = []
+        if self._players != int(np.count_nonzero(self._player[:n])):
+            problems.append('player count %d for %d player bolts' %
+                (self._players, np.count_nonzero(self._player[:n])))
+        low = -config.bolt_half_height - config.bolt_speed
+        high = GAME_HEIGHT + config.bolt_speed
+        for i in np.flatnonzero((self._y[:n] < low) | (self._y[:n] > high)):
+            problems.append('bolt %d at y=%g' % (i, self._y[i]))
+        for i in np.flatnonzero((self._x[:n] < 0) | (self._x[:n] > GAME_WIDTH)):
+            problems.append('bolt %d at x=%g' % (i, self._x[i]))
+        return problems
+
+    # METHOD TO DRAW THE BOLTS
+    def draw(self, view, alpha = 1):
+        """
+        Draws every bolt in play as one sprite batch
+
+        Each bolt is drawn alpha of the way from where it was before its last
+        move to where it is now, which smooths the motion when the game is
+        drawn between fixed simulation steps.  All of the bolts are a single
+        Mesh, no matter how many there are.
+
+        Parameter view: the window in which it will be drawed upon
+        Precondition: view is a valid GView object
+
+        Parameter alpha: how far the frame is between the last two moves
+        Precondition: alpha is a number in 0..1
+        """
+        if self._batch is None:
+            self._batch = GSpriteBatch()
+        n = self._count
+        self._batch.clear()
+        self._batch.extend(self._x[:n], self._y[:n] - (1 - alpha) *
+            self._vy[:n], self._config.bolt_width, self._config.bolt_height,
+            color='red')
+        self._batch.draw(view)
+
+
+# HELPER FUNCTIONS
+def _readonly(array):
+    """
+    Returns a view of array that cannot be written to
+
+    The view shares memory with array, so it shows every change to array.
+
+    Parameter array: the array to view
+    Precondition: array is a numpy array
+    """
+    view = array.view()
+    view.flags.writeable = False
+    return view
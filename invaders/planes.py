@@ -0,0 +1,283 @@
+"""
+Feature planes for Alien Invaders
+
+This module turns the state of a wave into a stack of coarse grids, one per
+feature in PLANES, for analysis and learning tools that want a spatial view of
+the game without drawing it.  The screen is cut into rows x cols cells of
+equal size, and each plane holds a number per cell:
+
+    'aliens': the number of living aliens whose centers are in the cell
+    'player': the number of player bolts whose centers are in the cell
+    'bolts':  the number of alien bolts whose centers are in the cell
+    'ship':   1 in the cells of the ship's row that the ship covers
+    'line':   1 in the row of the defense line
+
+Row 0 is the bottom of the screen, as in the game.  A plane encoder writes
+into an array owned by the caller:
+
+    encoder = PlaneEncoder(35, 40)
+    out = np.zeros(encoder.getShape(), dtype=np.float32)
+    encoder.encode(wave, out)
+
+Encoding one wave copies no game state; it reads the read-only views of the
+wave (see Wave.getAliveView) and works in buffers made once by the encoder.
+encodeMany encodes a list of waves, and encodeBatch encodes every game of a
+Batch (see batch.py) at once.
+
+Jose Vizueth jdv72
+10/18/2026
+"""
+from consts import *
+import numpy as np
+
+# the names of the planes, in order
+PLANES = ('aliens', 'player', 'bolts', 'ship', 'line')
+# the position of each plane in PLANES
+(_ALIENS, _PLAYER, _BOLTS, _SHIP, _LINE) = range(len(PLANES))
+# the number of rows in each plane if not given
+PLANE_ROWS = 35
+# the number of columns in each plane if not given
+PLANE_COLS = 40
+
+
+class PlaneEncoder(object):
+    """
+    A class that writes the state of waves into feature planes.
+
+    An encoder is made for one GameConfig and one grid size.  The waves it
+    encodes must have that config.
+    """
+    # HIDDEN ATTRIBUTES:
+    # Attribute _rows: the number of rows in each plane
+    # Invariant: _rows is an int > 0
+    #
+    # Attribute _cols: the number of columns in each plane
+    # Invariant: _cols is an int > 0
+    #
+    # Attribute _config: the settings of the waves
+    # Invariant: _config is a GameConfig object
+    #
+    # Attribute _template: the planes that do not change (the defense line)
+    # Invariant: _template is a numpy float array of shape getShape()
+    #
+    # Attribute _shiprow: the row of the ship
+    # Invariant: _shiprow is an int in 0.._rows-1
+    #
+    # Attribute _colx, _rowy: the offset of each alien column and row from
+    # the bottom-left cell
+    # Invariant: each is a numpy float array, of length aliens_in_row and
+    # alien_rows
+    #
+    # Attribute _gx, _gy: scratch space for the grid positions of the alien
+    # columns and rows
+    # Invariant: _gx is a numpy int array of length aliens_in_row, and _gy is
+    # a numpy int array of length alien_rows
+    #
+    # Attribute _cells, _weights: scratch space for the grid cell and the
+    # weight (1 if alive) of each alien
+    # Invariant: each has shape (alien_rows,aliens_in_row); _cells is int
+    #
+    # Attribute _bg, _bh, _bw: scratch space for the bolts, as grid cells, as
+    # grid columns and as weights
+    # Invariant: each has length bolt_capacity; _bg and _bh are int
+
+    # GETTERS
+    def getShape(self):
+        """
+        Returns the shape of the planes of one wave, (planes, rows, cols)
+        """
+        return (len(PLANES), self._rows, self._cols)
+
+    def getConfig(self):
+        """
+        Returns the settings of the waves this encoder can encode
+        """
+        return self._config
+
+    # INITIALIZER
+    def __init__(self, rows = PLANE_ROWS, cols = PLANE_COLS,
+    config = DEFAULT_CONFIG):
+        """
+        Initializes an encoder for a grid of the given size
+
+        Parameter rows: the number of rows in each plane
+        Precondition: rows is an int > 0
+
+        Parameter cols: the number of columns in each plane
+        Precondition: cols is an int > 0
+
+        Parameter config: the settings of the waves
+        Precondition: config is a GameConfig object
+        """
+        self._rows = rows
+        self._cols = cols
+        self._config = config
+        self._template = np.zeros(self.getShape())
+        self._template[_LINE, self._row(config.defense_line)] = 1
+        self._shiprow = self._row(config.ship_y)
+        (arows, acols) = (config.alien_rows, config.aliens_in_row)
+        self._colx = np.arange(acols) * config.alien_h_pitch
+        self._rowy = np.arange(arows) * config.alien_v_pitch
+        self._gx = np.zeros(acols, dtype=int)
+        self._gy = np.zeros(arows, dtype=int)
+        self._cells = np.zeros((arows, acols), dtype=int)
+        self._weights = np.zeros((arows, acols))
+        self._bh = np.zeros(config.bolt_capacity, dtype=int)
+        self._bg = np.zeros(config.bolt_capacity, dtype=int)
+        self._bw = np.zeros(config.bolt_capacity)
+
+    # ENCODING METHODS
+    def encode(self, wave, out):
+        """
+        Writes the planes of a wave into out
+
+        Parameter wave: the wave to encode
+        Precondition: wave is a Wave object with the config of this encoder
+
+        Parameter out: the array to write into
+        Precondition: out is a C-contiguous numpy float array of shape
+        getShape()
+        """
+        np.copyto(out, self._template)
+        flat = out.reshape(len(PLANES), -1)
+        # Aliens: one grid cell per alien cell, weighted by whether it lives
+        centers = wave.getAlienCenters()
+        self._grid(centers[0, :, 0], GAME_WIDTH, self._cols, self._gx)
+        self._grid(centers[:, 0, 1], GAME_HEIGHT, self._rows, self._gy)
+        np.multiply(self._gy[:, None], self._cols, out=self._cells)
+        np.add(self._cells, self._gx[None, :], out=self._cells)
+        np.copyto(self._weights, wave.getAliveView())
+        np.add.at(flat[_ALIENS], self._cells.reshape(-1),
+            self._weights.reshape(-1))
+        # Bolts: the same, with the player bolts split from the alien bolts
+        (x, y, vy, player) = wave.getBoltViews()
+        n = len(x)
+        if n > 0:
+            (cells, cols, weights) = (self._bg[:n], self._bh[:n], self._bw[:n])
+            self._grid(y, GAME_HEIGHT, self._rows, cells)
+            np.multiply(cells, self._cols, out=cells)
+            self._grid(x, GAME_WIDTH, self._cols, cols)
+            np.add(cells, cols, out=cells)
+            np.copyto(weights, player)
+            np.add.at(flat[_PLAYER], cells, weights)
+            np.subtract(1, weights, out=weights)
+            np.add.at(flat[_BOLTS], cells, weights)
+        # Ship: the cells of its row under its width
+        x = wave.getShipX()
+        if x is not None:
+            (left, right) = self._span(x)
+            out[_SHIP, self._shiprow, left:right] = 1
+
+    def encodeMany(self, waves, out):
+        """
+        Writes the planes of each wave into out, one wave per entry
+
+        Parameter waves: the waves to encode
+        Precondition: waves is a sequence of Wave objects with the config of
+        this encoder
+
+        Parameter out: the array to write into
+        Precondition: out is a C-contiguous numpy float array of shape
+        (len(waves),) + getShape()
+        """
+        for (i, wave) in enumerate(waves):
+            self.encode(wave, out[i])
+
+    def encodeBatch(self, batch, out):
+        """
+        Writes the planes of every game of a batch into out, one game per entry
+
+        This works on the arrays of the batch at once, so it makes temporary
+        arrays the size of the batch (but not per game).
+
+        Parameter batch: the games to encode
+        Precondition: batch is a Batch object with the config of this encoder
+
+        Parameter out: the array to write into
+        Precondition: out is a C-contiguous numpy float array of shape
+        (batch.getCount(),) + getShape()
+        """
+        n = batch.getCount()
+        size = self._rows * self._cols
+        np.copyto(out, self._template)
+        flat = out.reshape(n, len(PLANES), size)
+        base = np.arange(n)[:, None] * (len(PLANES) * size)
+        flat = flat.reshape(-1)
+        # Aliens
+        (x, y) = batch.getOffsets()
+        gx = self._grid(x[:, None] + self._colx, GAME_WIDTH, self._cols)
+        gy = self._grid(y[:, None] + self._rowy, GAME_HEIGHT, self._rows)
+        cells = base[:, :, None] + _ALIENS*size + \
+            gy[:, :, None]*self._cols + gx[:, None, :]
+        np.add.at(flat, cells[batch.getAlive()], 1)
+        # Alien bolts, then the player bolts
+        (bx, by, on) = batch.getBolts()
+        cells = base + _BOLTS*size + \
+            self._grid(by, GAME_HEIGHT, self._rows)*self._cols + \
+            self._grid(bx, GAME_WIDTH, self._cols)
+        np.add.at(flat, cells[on], 1)
+        (px, py, on) = batch.getPlayerBolts()
+        cells = base[:, 0] + _PLAYER*size + \
+            self._grid(py, GAME_HEIGHT, self._rows)*self._cols + \
+            self._grid(px, GAME_WIDTH, self._cols)
+        np.add.at(flat, cells[on], 1)
+        # Ships
+        (shipx, on) = batch.getShips()
+        (left, right) = self._span(shipx)
+        columns = np.arange(self._cols)
+        out[:, _SHIP, self._shiprow] = on[:, None] & \
+            (columns >= left[:, None]) & (columns < right[:, None])
+
+    # HELPER METHODS
+    def _row(self, y):
+        """
+        Returns the grid row of a vertical coordinate
+
+        Parameter y: the vertical coordinate
+        Precondition: y is an int or float
+        """
+        return min(max(int(y * self._rows / GAME_HEIGHT), 0), self._rows - 1)
+
+    def _span(self, x):
+        """
+        Returns (left, right), the grid columns covered by a ship at x
+
+        The columns are left..right-1.  This works on arrays of x as well.
+
+        Parameter x: the horizontal coordinate of the ship
+        Precondition: x is a number or a numpy float array
+        """
+        half = self._config.ship_half_width
+        scale = self._cols / GAME_WIDTH
+        left = np.clip(np.floor((x - half) * scale), 0, self._cols - 1)
+        right = np.clip(np.ceil((x + half) * scale), left + 1, self._cols)
+        if np.ndim(left) == 0:
+            return (int(left), int(right))
+        return (left.astype(int), right.astype(int))
+
+    def _grid(self, values, length, cells, out = None):
+        """
+        Returns the grid positions of coordinates along one side of the screen
+
+        The positions are clipped to the grid, so coordinates off the screen
+        are counted in the nearest cell.  If out is given, the positions are
+        written into it and it is returned.
+
+        Parameter values: the coordinates
+        Precondition: values is a numpy float array
+
+        Parameter length: the length of the side of the screen
+        Precondition: length is a number > 0
+
+        Parameter cells: the number of cells along the side
+        Precondition: cells is an int > 0
+
+        Parameter out: the array to write into
+        Precondition: out is a numpy array of the shape of values, or None
+        """
+        if out is None:
+            return np.clip((values * (cells / length)).astype(int), 0,
+                cells - 1)
+        np.multiply(values, cells / length, out=out, casting='unsafe')
+        np.clip(out, 0, cells - 1, out=out)
+        return out
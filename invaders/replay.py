@@ -0,0 +1,777 @@
+"""
+Recording and replay of Alien Invaders sessions
+
+A recording holds everything needed to play a session again exactly: the seed
+and the settings (the GameConfig) of the game, and the keys held down and the
+time step dt of every call to update.  Record a game with
+
+    python invaders --record game.inv
+
+(add --headless to record a simulated game) and play it back without a window
+with
+
+    python invaders --headless --replay game.inv
+
+Only changes are stored.  A frame where the keys and dt are the same as in the
+frame before costs nothing but a larger gap before the next change.  The frames
+are split into chunks of REPLAY_EVERY frames.  Each chunk is compressed on its
+own and starts with the full key state, so a player can start at any chunk
+without reading the ones before it.  The file ends with an index of the chunks.
+
+A recording may also hold the hash of the game state (see Invaders.getHash)
+after every frame.  Record with --hashes to add them.  Then
+
+    python invaders --verify DIRECTORY
+
+plays every recording in the directory again, on all cores, and reports the
+first frame where the game no longer matches.  Run this after any change that
+should not change the gameplay.  Each recording is played with its own
+settings, so a directory may hold sessions recorded with different ones.  A
+session that was rewound (see rewind.py) does not play again, as only the keys
+are recorded and not the rewinds.
+
+The file layout is
+
+    header:  MAGIC, VERSION, options, every, seed entropy, seed spawn key,
+             settings
+    chunks:  first frame, number of frames, size,
+             zlib(key names, hashes (if OPTION_HASHES), events)
+    index:   INDEX, number of chunks, (first frame, offset) for each chunk
+    trailer: offset of the index, MAGIC
+
+The hashes are a count followed by one 4 byte CRC-32 for each frame.  Each event
+in a chunk is the gap (in frames) since the last event, a flags byte, the key
+ids (if FLAG_KEYS) and dt as a double (if FLAG_DT).  Numbers other than dt and
+the hashes are unsigned varints.  If a game crashes before the index is
+written, the chunks are still read in order (see Replay).  The settings are
+the length and the UTF-8 text of a JSON object with every setting of the
+GameConfig (see GameConfig.getSettings).  Version 1 files have no options byte
+and no hashes, and files before version 3 have no settings; they are played
+with DEFAULT_CONFIG.
+
+Jose Vizueth jdv72
+10/18/2026
+"""
+from consts import *
+from headless import *
+import numpy as np
+import concurrent.futures
+import bisect
+import json
+import os
+import struct
+import zlib
+
+# the first bytes of every recording (also the last)
+MAGIC = b'INVR'
+# the version of the file layout
+VERSION = 3
+# the option for a recording with a hash for every frame
+OPTION_HASHES = 1
+# the first bytes of the chunk index
+INDEX = b'INDX'
+# the event flag for a change of keys
+FLAG_KEYS = 1
+# the event flag for a change of dt
+FLAG_DT = 2
+
+# the layout of a chunk header: first frame, number of frames, size
+_CHUNK = struct.Struct('<III')
+# the layout of the trailer: offset of the index, MAGIC
+_TRAILER = struct.Struct('<Q4s')
+# the layout of dt
+_DT = struct.Struct('<d')
+
+
+# VARINT HELPERS
+def _putvarint(buffer, n):
+    """
+    Appends n to buffer as an unsigned varint (7 bits per byte)
+
+    Parameter buffer: the bytes to add to
+    Precondition: buffer is a bytearray
+
+    Parameter n: the number to add
+    Precondition: n is an int >= 0
+    """
+    while n >= 0x80:
+        buffer.append((n & 0x7F) | 0x80)
+        n >>= 7
+    buffer.append(n)
+
+
+def _getvarint(data, pos):
+    """
+    Returns the pair (n, next) for the unsigned varint at position pos of data
+
+    The value next is the position just after the varint.
+
+    Parameter data: the bytes to read from
+    Precondition: data is a bytes-like object
+
+    Parameter pos: the position of the varint
+    Precondition: pos is an int >= 0
+    """
+    n = 0
+    shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        n |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return (n, pos)
+        shift += 7
+
+
+class Recorder(object):
+    """
+    A class that writes the input of a game to a recording file.
+
+    Give it to the game with Invaders.setRecorder before the game starts.  The
+    game calls begin with its seed and settings when it starts, and record at
+    the start of every update.  Call close when the game is over, or the last
+    chunk and the index are never written.
+    """
+    # HIDDEN ATTRIBUTES:
+    # Attribute _file: the file being written
+    # Invariant: _file is a binary file object, or None once closed
+    #
+    # Attribute _every: the number of frames in each chunk
+    # Invariant: _every is an int > 0
+    #
+    # Attribute _frame: the number of frames recorded so far
+    # Invariant: _frame is an int >= 0
+    #
+    # Attribute _start: the first frame of the current chunk
+    # Invariant: _start is an int, _start <= _frame <= _start+_every
+    #
+    # Attribute _last: the frame of the last event in the current chunk
+    # Invariant: _last is an int, _start <= _last <= _frame
+    #
+    # Attribute _events: the encoded events of the current chunk
+    # Invariant: _events is a bytearray
+    #
+    # Attribute _names: the ids of the key names used in the current chunk
+    # Invariant: _names is a dict from strings to ints 0..len(_names)-1
+    #
+    # Attribute _keys: the keys held down in the last frame
+    # Invariant: _keys is a frozenset of strings
+    #
+    # Attribute _dt: the time step of the last frame
+    # Invariant: _dt is a float
+    #
+    # Attribute _index: the first frame and file offset of each chunk written
+    # Invariant: _index is a list of (int, int) pairs
+    #
+    # Attribute _hashes: the state hashes of the current chunk, or None if the
+    # recording has no hashes
+    # Invariant: _hashes is a bytearray of 4 bytes per frame, or None
+
+    def getFrames(self):
+        """
+        Returns the number of frames recorded so far
+        """
+        return self._frame
+
+    def isHashing(self):
+        """
+        Returns True if the recording holds a state hash for every frame
+        """
+        return self._hashes is not None
+
+    def __init__(self, filename, every = REPLAY_EVERY, hashes = False):
+        """
+        Initializes a recorder that writes to the given file
+
+        Nothing is written until begin is called.
+
+        Parameter filename: the name of the recording file
+        Precondition: filename is a string
+
+        Parameter every: the number of frames in each chunk
+        Precondition: every is an int > 0
+
+        Parameter hashes: True to record the state hash of every frame
+        Precondition: hashes is a bool
+        """
+        self._file = open(filename, 'wb')
+        self._every = every
+        self._frame = 0
+        self._start = 0
+        self._last = 0
+        self._events = bytearray()
+        self._names = {}
+        self._keys = frozenset()
+        self._dt = 0.0
+        self._index = []
+        self._hashes = bytearray() if hashes else None
+
+    def begin(self, seeds, config = DEFAULT_CONFIG):
+        """
+        Writes the header of the recording
+
+        Parameter seeds: the seed of the game
+        Precondition: seeds is a numpy SeedSequence with an int entropy
+
+        Parameter config: the settings of every wave of the game
+        Precondition: config is a GameConfig object
+        """
+        header = bytearray(MAGIC)
+        header.append(VERSION)
+        header.append(OPTION_HASHES if self.isHashing() else 0)
+        _putvarint(header, self._every)
+        entropy = str(seeds.entropy).encode('ascii')
+        _putvarint(header, len(entropy))
+        header += entropy
+        _putvarint(header, len(seeds.spawn_key))
+        for key in seeds.spawn_key:
+            _putvarint(header, key)
+        settings = json.dumps(config.getSettings(), separators=(',', ':'))
+        settings = settings.encode('utf-8')
+        _putvarint(header, len(settings))
+        header += settings
+        self._file.write(header)
+
+    def record(self, keys, dt):
+        """
+        Records the keys held down and the time step of the next frame
+
+        Parameter keys: the keys held down
+        Precondition: keys is a sequence of strings
+
+        Parameter dt: the time in seconds of the frame
+        Precondition: dt is a number (int or float)
+        """
+        if self._frame - self._start == self._every:
+            self._flush()
+        keys = frozenset(keys)
+        if self._frame == self._start:
+            flags = FLAG_KEYS | FLAG_DT
+        else:
+            flags = (FLAG_KEYS if keys != self._keys else 0) | \
+            (FLAG_DT if dt != self._dt else 0)
+        if flags:
+            _putvarint(self._events, self._frame - self._last)
+            self._events.append(flags)
+            if flags & FLAG_KEYS:
+                self._putkeys(keys)
+            if flags & FLAG_DT:
+                self._events += _DT.pack(dt)
+            self._last = self._frame
+        self._keys = keys
+        self._dt = dt
+        self._frame += 1
+
+    def recordHash(self, value):
+        """
+        Records the state hash at the end of the last frame recorded
+
+        Parameter value: the hash of the game state
+        Precondition: value is an int in 0..2**32-1, and isHashing() is True
+        """
+        self._hashes += value.to_bytes(4, 'little')
+
+    def close(self):
+        """
+        Writes the last chunk and the index, and closes the file
+
+        It is safe to call this more than once.
+        """
+        if self._file is None:
+            return
+        self._flush()
+        offset = self._file.tell()
+        index = bytearray(INDEX)
+        _putvarint(index, len(self._index))
+        for (first, where) in self._index:
+            _putvarint(index, first)
+            _putvarint(index, where)
+        self._file.write(index)
+        self._file.write(_TRAILER.pack(offset, MAGIC))
+        self._file.close()
+        self._file = None
+
+    # HELPER METHODS
+    def _putkeys(self, keys):
+        """
+        Appends the ids of keys to the events of the current chunk
+
+        Parameter keys: the keys held down
+        Precondition: keys is a frozenset of strings
+        """
+        _putvarint(self._events, len(keys))
+        for key in sorted(keys):
+            if key not in self._names:
+                self._names[key] = len(self._names)
+            _putvarint(self._events, self._names[key])
+
+    def _flush(self):
+        """
+        Compresses and writes the current chunk, and starts a new one
+
+        Nothing is written if the chunk has no frames.
+        """
+        count = self._frame - self._start
+        if count == 0:
+            return
+        body = bytearray()
+        _putvarint(body, len(self._names))
+        for name in sorted(self._names, key=self._names.get):
+            name = name.encode('utf-8')
+            _putvarint(body, len(name))
+            body += name
+        if self._hashes is not None:
+            _putvarint(body, len(self._hashes)//4)
+            body += self._hashes
+            self._hashes = bytearray()
+        body += self._events
+        body = zlib.compress(bytes(body))
+        self._index.append((self._start, self._file.tell()))
+        self._file.write(_CHUNK.pack(self._start, count, len(body)))
+        self._file.write(body)
+        self._start = self._frame
+        self._last = self._frame
+        self._events = bytearray()
+        self._names = {}
+
+
+class Replay(object):
+    """
+    A class that reads a recording file.
+
+    The whole file is read into memory, but each chunk is only decompressed
+    when it is asked for.  If the file has no index (because the game that
+    recorded it never closed its Recorder), the chunks are found by reading
+    them in order, and the recording ends at the last complete chunk.
+    """
+    # HIDDEN ATTRIBUTES:
+    # Attribute _data: the contents of the file
+    # Invariant: _data is a bytes object
+    #
+    # Attribute _every: the number of frames in each chunk
+    # Invariant: _every is an int > 0
+    #
+    # Attribute _seed: the seed of the recorded game
+    # Invariant: _seed is a numpy SeedSequence
+    #
+    # Attribute _config: the settings of the recorded game
+    # Invariant: _config is a GameConfig object
+    #
+    # Attribute _firsts: the first frame of each chunk
+    # Invariant: _firsts is a sorted list of ints
+    #
+    # Attribute _offsets: the file offset of each chunk
+    # Invariant: _offsets is a list of ints, the same length as _firsts
+    #
+    # Attribute _frames: the number of frames in the recording
+    # Invariant: _frames is an int >= 0
+    #
+    # Attribute _options: the options of the recording
+    # Invariant: _options is an int, a combination of OPTION flags
+    #
+    # Attribute _body: the number and the decompressed body of the last chunk
+    # read, as the pair (n, body)
+    # Invariant: _body is a (int, bytes) pair, or None
+
+    def getSeed(self):
+        """
+        Returns the seed of the recorded game, as a numpy SeedSequence
+        """
+        return self._seed
+
+    def getConfig(self):
+        """
+        Returns the settings of the recorded game, as a GameConfig
+
+        Recordings made before the settings were stored (version 1 and 2)
+        return DEFAULT_CONFIG.
+        """
+        return self._config
+
+    def getFrames(self):
+        """
+        Returns the number of frames in the recording
+        """
+        return self._frames
+
+    def getEvery(self):
+        """
+        Returns the number of frames in each chunk (the spacing of the index)
+        """
+        return self._every
+
+    def getChunkCount(self):
+        """
+        Returns the number of chunks in the recording
+        """
+        return len(self._firsts)
+
+    def hasHashes(self):
+        """
+        Returns True if the recording holds a state hash for every frame
+        """
+        return bool(self._options & OPTION_HASHES)
+
+    def __init__(self, filename):
+        """
+        Initializes a replay from a recording file
+
+        Parameter filename: the name of the recording file
+        Precondition: filename is a string naming a recording
+        """
+        with open(filename, 'rb') as file:
+            self._data = file.read()
+        assert self._data[:len(MAGIC)] == MAGIC, \
+        '%s is not a recording' % repr(filename)
+        pos = len(MAGIC)
+        version = self._data[pos]
+        assert version in (1, 2, VERSION), \
+        '%s has an unknown version %d' % (repr(filename), version)
+        self._options = 0
+        if version >= 2:
+            pos += 1
+            self._options = self._data[pos]
+        (self._every, pos) = _getvarint(self._data, pos+1)
+        (size, pos) = _getvarint(self._data, pos)
+        entropy = int(self._data[pos:pos+size].decode('ascii'))
+        (size, pos) = _getvarint(self._data, pos+size)
+        spawn = []
+        for i in range(size):
+            (key, pos) = _getvarint(self._data, pos)
+            spawn.append(key)
+        self._seed = np.random.SeedSequence(entropy, spawn_key=tuple(spawn))
+        self._config = DEFAULT_CONFIG
+        if version >= 3:
+            (size, pos) = _getvarint(self._data, pos)
+            settings = json.loads(self._data[pos:pos+size].decode('utf-8'))
+            self._config = GameConfig(**settings)
+            pos += size
+        self._body = None
+        if not self._readindex():
+            self._scan(pos)
+        self._frames = 0
+        if len(self._offsets) > 0:
+            (first, count, size) = _CHUNK.unpack_from(self._data,
+            self._offsets[-1])
+            self._frames = first+count
+
+    def findChunk(self, frame):
+        """
+        Returns the number of the chunk holding frame
+
+        Parameter frame: the frame to look for
+        Precondition: frame is an int, 0 <= frame < getFrames()
+        """
+        return bisect.bisect_right(self._firsts, frame)-1
+
+    def getChunk(self, n):
+        """
+        Returns the pair (first, events) for chunk number n
+
+        The value first is the first frame of the chunk, and events is a list of
+        (frame, keys, dt) triples, one for each change.  The keys is a frozenset
+        of strings, or None if the keys did not change; dt is a float, or None
+        if dt did not change.  The first event is always at frame first, with
+        both the keys and dt.  The events end with a (frame, None, None) triple
+        just past the last frame of the chunk.
+
+        Parameter n: the chunk number
+        Precondition: n is an int, 0 <= n < getChunkCount()
+        """
+        (first, count, size) = _CHUNK.unpack_from(self._data, self._offsets[n])
+        body = self._decompress(n)
+        (size, pos) = _getvarint(body, 0)
+        names = []
+        for i in range(size):
+            (length, pos) = _getvarint(body, pos)
+            names.append(body[pos:pos+length].decode('utf-8'))
+            pos += length
+        if self.hasHashes():
+            (size, pos) = _getvarint(body, pos)
+            pos += 4*size
+        events = []
+        frame = first
+        while pos < len(body):
+            (gap, pos) = _getvarint(body, pos)
+            frame += gap
+            flags = body[pos]
+            pos += 1
+            keys = None
+            dt = None
+            if flags & FLAG_KEYS:
+                (size, pos) = _getvarint(body, pos)
+                keys = []
+                for i in range(size):
+                    (key, pos) = _getvarint(body, pos)
+                    keys.append(names[key])
+                keys = frozenset(keys)
+            if flags & FLAG_DT:
+                dt = _DT.unpack_from(body, pos)[0]
+                pos += _DT.size
+            events.append((frame, keys, dt))
+        events.append((first+count, None, None))
+        return (first, events)
+
+    def getHashes(self, n):
+        """
+        Returns the state hashes of chunk number n, one for each frame
+
+        The result is a numpy array of uint32, where entry i is the hash at
+        the end of frame getChunk(n)[0]+i.  It is empty if the recording has
+        no hashes.
+
+        Parameter n: the chunk number
+        Precondition: n is an int, 0 <= n < getChunkCount()
+        """
+        if not self.hasHashes():
+            return np.zeros(0, np.uint32)
+        body = self._decompress(n)
+        (size, pos) = _getvarint(body, 0)
+        for i in range(size):
+            (length, pos) = _getvarint(body, pos)
+            pos += length
+        (size, pos) = _getvarint(body, pos)
+        return np.frombuffer(body, '<u4', size, pos)
+
+    # HELPER METHODS
+    def _decompress(self, n):
+        """
+        Returns the decompressed body of chunk number n
+
+        The last body is kept, so reading the events and the hashes of the
+        same chunk only decompresses it once.
+
+        Parameter n: the chunk number
+        Precondition: n is an int, 0 <= n < getChunkCount()
+        """
+        if self._body is None or self._body[0] != n:
+            (first, count, size) = _CHUNK.unpack_from(self._data,
+            self._offsets[n])
+            start = self._offsets[n]+_CHUNK.size
+            self._body = (n, zlib.decompress(self._data[start:start+size]))
+        return self._body[1]
+
+    def _readindex(self):
+        """
+        Reads the chunk index at the end of the file
+
+        This method returns False (and reads nothing) if there is no index.
+        """
+        if len(self._data) < _TRAILER.size:
+            return False
+        (offset, magic) = _TRAILER.unpack_from(self._data,
+        len(self._data)-_TRAILER.size)
+        if magic != MAGIC or self._data[offset:offset+len(INDEX)] != INDEX:
+            return False
+        (size, pos) = _getvarint(self._data, offset+len(INDEX))
+        self._firsts = []
+        self._offsets = []
+        for i in range(size):
+            (first, pos) = _getvarint(self._data, pos)
+            (where, pos) = _getvarint(self._data, pos)
+            self._firsts.append(first)
+            self._offsets.append(where)
+        return True
+
+    def _scan(self, pos):
+        """
+        Finds the chunks by reading them in order, starting at pos
+
+        Scanning stops at the first chunk that is cut off.
+
+        Parameter pos: the file offset of the first chunk
+        Precondition: pos is an int >= 0
+        """
+        self._firsts = []
+        self._offsets = []
+        while pos+_CHUNK.size <= len(self._data) and \
+        self._data[pos:pos+len(INDEX)] != INDEX:
+            (first, count, size) = _CHUNK.unpack_from(self._data, pos)
+            if pos+_CHUNK.size+size > len(self._data):
+                break
+            self._firsts.append(first)
+            self._offsets.append(pos)
+            pos += _CHUNK.size+size
+
+
+class ReplayInput(ScriptInput):
+    """
+    A class that stands in for GInput, playing back a recording.
+
+    Call advance with each frame number before the matching update, and pass
+    getDt() to update as the time step.  To start somewhere other than frame 0,
+    call seek first; only the chunk holding that frame is decompressed.  Note
+    that this only moves the input.  The game itself must be at the same frame
+    for the replay to stay in step.
+    """
+    # HIDDEN ATTRIBUTES:
+    # Attribute _replay: the recording to play back
+    # Invariant: _replay is a Replay object
+    #
+    # Attribute _events: the events of the current chunk (see Replay.getChunk)
+    # Invariant: _events is a list of (frame, keys, dt) triples
+    #
+    # Attribute _chunk: the number of the current chunk
+    # Invariant: _chunk is an int >= -1 (-1 before the first chunk is read)
+    #
+    # Also the attributes _down, _dt and _next of ScriptInput (_next is the
+    # position in _events of the next change)
+
+    def __init__(self, replay):
+        """
+        Initializes an input at the start of a recording
+
+        Parameter replay: the recording to play back
+        Precondition: replay is a Replay object
+        """
+        super().__init__()
+        self._replay = replay
+        self._events = []
+        self._chunk = -1
+
+    def getFrames(self):
+        """
+        Returns the number of frames in the recording
+        """
+        return self._replay.getFrames()
+
+    def seek(self, frame):
+        """
+        Moves to the key state and time step of the given frame
+
+        Parameter frame: the frame to move to
+        Precondition: frame is an int, 0 <= frame < getFrames()
+        """
+        self._chunk = -1
+        self.advance(frame)
+
+    def advance(self, frame):
+        """
+        Applies every change in the recording up to (and including) frame
+
+        Parameter frame: the current animation frame
+        Precondition: frame is an int, 0 <= frame < getFrames(), never less
+        than in an earlier call (unless seek was called in between)
+        """
+        if self._chunk < 0 or frame >= self._events[-1][0]:
+            self._chunk = self._replay.findChunk(frame)
+            self._events = self._replay.getChunk(self._chunk)[1]
+            self._next = 0
+        last = len(self._events)-1
+        while self._next < last and self._events[self._next][0] <= frame:
+            (at, keys, dt) = self._events[self._next]
+            if keys is not None:
+                self._down = keys
+            if dt is not None:
+                self._dt = dt
+            self._next += 1
+
+
+def play(filename, frames = None):
+    """
+    Returns the statistics of a recorded game, played again without a window
+
+    The result is the same as for headless.run.  The game is played with the
+    settings of the recording.
+
+    Parameter filename: the name of the recording file
+    Precondition: filename is a string naming a recording
+
+    Parameter frames: the largest number of frames to play, or None for all
+    Precondition: frames is None or an int >= 0
+    """
+    replay = Replay(filename)
+    if frames is None or frames > replay.getFrames():
+        frames = replay.getFrames()
+    input = ReplayInput(replay)
+    app = Invaders(width=GAME_WIDTH,height=GAME_HEIGHT)
+    app.setConfig(replay.getConfig())
+    app.setSeed(replay.getSeed())
+    app.start_headless(input)
+    return simulate(app, input, frames)
+
+
+def verify(filename):
+    """
+    Returns the result of playing a recording again and checking its hashes
+
+    The game is played with the settings of the recording.
+    The result is a dictionary with the keys 'file', 'frames' (the number of
+    frames checked), 'hashed' (False if the recording has no hashes, in which
+    case nothing is checked) and 'diverged' (the first frame whose hash does
+    not match, or None if every frame matches).
+
+    Parameter filename: the name of the recording file
+    Precondition: filename is a string naming a recording
+    """
+    replay = Replay(filename)
+    result = {'file': filename, 'frames': 0, 'hashed': replay.hasHashes(),
+              'diverged': None}
+    if not replay.hasHashes():
+        return result
+    input = ReplayInput(replay)
+    app = Invaders(width=GAME_WIDTH,height=GAME_HEIGHT)
+    app.setConfig(replay.getConfig())
+    app.setSeed(replay.getSeed())
+    app.start_headless(input)
+    for n in range(replay.getChunkCount()):
+        first = replay.getChunk(n)[0]
+        hashes = replay.getHashes(n)
+        for i in range(len(hashes)):
+            input.advance(first+i)
+            app.update(input.getDt())
+            if app.getHash() != hashes[i]:
+                result['diverged'] = first+i
+                return result
+            result['frames'] += 1
+    return result
+
+
+def verify_all(directory, jobs = None):
+    """
+    Returns the results of verify for every recording in directory
+
+    The recordings are the files ending in .inv.  They are checked in parallel
+    by a pool of jobs processes, and the results are in file name order.
+    Each is played with its own settings.
+
+    Parameter directory: the directory of recordings
+    Precondition: directory is a string naming a directory
+
+    Parameter jobs: the number of processes to use
+    Precondition: jobs is an int > 0, or None for one per core
+    """
+    files = sorted(os.path.join(directory, name)
+        for name in os.listdir(directory) if name.endswith('.inv'))
+    with concurrent.futures.ProcessPoolExecutor(jobs) as pool:
+        return list(pool.map(verify, files))
+
+
+def main(args):
+    """
+    Plays or verifies recordings from the command line and prints the results
+
+    When verifying, this returns the number of recordings that did not match
+    (or had no hashes), for use as the exit status.  The settings come from
+    each recording, not from the command line.
+
+    Parameter args: the parsed command line arguments
+    Precondition: args has the attributes replay, verify, jobs and frames
+    """
+    if args.verify is None:
+        report(play(args.replay, args.frames))
+        return 0
+    failed = 0
+    results = verify_all(args.verify, args.jobs)
+    for result in results:
+        if not result['hashed']:
+            status = 'no hashes'
+        elif result['diverged'] is None:
+            status = 'ok (%d frames)' % result['frames']
+        else:
+            status = 'DIVERGED at frame %d' % result['diverged']
+        print('%s: %s' % (result['file'], status))
+        if not result['hashed'] or result['diverged'] is not None:
+            failed += 1
+    print('%d of %d recordings match' % (len(results)-failed, len(results)))
+    return failed
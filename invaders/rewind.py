@@ -0,0 +1,244 @@
+"""
+Rewind buffer for Alien Invaders
+
+This module keeps the last few seconds of a game, so that it can be played
+backwards.  Give a Rewind object to Invaders with setRewind.  The game then
+saves the wave before every update, and while REWIND_KEY is held down it steps
+back one frame per update instead of playing.  Run the game with
+
+    python invaders --rewind 10
+
+to keep the last 10 seconds.  A recording (see replay.py) holds only the keys,
+not the rewinds, so a game that was rewound while recording fails --verify and
+does not replay as it was played.
+
+The states are the packed snapshots of Wave.snapshot.  Every REWIND_EVERY frames
+the buffer stores a full state (a keyframe).  Every frame in between is stored
+as the XOR of its state with the keyframe, compressed with zlib.  Most of the
+state does not change between nearby frames, so the XOR is mostly zero bytes
+and compresses to a few dozen bytes.  Any frame is rebuilt from its keyframe
+and its own delta alone.
+
+Memory is bounded both in time and in bytes.  When the buffer holds more than
+the given number of seconds, or uses more than its budget, the oldest keyframe
+is dropped along with its deltas.  The deltas of a group are kept end to end in
+one bytearray, found through a fixed-size array of offsets, so the bytes
+counted against the budget are the bytes the buffer actually holds (including
+the Python object headers), not just the lengths of the states.
+
+Jose Vizueth jdv72
+10/18/2026
+"""
+from consts import *
+import numpy as np
+import collections
+import sys
+import zlib
+
+
+def _xor(a, b):
+    """
+    Returns the bytes a XOR b, where the shorter one is padded with zeros
+
+    Parameter a: the first bytes
+    Precondition: a is a bytes object
+
+    Parameter b: the second bytes
+    Precondition: b is a bytes object
+    """
+    if len(a) < len(b):
+        (a, b) = (b, a)
+    result = np.frombuffer(a, np.uint8).copy()
+    result[:len(b)] ^= np.frombuffer(b, np.uint8)
+    return result.tobytes()
+
+
+class Rewind(object):
+    """
+    A class representing the recent history of a game, as a bounded buffer.
+
+    The history is a sequence of groups, oldest first.  A group is a keyframe
+    and the deltas of the frames after it, all from the same wave.  A new
+    group starts every REWIND_EVERY frames, and whenever the game moves on to
+    a new wave.  Only whole groups are dropped, so the buffer may hold up to
+    one group more than its limits.
+    """
+    # HIDDEN ATTRIBUTES:
+    # Attribute _groups: the saved frames, oldest group first
+    # Invariant: _groups is a deque of lists
+    # [wave, key, data, index, count, seconds, size], where wave is the Wave
+    # the states belong to, key is the packed state of the first frame, data
+    # is a bytearray of the compressed XORs of the count frames after it, end
+    # to end, index is a numpy int array of shape (_every,2) whose first
+    # count rows are the (end in data, state length) of each delta, seconds
+    # is the time covered by the group, and size is the bytes it holds
+    #
+    # Attribute _seconds: the largest amount of time to keep
+    # Invariant: _seconds is a float > 0
+    #
+    # Attribute _every: the number of frames in each group
+    # Invariant: _every is an int > 0
+    #
+    # Attribute _budget: the most bytes to use
+    # Invariant: _budget is an int > 0
+    #
+    # Attribute _frames: the number of frames saved
+    # Invariant: _frames is an int >= 0
+    #
+    # Attribute _time: the time covered by the saved frames
+    # Invariant: _time is a float >= 0
+    #
+    # Attribute _memory: the bytes used by the saved states
+    # Invariant: _memory is an int >= 0, the sum of the sizes of _groups
+
+    # GETTERS AND SETTERS
+    def getFrames(self):
+        """
+        Returns the number of frames that can be rewound
+        """
+        return self._frames
+
+    def getSeconds(self):
+        """
+        Returns the number of seconds of play that can be rewound
+        """
+        return self._time
+
+    def getMemory(self):
+        """
+        Returns the number of bytes used by the saved states
+
+        This counts every object the buffer holds for the states (with its
+        Python header), but not the waves, which belong to the game.
+        """
+        return self._memory
+
+    def getBudget(self):
+        """
+        Returns the most bytes the buffer may use
+        """
+        return self._budget
+
+    def setBudget(self, budget):
+        """
+        Sets the most bytes the buffer may use, dropping old frames if needed
+
+        Parameter budget: the most bytes to use
+        Precondition: budget is an int > 0
+        """
+        self._budget = budget
+        self._trim()
+
+    def __init__(self, seconds = REWIND_SECONDS, budget = REWIND_BUDGET,
+    every = REWIND_EVERY):
+        """
+        Initializes an empty rewind buffer
+
+        Parameter seconds: the number of seconds of play to keep
+        Precondition: seconds is a number > 0
+
+        Parameter budget: the most bytes to use
+        Precondition: budget is an int > 0
+
+        Parameter every: the number of frames between keyframes
+        Precondition: every is an int > 0
+        """
+        self._groups = collections.deque()
+        self._seconds = seconds
+        self._budget = budget
+        self._every = every
+        self._frames = 0
+        self._time = 0
+        self._memory = 0
+
+    def push(self, wave, dt):
+        """
+        Saves the current state of wave as the newest frame
+
+        Parameter wave: the wave to save
+        Precondition: wave is a Wave object
+
+        Parameter dt: the time in seconds of the frame
+        Precondition: dt is a number >= 0
+        """
+        state = wave.snapshot(True)
+        group = self._groups[-1] if len(self._groups) > 0 else None
+        if group is None or group[0] is not wave or \
+        group[4] + 1 >= self._every:
+            group = [wave, state, bytearray(),
+                np.zeros((self._every, 2), dtype=np.int64), 0, 0, 0]
+            self._groups.append(group)
+        else:
+            group[2] += zlib.compress(_xor(state, group[1]), 1)
+            group[3][group[4]] = (len(group[2]), len(state))
+            group[4] += 1
+        self._resize(group)
+        group[5] += dt
+        self._frames += 1
+        self._time += dt
+        self._trim()
+
+    def pop(self):
+        """
+        Returns the newest frame as the pair (wave, state), removing it
+
+        The state is the packed state of the wave at that frame; give it to
+        wave.restore to go back to it.  This method returns None if the buffer
+        is empty.
+        """
+        if len(self._groups) == 0:
+            return None
+        group = self._groups[-1]
+        if group[4] > 0:
+            group[4] -= 1
+            start = group[3][group[4]-1, 0] if group[4] > 0 else 0
+            (end, length) = group[3][group[4]]
+            delta = zlib.decompress(group[2][start:end])
+            state = _xor(delta, group[1])[:length]
+            del group[2][start:]
+            self._resize(group)
+            seconds = group[5]/(group[4] + 2)
+        else:
+            self._groups.pop()
+            state = group[1]
+            self._memory -= group[6]
+            seconds = group[5]
+        group[5] -= seconds
+        self._frames -= 1
+        self._time -= seconds
+        return (group[0], state)
+
+    def clear(self):
+        """
+        Removes every saved frame
+        """
+        self._groups.clear()
+        self._frames = 0
+        self._time = 0
+        self._memory = 0
+
+    # HELPER METHODS
+    def _trim(self):
+        """
+        Drops the oldest groups until the buffer is within its limits
+
+        The newest group is never dropped.
+        """
+        while len(self._groups) > 1 and (self._memory > self._budget or
+        self._time - self._groups[0][5] >= self._seconds):
+            group = self._groups.popleft()
+            self._memory -= group[6]
+            self._frames -= 1 + group[4]
+            self._time -= group[5]
+
+    def _resize(self, group):
+        """
+        Recounts the bytes held by a group, updating _memory
+
+        Parameter group: the group to recount
+        Precondition: group is a list in _groups
+        """
+        size = sys.getsizeof(group) + sys.getsizeof(group[1]) + \
+            sys.getsizeof(group[2]) + sys.getsizeof(group[3])
+        self._memory += size - group[6]
+        group[6] = size
@@ -0,0 +1,338 @@
+"""
+Stress mode for Alien Invaders
+
+This module plays waves far larger than the command line allows (see
+config_from_args in consts.py), to find where the cost of a frame stops
+growing gently with the number of aliens and bolts.  It is meant to be run
+before and after a change to Wave, models.py or game2d, to see whether the
+change moves the curve.
+
+A stress wave is an ordinary Wave with a GameConfig made by stress_config.
+The aliens are shrunk (never grown) so that the whole formation fits on the
+screen, down to STRESS_PITCH pixels from one alien to the next.  The aliens
+step once a frame and fire once a step, and the alien bolts are slowed down so
+that they stay on screen long enough to fill the bolt pool.  The pool holds
+exactly the number of bolts asked for (and the player bolt), so it stays full
+once the first bolts have crossed the screen.
+
+Every frame is updated and then drawn into a view that is never shown, in
+retained mode as in the game (see GView.retained).  The drawing makes the same
+game2d objects and Kivy instructions as in a window, but the cost of the
+graphics card is not measured.  The time of each helper
+method of Wave that does the work of a frame (see UPDATE_PHASES and
+DRAW_PHASES) is recorded separately.  The frames before the bolt pool is full,
+and STRESS_WARMUP more, are not counted.
+
+Run it from the command line with
+
+    python invaders --stress 500,1000,2000,4000 --bolts 300 --frames 600
+
+which plays each number of aliens in turn and prints a table with one column
+per size: the sustained frames per second, the slowest frames, the time to
+make a wave, and the milliseconds per frame of every phase.
+
+Jose Vizueth jdv72
+10/18/2026
+"""
+from consts import *
+from app import *
+from wave import Wave
+from headless import ScriptInput, load_script
+from game2d.gview import GView
+import numpy as np
+import math
+import time
+
+# the number of alien bolts on screen at once if not given
+STRESS_BOLTS = 200
+# the number of frames played for each size if not given
+STRESS_FRAMES = 600
+# the number of frames played after the bolt pool is full before any count
+STRESS_WARMUP = 60
+# the smallest distance in pixels between the centers of neighboring aliens
+STRESS_PITCH = 5
+# the part of the width of the screen the formation may cover
+STRESS_WIDTH = 3/4
+# the part of the height between the ceiling and the defense line it may cover
+STRESS_HEIGHT = 2/3
+
+# the helper methods of Wave timed during an update, in the order called
+UPDATE_PHASES = ('alienmotion', 'alienshoot', 'lasergone', 'alienhit',
+    'shiphit', 'alienswonorlost', 'shipshoot', 'shipmotion')
+# the helper methods of Wave timed during a draw, in the order called
+DRAW_PHASES = ('aliendraw', 'boltdraw')
+
+
+class Phases(object):
+    """
+    A class that adds up the seconds spent in the phases of a frame.
+
+    A phase is a method of some object.  Once it is wrapped, every call of the
+    method on that object is timed; other objects of the class are not changed.
+    """
+    # HIDDEN ATTRIBUTES:
+    # Attribute _seconds: the total seconds spent in each phase
+    # Invariant: _seconds is a dictionary from strings to floats >= 0
+
+    # GETTERS
+    def getSeconds(self, name):
+        """
+        Returns the total seconds spent in the phase name (0 if never called)
+
+        Parameter name: the name of the phase
+        Precondition: name is a string
+        """
+        return self._seconds.get(name, 0.0)
+
+    # INITIALIZER
+    def __init__(self):
+        """
+        Initializes an empty record of phases
+        """
+        self._seconds = {}
+
+    def clear(self):
+        """
+        Forgets the time of every phase
+        """
+        self._seconds.clear()
+
+    def wrap(self, obj, name):
+        """
+        Times every later call of the method name of obj
+
+        Parameter obj: the object the method belongs to
+        Precondition: obj is an object whose attribute name is a method
+
+        Parameter name: the name of the method, and of the phase
+        Precondition: name is a string
+        """
+        method = getattr(obj, name)
+        seconds = self._seconds
+        def timed(*args):
+            start = time.perf_counter()
+            result = method(*args)
+            seconds[name] = seconds.get(name, 0.0) + \
+                (time.perf_counter() - start)
+            return result
+        setattr(obj, name, timed)
+
+
+def capacity(config = DEFAULT_CONFIG):
+    """
+    Returns the largest number of aliens that stress_config can fit
+
+    Parameter config: the settings the stress wave is based on
+    Precondition: config is a GameConfig object
+    """
+    (width, height) = _room(config)
+    return int(width // STRESS_PITCH) * int(height // STRESS_PITCH)
+
+
+def stress_config(aliens, bolts, config = DEFAULT_CONFIG):
+    """
+    Returns the settings of a stress wave with at least the given number of
+    aliens and bolts
+
+    The formation is as close to the shape of its room as it can be, so it may
+    have a few more aliens than asked for (to fill its last row).  The
+    settings not about the size, speed and firing of the aliens and bolts are
+    those of config.
+
+    Parameter aliens: the smallest number of aliens
+    Precondition: aliens is an int in 1..capacity(config)
+
+    Parameter bolts: the number of alien bolts on screen at once
+    Precondition: bolts is an int >= 0
+
+    Parameter config: the settings the stress wave is based on
+    Precondition: config is a GameConfig object
+    """
+    (width, height) = _room(config)
+    # The largest pitch that fits the aliens, then the squarest formation
+    pitch = config.alien_h_pitch
+    while int(width // pitch) * int(height // pitch) < aliens:
+        pitch -= 1
+    (most, tallest) = (int(width // pitch), int(height // pitch))
+    cols = min(max(round(math.sqrt(aliens * width / height)), 1), most)
+    if math.ceil(aliens / cols) > tallest:
+        cols = int(math.ceil(aliens / tallest))
+    rows = int(math.ceil(aliens / cols))
+    sep = max(pitch * config.alien_h_sep // config.alien_h_pitch, 1)
+    # The bolts are fired from the bottom of the formation
+    drop = GAME_HEIGHT - config.alien_ceiling - rows * pitch
+    speed = config.bolt_speed if bolts == 0 else drop / (2 * bolts)
+    return config.replace(alien_rows=rows, aliens_in_row=cols,
+        alien_width=pitch - sep, alien_height=pitch - sep, alien_h_sep=sep,
+        alien_v_sep=sep, alien_speed=TIMESTEP, alien_min_speed=TIMESTEP,
+        alien_max_steps=1, bolt_rate=1, bolt_speed=speed,
+        bolt_capacity=bolts + 1)
+
+
+def sizes(text):
+    """
+    Returns the numbers of aliens in a comma-separated list
+
+    This is the type of the --stress option.
+
+    Parameter text: the list to parse
+    Precondition: text is a string
+    """
+    values = tuple(int(value) for value in text.split(','))
+    most = capacity()
+    for value in values:
+        if value < 1 or value > most:
+            raise ValueError('not a number of aliens in 1..%d: %d' %
+                (most, value))
+    return values
+
+
+def run(aliens, bolts = STRESS_BOLTS, frames = STRESS_FRAMES, seed = None,
+config = DEFAULT_CONFIG):
+    """
+    Returns the statistics of stress waves with the given number of aliens
+
+    The waves are played for frames frames after a warmup that is not counted:
+    one frame per bolt, to fill the bolt pool, then STRESS_WARMUP.  A lost
+    ship is replaced at once, and a new wave is made when a wave is won or
+    lost.  The result is a dictionary with the keys 'aliens', 'bolts' (the
+    mean number of bolts on screen), 'peak' (the most bolts), 'frames',
+    'waves', 'fps', 'p99' (the seconds of the slowest frame in a hundred),
+    'setup' (the mean seconds to make a wave), 'update', 'clear', 'draw' and
+    'commit' (the mean seconds per frame of each), 'changes' (the mean number
+    of canvas changes per frame), and 'phases' (a dictionary from every name
+    in UPDATE_PHASES and DRAW_PHASES to its mean seconds per frame).
+
+    Parameter aliens: the smallest number of aliens in a wave
+    Precondition: aliens is an int in 1..capacity(config)
+
+    Parameter bolts: the number of alien bolts on screen at once
+    Precondition: bolts is an int >= 0
+
+    Parameter frames: the number of frames to count
+    Precondition: frames is an int > 0
+
+    Parameter seed: the seed for the random number generator
+    Precondition: seed is an int >= 0 or None (for a random seed)
+
+    Parameter config: the settings the stress waves are based on
+    Precondition: config is a GameConfig object
+    """
+    config = stress_config(aliens, bolts, config)
+    warmup = bolts + STRESS_WARMUP
+    total = warmup + frames
+    input = ScriptInput(load_script('sweep', total), TIMESTEP)
+    Invaders.init_headless()
+    view = GView()
+    view.retained = True
+    for (name, depth, static) in LAYERS:
+        view.addLayer(name, depth, static)
+    phases = Phases()
+    seeds = np.random.SeedSequence(seed)
+    times = np.zeros((frames, 4))
+    changes = np.zeros(frames, dtype=int)
+    counts = np.zeros(frames, dtype=int)
+    setup = []
+    wave = None
+    for frame in range(total):
+        if frame == warmup:
+            phases.clear()
+        if wave is None or wave.aliensWon() or wave.aliensLost():
+            start = time.perf_counter()
+            wave = Wave(seed=seeds.spawn(1)[0], config=config)
+            setup.append(time.perf_counter() - start)
+            view.invalidate(LAYER_SCENERY)
+            for name in UPDATE_PHASES + DRAW_PHASES:
+                phases.wrap(wave, name)
+        elif wave.getEnd():
+            wave.setnewShip()
+        input.advance(frame)
+        start = time.perf_counter()
+        wave.update(input, TIMESTEP)
+        updated = time.perf_counter()
+        view.clear()
+        cleared = time.perf_counter()
+        wave.draw(view)
+        drawn = time.perf_counter()
+        view.commit()
+        committed = time.perf_counter()
+        if frame >= warmup:
+            i = frame - warmup
+            times[i] = (updated - start, cleared - updated, drawn - cleared,
+                committed - drawn)
+            changes[i] = view.changes
+            counts[i] = len(wave.getBoltViews()[0])
+    seconds = times.sum(axis=1)
+    return {'aliens': config.alien_rows * config.aliens_in_row,
+            'bolts': counts.mean(), 'peak': int(counts.max()),
+            'frames': frames, 'waves': len(setup),
+            'fps': frames / seconds.sum(), 'p99': np.percentile(seconds, 99),
+            'setup': sum(setup) / len(setup), 'update': times[:, 0].mean(),
+            'clear': times[:, 1].mean(), 'draw': times[:, 2].mean(),
+            'commit': times[:, 3].mean(), 'changes': changes.mean(),
+            'phases': {name: phases.getSeconds(name) / frames
+                for name in UPDATE_PHASES + DRAW_PHASES}}
+
+
+def report(results):
+    """
+    Prints the statistics of stress runs as a table, one column per run
+
+    The times are in milliseconds.  The rest of an update or a draw is the time
+    not spent in any of its phases.
+
+    Parameter results: the statistics of the runs
+    Precondition: results is a list of dictionaries returned by run
+    """
+    rows = [('aliens', '%d', lambda stats: stats['aliens']),
+            ('bolts (mean)', '%.0f', lambda stats: stats['bolts']),
+            ('bolts (peak)', '%d', lambda stats: stats['peak']),
+            ('waves', '%d', lambda stats: stats['waves']),
+            ('fps', '%.1f', lambda stats: stats['fps']),
+            ('frame p99', '%.3f', lambda stats: stats['p99'] * 1000),
+            ('wave setup', '%.1f', lambda stats: stats['setup'] * 1000)]
+    for name in UPDATE_PHASES:
+        rows.append((name, '%.3f',
+            lambda stats, name=name: stats['phases'][name] * 1000))
+    rows.append(('update (rest)', '%.3f', lambda stats: (stats['update'] -
+        sum(stats['phases'][name] for name in UPDATE_PHASES)) * 1000))
+    rows.append(('view clear', '%.3f', lambda stats: stats['clear'] * 1000))
+    for name in DRAW_PHASES:
+        rows.append((name, '%.3f',
+            lambda stats, name=name: stats['phases'][name] * 1000))
+    rows.append(('draw (rest)', '%.3f', lambda stats: (stats['draw'] -
+        sum(stats['phases'][name] for name in DRAW_PHASES)) * 1000))
+    rows.append(('view commit', '%.3f', lambda stats: stats['commit'] * 1000))
+    rows.append(('canvas changes', '%.2f', lambda stats: stats['changes']))
+    for (label, form, value) in rows:
+        print('%-16s' % label +
+            ''.join('%12s' % (form % value(stats)) for stats in results))
+
+
+def main(args, config = DEFAULT_CONFIG):
+    """
+    Runs the stress mode from the command line and prints the results
+
+    Parameter args: the parsed command line arguments
+    Precondition: args has the attributes stress, bolts, frames and seed
+
+    Parameter config: the settings the stress waves are based on
+    Precondition: config is a GameConfig object
+    """
+    frames = STRESS_FRAMES if args.frames is None else args.frames
+    results = []
+    for aliens in args.stress:
+        results.append(run(aliens, args.bolts, frames, args.seed, config))
+    report(results)
+
+
+# HELPER FUNCTIONS
+def _room(config):
+    """
+    Returns (width, height), the room a stress formation may cover
+
+    Parameter config: the settings the stress wave is based on
+    Precondition: config is a GameConfig object
+    """
+    height = GAME_HEIGHT - config.alien_ceiling - config.defense_line
+    return (GAME_WIDTH * STRESS_WIDTH, height * STRESS_HEIGHT)
@@ -0,0 +1,352 @@
+"""
+Parameter sweep for Alien Invaders
+
+This module measures how the difficulty of the game depends on its constants.
+It takes a grid of values for some of the parameters in PARAMETERS, and plays
+many games for every cell of the grid (every combination of values).  The games
+are played by Batch objects (see batch.py), split into tasks of at most
+SWEEP_CHUNK games and fanned out over a pool of processes.  Run it with
+
+    python invaders --sweep results.csv --grid speed=0.25,0.5,1 \\
+        --grid rows=3,5 --games 2000 --seed 7 --jobs 8
+
+A parameter that is not in the grid keeps its value from the GameConfig of the
+sweep (the defaults in consts.py, changed by the command line).  Each cell
+gives one row of results with the columns COLUMNS:
+
+    games:    the number of games played
+    won:      the games where the player destroyed every alien
+    lost:     the games where the player lost every ship or the aliens landed
+    winrate:  won/games
+    duration: the mean seconds of game time of the games that ended (nan if
+              none did)
+    fps:      game frames simulated per second, per process
+
+A .csv file gets each row as soon as its cell is finished, so a long sweep can
+be watched (or stopped) as it runs.  A .npz file gets one array per column,
+written at the end.
+
+The tasks are independent, so the sweep scales with the number of processes.
+Each task gets its own seed, spawned from the seed of the sweep, so the results
+depend on the seed but not on the number of processes.
+
+Jose Vizueth jdv72
+10/18/2026
+"""
+from consts import *
+from headless import ScriptInput, load_script, seeds, FRAMES
+import batch
+import numpy as np
+import concurrent.futures
+import csv
+import itertools
+import sys
+
+# the parameters that can be swept, as name: (type, GameConfig setting)
+PARAMETERS = {
+    'rows':      (int, 'alien_rows'),
+    'perrow':    (int, 'aliens_in_row'),
+    'speed':     (float, 'alien_speed'),
+    'boltrate':  (int, 'bolt_rate'),
+    'boltspeed': (float, 'bolt_speed'),
+    'lives':     (int, 'ship_lives'),
+}
+# the result columns of each cell, after the parameters
+COLUMNS = ('games', 'won', 'lost', 'winrate', 'duration', 'fps')
+# the most games played by one task
+SWEEP_CHUNK = 1000
+# the number of games in each cell if not given on the command line
+GAMES = 1000
+
+
+def axis(text):
+    """
+    Returns the pair (name, values) for one axis of a grid
+
+    The text has the form NAME=VALUE,VALUE,...  where NAME is a key of
+    PARAMETERS.  This is the type of the --grid option.
+
+    Parameter text: the axis to parse
+    Precondition: text is a string
+    """
+    (name, sep, values) = text.partition('=')
+    name = name.strip()
+    if sep == '' or name not in PARAMETERS:
+        raise ValueError('not an axis: %s' % repr(text))
+    kind = PARAMETERS[name][0]
+    return (name, tuple(kind(value) for value in values.split(',')))
+
+
+def cells(grid, config = DEFAULT_CONFIG):
+    """
+    Returns the cells of a grid, as a list of dictionaries
+
+    Each cell has a value for every key of PARAMETERS, in that order.  The last
+    axis of the grid varies fastest.
+
+    Parameter grid: the values of the swept parameters
+    Precondition: grid is a sequence of (name, values) pairs returned by axis,
+    with no name repeated
+
+    Parameter config: the settings of the parameters not swept
+    Precondition: config is a GameConfig object
+    """
+    fixed = {name: kind(getattr(config, setting))
+        for (name, (kind, setting)) in PARAMETERS.items()}
+    names = [name for (name, values) in grid]
+    result = []
+    for values in itertools.product(*(values for (name, values) in grid)):
+        cell = dict(fixed)
+        cell.update(zip(names, values))
+        result.append(cell)
+    return result
+
+
+def play(cell, seed, games, frames, script = (), dt = TIMESTEP,
+config = DEFAULT_CONFIG):
+    """
+    Returns the statistics of a batch of games with the parameters of a cell
+
+    This is one task of a sweep; the result is a dictionary returned by
+    batch.simulate.  The keys that a Tally adds up are 'games', 'won', 'lost',
+    'frames', 'seconds' and 'duration'.
+
+    Parameter cell: the parameters of the games
+    Precondition: cell is a dictionary returned by cells
+
+    Parameter seed: the seed of the batch
+    Precondition: seed is a numpy SeedSequence
+
+    Parameter games: the number of games
+    Precondition: games is an int > 0
+
+    Parameter frames: the largest number of frames to play
+    Precondition: frames is an int >= 0
+
+    Parameter script: the key changes to make in every game
+    Precondition: script is a sequence of (frame, keys) pairs (see ScriptInput)
+
+    Parameter dt: the time in seconds of each frame
+    Precondition: dt is a float > 0
+
+    Parameter config: the settings of everything that is not in the cell
+    Precondition: config is a GameConfig object
+    """
+    config = config.replace(**{setting: cell[name]
+        for (name, (kind, setting)) in PARAMETERS.items()})
+    group = batch.Batch(games, seeds=seed.spawn(games), config=config, dt=dt)
+    return batch.simulate(group, ScriptInput(script, dt), frames)
+
+
+def tasks(grid, games, seed):
+    """
+    Returns the tasks of a sweep, as a list of (cell, games, seed) triples
+
+    The cell is the position of the cell in cells(grid).  The games of each
+    cell are split into tasks of at most SWEEP_CHUNK games, and each task gets
+    its own seed (a numpy SeedSequence) spawned from the seed of the sweep.
+
+    Parameter grid: the values of the swept parameters
+    Precondition: grid is a sequence of (name, values) pairs returned by axis,
+    with no name repeated
+
+    Parameter games: the number of games in each cell
+    Precondition: games is an int > 0
+
+    Parameter seed: the seed of the sweep
+    Precondition: seed is an int >= 0 or None (for a random seed)
+    """
+    chunks = range(0, games, SWEEP_CHUNK)
+    result = [(i, min(SWEEP_CHUNK, games-start))
+        for i in range(len(cells(grid))) for start in chunks]
+    streams = seeds(seed, len(result))
+    return [(i, n, stream) for ((i, n), stream) in zip(result, streams)]
+
+
+class Tally(object):
+    """
+    A class that adds up the statistics of the tasks of a sweep, cell by cell.
+    """
+    # HIDDEN ATTRIBUTES:
+    # Attribute _table: the cells of the sweep
+    # Invariant: _table is a list returned by cells
+    #
+    # Attribute _totals: the totals of each cell so far
+    # Invariant: _totals is a list of dictionaries, one per cell, with the keys
+    # 'left' (the tasks not yet added), 'games', 'won', 'lost', 'frames',
+    # 'seconds' and 'duration'
+    #
+    # Attribute _dt: the time in seconds of each frame
+    # Invariant: _dt is a float > 0
+
+    def __init__(self, table, tasks, dt = TIMESTEP):
+        """
+        Initializes a tally with nothing added
+
+        Parameter table: the cells of the sweep
+        Precondition: table is a list returned by cells
+
+        Parameter tasks: the tasks of the sweep
+        Precondition: tasks is a list returned by the function tasks
+
+        Parameter dt: the time in seconds of each frame
+        Precondition: dt is a float > 0
+        """
+        self._table = table
+        self._totals = [{'left': 0, 'games': 0, 'won': 0, 'lost': 0,
+            'frames': 0, 'seconds': 0, 'duration': 0} for cell in table]
+        self._dt = dt
+        for (i, n, seed) in tasks:
+            self._totals[i]['left'] += 1
+
+    def add(self, cell, stats):
+        """
+        Returns the result of a cell if this was its last task, or else None
+
+        The result is a dictionary with the parameters of the cell and the keys
+        of COLUMNS.
+
+        Parameter cell: the position of the cell of the task
+        Precondition: cell is an int, the cell of a task not yet added
+
+        Parameter stats: the statistics of the task
+        Precondition: stats is a dictionary returned by play
+        """
+        total = self._totals[cell]
+        for key in total:
+            if key in stats:
+                total[key] += stats[key]
+        total['left'] -= 1
+        if total['left'] > 0:
+            return None
+        ended = total['won'] + total['lost']
+        row = dict(self._table[cell])
+        row['games'] = total['games']
+        row['won'] = total['won']
+        row['lost'] = total['lost']
+        row['winrate'] = total['won']/total['games']
+        row['duration'] = total['duration']*self._dt/ended if ended > 0 \
+            else float('nan')
+        row['fps'] = total['frames']/total['seconds'] if total['seconds'] > 0 \
+            else float('inf')
+        return row
+
+
+def sweep(grid, games = GAMES, frames = FRAMES, seed = None, script = (),
+dt = TIMESTEP, jobs = None, config = DEFAULT_CONFIG):
+    """
+    Yields the results of every cell of a grid, as each cell is finished
+
+    Each result is a dictionary with the parameters of the cell and the keys of
+    COLUMNS.  The cells are not yielded in order.
+
+    Parameter grid: the values of the swept parameters
+    Precondition: grid is a sequence of (name, values) pairs returned by axis,
+    with no name repeated
+
+    Parameter games: the number of games in each cell
+    Precondition: games is an int > 0
+
+    Parameter frames: the largest number of frames to play in each game
+    Precondition: frames is an int >= 0
+
+    Parameter seed: the seed of the sweep
+    Precondition: seed is an int >= 0 or None (for a random seed)
+
+    Parameter script: the key changes to make in every game
+    Precondition: script is a sequence of (frame, keys) pairs (see ScriptInput)
+
+    Parameter dt: the time in seconds of each frame
+    Precondition: dt is a float > 0
+
+    Parameter jobs: the number of processes to use
+    Precondition: jobs is an int > 0, or None for one per core
+
+    Parameter config: the settings of the games, apart from the swept ones
+    Precondition: config is a GameConfig object
+    """
+    table = cells(grid, config)
+    work = tasks(grid, games, seed)
+    tally = Tally(table, work, dt)
+    with concurrent.futures.ProcessPoolExecutor(jobs) as pool:
+        futures = {pool.submit(play, table[i], stream, n, frames, script, dt,
+            config): i for (i, n, stream) in work}
+        for future in concurrent.futures.as_completed(futures):
+            row = tally.add(futures[future], future.result())
+            if row is not None:
+                yield row
+
+
+def write(filename, results, total):
+    """
+    Writes the results of a sweep to a file, printing each one as it comes
+
+    A .npz file is written when the results are all in.  Any other file is a
+    CSV file, with each row written as soon as it comes.
+
+    Parameter filename: the file to write
+    Precondition: filename is a string
+
+    Parameter results: the results of the sweep
+    Precondition: results is an iterable of dictionaries yielded by sweep
+
+    Parameter total: the number of cells in the sweep
+    Precondition: total is an int >= 0
+    """
+    header = list(PARAMETERS) + list(COLUMNS)
+    rows = []
+    if filename.endswith('.npz'):
+        for row in results:
+            rows.append(row)
+            _progress(row, len(rows), total)
+        np.savez(filename, **{key: np.array([row[key] for row in rows])
+            for key in header})
+    else:
+        with open(filename, 'w', newline='') as file:
+            writer = csv.DictWriter(file, header)
+            writer.writeheader()
+            for row in results:
+                writer.writerow(row)
+                file.flush()
+                rows.append(row)
+                _progress(row, len(rows), total)
+
+
+def main(args, config = DEFAULT_CONFIG):
+    """
+    Runs a sweep from the command line, writing the results to a file
+
+    The progress is printed as each cell is finished.
+
+    Parameter args: the parsed command line arguments
+    Precondition: args has the attributes sweep, grid, games, frames, seed,
+    input, dt and jobs
+
+    Parameter config: the settings of the games, apart from the swept ones
+    Precondition: config is a GameConfig object
+    """
+    grid = args.grid or []
+    frames = FRAMES if args.frames is None else args.frames
+    script = load_script(args.input, frames)
+    results = sweep(grid, args.games, frames, args.seed, script, args.dt,
+        args.jobs, config)
+    write(args.sweep, results, len(cells(grid, config)))
+
+
+def _progress(row, done, total):
+    """
+    Prints a line about a finished cell
+
+    Parameter row: the result of the cell
+    Precondition: row is a dictionary yielded by sweep
+
+    Parameter done: the number of cells finished so far
+    Precondition: done is an int > 0
+
+    Parameter total: the number of cells in the sweep
+    Precondition: total is an int >= done
+    """
+    values = ' '.join('%s=%s' % (name, row[name]) for name in PARAMETERS)
+    print('[%d/%d] %s: winrate %.3f, duration %.1fs, %.0f fps' %
+        (done, total, values, row['winrate'], row['duration'], row['fps']))
+    sys.stdout.flush()
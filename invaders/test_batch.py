@@ -0,0 +1,39 @@
+"""
+Tests for the batch simulator of Alien Invaders
+
+A Batch must play exactly like Wave.update, so these tests play games both
+ways with batch.crosscheck and check that they never differ.  Run them with
+
+    python -m pytest invaders
+
+from the folder that holds the invaders folder.
+
+Jose Vizueth jdv72
+10/18/2026
+"""
+import os
+
+# Kivy reads the command line of pytest unless this is set
+os.environ.setdefault('KIVY_NO_ARGS', '1')
+os.environ.setdefault('KIVY_NO_CONSOLELOG', '1')
+
+from consts import *
+from batch import crosscheck
+
+
+def test_crosscheck_default():
+    """
+    Tests that a Batch plays like Wave with the default settings
+    """
+    assert crosscheck(8, 3000, 0, DEFAULT_CONFIG) is None
+
+
+def test_crosscheck_full_pool():
+    """
+    Tests that a Batch plays like Wave when the alien bolts fill the BoltPool
+
+    The player bolt must not fire while bolt_capacity bolts are on screen.
+    """
+    config = DEFAULT_CONFIG.replace(bolt_capacity=4, alien_speed=0.05,
+        bolt_rate=1)
+    assert crosscheck(8, 3000, 3, config) is None
@@ -19,7 +19,16 @@ Jose Vizueth jdv72
 from game2d import *
 from consts import *
 from models import *
-import random
+import numpy as np
+import struct
+import zlib
+
+# the layout of the fixed part of a packed snapshot (see Wave.snapshot)
+_SNAPSHOT = struct.Struct('<dddIIIBdIdd?QHHH?I')
+# the layout of the ship, lives and timers, for hashing (see Wave.getHash)
+_HASHED = struct.Struct('<dIIdIIdBB')
+# the seed of the random generator used when checking chosenalien
+_CHECK_SEED = 0
 
 # PRIMARY RULE: Wave can only access attributes in models.py via getters/setters
 # Wave is NOT allowed to access anything in app.py (Subcontrollers are not
@@ -54,11 +63,26 @@ class Wave(object):
     # Attribute _ship: the player ship to control
     # Invariant: _ship is a Ship object or None
     #
-    # Attribute _aliens: the 2d list of aliens in the wave
-    # Invariant: _aliens is a rectangular 2d list containing Alien objects or None
+    # Attribute _formation: the positions and living cells of the aliens
+    # Invariant: _formation is a Formation object
+    #
+    # Attribute _batch: every alien cell, placed relative to cell (0,0) of
+    # _formation, as one sprite batch where the dead cells are hidden
+    # Invariant: _batch is a GSpriteBatch object
+    #
+    # Attribute _filled: whether _batch holds the cells of _formation
+    # Invariant: _filled is a bool, False if _batch must be filled again
+    #
+    # Attribute _sources: the image of each row of aliens
+    # Invariant: _sources is a list of (source, rows) pairs, where rows is a
+    # numpy int array of the rows of _formation with that image
+    #
+    # Attribute _places: the image of each row of aliens, and the position of
+    # the row among the rows with that image (its place in _batch)
+    # Invariant: _places is a list of (source, rank) pairs, one per row
     #
     # Attribute _bolts: the laser bolts currently on screen
-    # Invariant: _bolts is a list of Bolt objects, possibly empty
+    # Invariant: _bolts is a BoltPool object, possibly empty
     #
     # Attribute _dline: the defensive line being protected
     # Invariant : _dline is a GPath object
@@ -67,15 +91,13 @@ class Wave(object):
     # Invariant: _lives is an int >= 0
     #
     # Attribute _time: the amount of time since the last Alien "step"
-    # Invariant: _time is a float >= 0s
+    # Invariant: _time is a float >= 0s, less than the time between steps
+    # after alienmotion
     #
     # You may change any attribute above, as long as you update the invariant
     # You may also add any new attributes as long as you document them.
     # LIST MORE ATTRIBUTES (AND THEIR INVARIANTS) HERE IF NECESSARY
     #
-    #Attribute _right: the attribute that decides whether the aliens move right
-    #Invariant: _right is a bool
-    #
     #Attribute _rates: the rate in which missiles are fired from the aliens
     #Invariant: _rates is an int
     #
@@ -85,6 +107,9 @@ class Wave(object):
     #Attribute _animator: a coroutine for performing an animation
     #Invariant: _animator is a generator-based coroutine (or None)
     #
+    #Attribute _boomtime: the time in seconds sent to _animator so far
+    #Invariant: _boomtime is a float >= 0 (0 if _animator is None)
+    #
     #Attribute _shot: True if the ship has been shot, False otherwise
     #Invariant: _shot is a bool
     #
@@ -103,6 +128,22 @@ class Wave(object):
     #
     #Attribute _alienspeed: the current number of seconds between alien steps
     #Invariant: _alienspeed is a float > 0 and <= 1
+    #
+    #Attribute _shooter: the policy that picks which alien fires next
+    #Invariant: _shooter is a Shooter object
+    #
+    #Attribute _rng: the random generator for this wave (and only this wave)
+    #Invariant: _rng is a numpy Generator
+    #
+    #Attribute _config: the settings of this wave (sizes, speeds and counts)
+    #Invariant: _config is a GameConfig object
+    #
+    #Attribute _shiprect: the rectangle of the ship, as (left, bottom, right,
+    #top), when it was last asked for
+    #Invariant: _shiprect is a numpy float array of length 4
+    #
+    #Attribute _shipview: a read-only view of _shiprect
+    #Invariant: _shipview is a numpy float array backed by _shiprect
 
     #GETTERS AND SETTERS GO HERE
 
@@ -122,7 +163,7 @@ class Wave(object):
         """
         Sets the value of _ship to a new Ship object
         """
-        self._ship = Ship()
+        self._ship = Ship(self._config)
 
     def aliensLost(self):
         """
@@ -136,34 +177,216 @@ class Wave(object):
         """
         return self._alienswon
 
+    def getConfig(self):
+        """
+        Returns the settings of this wave
+        """
+        return self._config
+
     def getAlienSpeed(self):
         """
         Gets teh value of the current _alienspeed
         """
         return self._alienspeed
 
+    def getShipX(self):
+        """
+        Returns the horizontal coordinate of the ship, or None if there is none
+        """
+        return None if self._ship is None else self._ship.x
+
+    def isShipHit(self):
+        """
+        Returns True if the ship has been shot and has not been replaced yet
+        """
+        return self._shot or self._animator is not None
+
+    def getTargetX(self, x):
+        """
+        Returns the center of the non-empty column closest to x, or None
+
+        It returns None if no alien is alive.
+
+        Parameter x: the horizontal coordinate to compare to
+        Precondition: x is an int or float
+        """
+        col = self._formation.nearestColumn(x)
+        return None if col is None else self._formation.cellX(col)
+
+    def getAlienCount(self):
+        """
+        Returns the number of living aliens
+        """
+        return self._formation.getCount()
+
+    def getAlienOrigin(self):
+        """
+        Returns (x, y, right) for the aliens, where (x, y) is the center of
+        the bottom-left alien cell and right is True if they march right
+        """
+        (x, y) = self._formation.getOrigin()
+        return (x, y, self._formation.isMovingRight())
+
+    def getAliveView(self):
+        """
+        Returns a read-only view of the living aliens, of shape (alien_rows,
+        aliens_in_row)
+
+        The view shares memory with the wave, so nothing is copied.  Row 0 is
+        the bottom row.
+        """
+        return self._formation.getAliveView()
+
+    def getAlienCenters(self):
+        """
+        Returns a read-only array of the center of every alien cell
+
+        The array has shape (alien_rows,aliens_in_row,2), with an (x, y) pair
+        per cell, dead or alive.  It is owned by the wave and is only updated
+        when this is called, so call it again after every update.
+        """
+        return self._formation.getCenterView()
+
+    def getBoltViews(self):
+        """
+        Returns read-only views of the bolts, as (x, y, vy, player)
+
+        Each array has one entry per bolt on screen and shares memory with the
+        wave, so nothing is copied.  vy is the velocity, and player says
+        whether each bolt was fired by the player.  The views are only good
+        until the next update.
+        """
+        return self._bolts.getViews()
+
+    def getShipRect(self):
+        """
+        Returns a read-only array (left, bottom, right, top) of the ship, or
+        None if there is no ship
+
+        The array is owned by the wave and is only updated when this is
+        called, so call it again after every update.
+        """
+        if self._ship is None:
+            return None
+        config = self._config
+        x = self._ship.x
+        y = config.ship_y
+        self._shiprect[0] = x - config.ship_half_width
+        self._shiprect[1] = y - config.ship_half_height
+        self._shiprect[2] = x + config.ship_half_width
+        self._shiprect[3] = y + config.ship_half_height
+        return self._shipview
+
+    def copyAliens(self, alive, offset):
+        """
+        Copies the living cells and the formation offset into the given arrays
+
+        The offset is the center of the bottom-left cell; the center of cell
+        (row,col) is that plus (col*alien_h_pitch, row*alien_v_pitch) (see
+        GameConfig).
+
+        Parameter alive: the array for the living cells (row 0 is the bottom)
+        Precondition: alive is a numpy bool array of shape (alien_rows,
+        aliens_in_row)
+
+        Parameter offset: the array for the offset
+        Precondition: offset is a numpy float array of length 2
+        """
+        self._formation.copyAlive(alive)
+        offset[0] = self._formation.cellX(0)
+        offset[1] = self._formation.cellY(0)
+
+    def copyBolts(self, out):
+        """
+        Copies the bolts into the first rows of out, returning how many
+
+        Row i of out becomes (x, y, vy) of bolt i, where vy > 0 for a player
+        bolt.  The other rows are not changed.
+
+        Parameter out: the array to copy into
+        Precondition: out is a numpy float array of shape (bolt_capacity,3)
+        """
+        return self._bolts.copyBolts(out)
+
+    def reseed(self, seed):
+        """
+        Restarts the random generator of the wave from seed
+
+        Right after restoring the first snapshot of a wave, this puts the wave
+        in the same state as a new Wave with this seed, without making any new
+        images.
+
+        Parameter seed: the seed for the random generator of this wave
+        Precondition: seed is an int >= 0, a numpy SeedSequence, or None (for
+        a different wave every time)
+        """
+        self._rng = np.random.default_rng(seed)
+        self._rates = int(self._rng.integers(1, self._config.bolt_rate+1))
+
     # INITIALIZER (standard form) TO CREATE SHIP AND ALIENS
-    def __init__(self, alienspeed = ALIEN_SPEED, lives = SHIP_LIVES):
+    def __init__(self, alienspeed = None, lives = None, \
+    shooter = None, seed = None, config = DEFAULT_CONFIG):
         """
         initializes a wave of Alien Invaders
-        """
-        self._aliens = self.alienlist(ALIEN_ROWS, ALIENS_IN_ROW)
-        self._x = 0
-        self._ship = Ship()
-        self._dline = GPath(points = [0,DEFENSE_LINE,GAME_WIDTH,DEFENSE_LINE], \
+
+        Parameter alienspeed: the number of seconds between alien steps
+        Precondition: alienspeed is a float > 0 and <= 1, or None for the
+        alien_speed of config
+
+        Parameter lives: the number of lives the ship has
+        Precondition: lives is an int >= 0, or None for the ship_lives of
+        config
+
+        Parameter shooter: the policy that picks which alien fires next
+        Precondition: shooter is a Shooter object, or None for a uniform choice
+
+        Parameter seed: the seed for the random generator of this wave
+        Precondition: seed is an int >= 0, a numpy SeedSequence, or None (for
+        a different wave every time)
+
+        Parameter config: the settings of this wave
+        Precondition: config is a GameConfig object
+        """
+        if alienspeed is None:
+            alienspeed = config.alien_speed
+        if lives is None:
+            lives = config.ship_lives
+        self._config = config
+        self._rng = np.random.default_rng(seed)
+        self._formation = Formation(config.alien_rows, config.aliens_in_row,
+            config)
+        images = self.alienimages(config.alien_rows)
+        self._batch = GSpriteBatch()
+        self._filled = False
+        self._sources = []
+        self._places = [None] * config.alien_rows
+        for source in ALIEN_IMAGES:
+            rows = [r for r in range(config.alien_rows)
+                if images[r] == source]
+            if len(rows) > 0:
+                self._sources.append((source, np.array(rows)))
+            for (rank, row) in enumerate(rows):
+                self._places[row] = (source, rank)
+        self._ship = Ship(config)
+        line = config.defense_line
+        self._dline = GPath(points = [0,line,GAME_WIDTH,line], \
         linewidth = 1, linecolor = 'black')
         self._time = 0
-        self._right = True
-        self._bolts = []
-        self._rates = random.randrange(1, BOLT_RATE+1)
+        self._bolts = BoltPool(config)
+        self._rates = int(self._rng.integers(1, config.bolt_rate+1))
         self._stepstaken = 0
         self._animator = None
+        self._boomtime = 0
         self._shot = False
         self._end = False
         self._lives = lives
         self._alienslost = False
         self._alienswon = False
         self._alienspeed = alienspeed
+        self._shooter = UniformShooter() if shooter is None else shooter
+        self._shiprect = np.zeros(4)
+        self._shipview = self._shiprect.view()
+        self._shipview.flags.writeable = False
 
     # UPDATE METHOD TO MOVE THE SHIP, ALIENS, AND LASER BOLTS
     def update(self, input, dt):
@@ -185,6 +408,7 @@ class Wave(object):
         self.shipshoot(input)
         if not self._animator is None:
             try:
+                self._boomtime += dt
                 self._animator.send(dt)
             except:
                 self._animator = None
@@ -194,49 +418,163 @@ class Wave(object):
                 self._end = True
         elif self._shot:
             self._animator = self._ship.animateExplosion()
+            self._boomtime = 0
             next(self._animator)
         else:
             self._end = False
             self.shipmotion(input)
 
     # DRAW METHOD TO DRAW THE SHIP, ALIENS, DEFENSIVE LINE AND BOLTS
-    def draw(self, view):
+    def draw(self, view, alpha = 1):
         """
         Initializes the drawing procedure for the wave
 
+        The defense line is drawn in the static LAYER_SCENERY layer, so it is
+        only added to the view once per wave (see Invaders.draw).
+
         Parameter view: the window in which it will be drawed upon
-        Precondition: view is a valid GView object
+        Precondition: view is a valid GView object with the layers in LAYERS
+
+        Parameter alpha: how far the frame is between the last two updates
+        Precondition: alpha is a number in 0..1 (see GameApp.alpha)
         """
-        for row in self._aliens:
-            for alien in row:
-                if alien != None:
-                    alien.draw(view)
+        self.aliendraw(view)
         if self._ship != None:
             self._ship.draw(view)
-        self._dline.draw(view)
-        for bolt in self._bolts:
-            if bolt != None:
-                bolt.draw(view)
+        self._dline.draw(view, LAYER_SCENERY)
+        self.boltdraw(view, alpha)
+
+    def getHash(self):
+        """
+        Returns a CRC-32 of the state of the wave
+
+        The hash covers the formation (its offset and living cells), the bolt
+        arrays, the ship position, the lives and the timers.  Two waves with
+        the same hash are, in practice, in the same state.  This is cheap
+        enough to call every frame, as the formation part is only recomputed
+        when the formation changes.
+        """
+        ship = self._ship
+        crc = self._bolts.getHash(self._formation.getHash())
+        return zlib.crc32(_HASHED.pack(-1 if ship is None else ship.x,
+            0 if ship is None else ship.frame, self._lives, self._time,
+            self._rates, self._stepstaken, self._boomtime, self._shot,
+            self._animator is not None), crc)
+
+    # SNAPSHOT METHODS TO SAVE AND RESTORE THE WAVE
+    def snapshot(self, compact = False):
+        """
+        Returns the state of the wave, to give to restore
+
+        The state covers the formation, the bolts, the ship, the explosion,
+        the timers and the random generator.  The images are not copied, so a
+        snapshot is cheap.  By default the state is a tuple that shares
+        nothing with the wave.  If compact is True, it is packed into bytes
+        instead, which is smaller and can be saved to a file, but slower.
+
+        The shooter policy is not saved, as policies have no state.
+
+        Parameter compact: True to return the state as bytes
+        Precondition: compact is a bool
+        """
+        ship = self._ship
+        state = (self._formation.snapshot(), self._bolts.snapshot(),
+            None if ship is None else ship.x, 0 if ship is None else ship.frame,
+            self._animator is not None, self._boomtime, self._time,
+            self._rates, self._stepstaken, self._shot, self._end, self._lives,
+            self._alienslost, self._alienswon, self._alienspeed,
+            self._rng.bit_generator.state)
+        return self._pack(state) if compact else state
+
+    def restore(self, state):
+        """
+        Returns the wave to a state saved by snapshot
+
+        Nothing is rebuilt but the formation aggregates.  Aliens killed since
+        the snapshot come back to life, and a ship is only made if the wave
+        has lost its ship since the snapshot.
+
+        Parameter state: the state to return to
+        Precondition: state is a tuple or bytes returned by snapshot on a wave
+        of the same size
+        """
+        if isinstance(state, bytes):
+            state = self._unpack(state)
+        (formation, bolts, shipx, frame, animating, self._boomtime, self._time,
+            self._rates, self._stepstaken, self._shot, self._end, self._lives,
+            self._alienslost, self._alienswon, self._alienspeed, rng) = state
+        self._formation.restore(formation)
+        self._filled = False
+        self._bolts.restore(bolts)
+        self._rng.bit_generator.state = rng
+        if shipx is None:
+            self._ship = None
+        else:
+            if self._ship is None:
+                self._ship = Ship(self._config)
+            self._ship.x = shipx
+            self._ship.frame = frame
+        self._animator = None
+        if animating:
+            self._animator = self._ship.animateExplosion(self._boomtime)
+            next(self._animator)
+
+    # METHOD TO CHECK THE INVARIANTS (see fuzz.py)
+    def checkInvariants(self):
+        """
+        Returns a description of every broken invariant of the wave
+
+        The list is empty if the wave is consistent.  Each description starts
+        with the part of the wave that is broken ('formation', 'bolts',
+        'ship', 'lives' or 'chosenalien') and a colon.  This checks that the
+        formation aggregates follow from the living cells, that the bolts are
+        in the window, that there is at most one player bolt, that the ship is
+        on the screen, and that chosenalien returns a living front cell
+        (None only if there are no aliens).  chosenalien draws from a fresh
+        generator seeded with _CHECK_SEED, so checking does not change the
+        game and the result depends only on the wave.
+        """
+        config = self._config
+        problems = ['formation: ' + name for name in self._formation.check()]
+        problems.extend('bolts: ' + text for text in self._bolts.check())
+        if self._bolts.getPlayerCount() > 1:
+            problems.append('bolts: %d player bolts' %
+                self._bolts.getPlayerCount())
+        if self._ship is not None and not (config.ship_half_width <=
+        self._ship.x <= GAME_WIDTH - config.ship_half_width):
+            problems.append('ship: at x=%g' % self._ship.x)
+        if self._lives < 0:
+            problems.append('lives: %d' % self._lives)
+        rng = self._rng
+        self._rng = np.random.default_rng(_CHECK_SEED)
+        try:
+            cell = self.chosenalien()
+        finally:
+            self._rng = rng
+        if cell is None:
+            if self._formation.getCount() > 0:
+                problems.append('chosenalien: None with %d aliens' %
+                    self._formation.getCount())
+        elif not (type(cell) == tuple and len(cell) == 2 and
+        0 <= cell[1] < config.aliens_in_row):
+            problems.append('chosenalien: returned %s' % repr(cell))
+        elif self._formation.getFront(cell[1]) != cell[0]:
+            problems.append('chosenalien: (%d,%d) is not a front alien' %
+                cell)
+        return problems
 
     # HELPER METHODS FOR COLLISION DETECTION
     def alienhit(self):
         """
-        Deletes laser if it hits an alien and sets hit laser to None
-        """
-        i = 0
-        while i < len(self._aliens):
-            p = 0
-            while p < len(self._aliens[i]):
-                j = 0
-                while j < len(self._bolts):
-                    if self._aliens[i][p] != None and \
-                    self._aliens[i][p].collides(self._bolts[j]):
-                        self._aliens[i][p] = None
-                        del self._bolts[j]
-                    else:
-                        j += 1
-                p += 1
-            i += 1
+        Deletes laser if it hits an alien and kills that alien
+
+        Each player bolt is mapped to the one cell it could be touching, so
+        this does not depend on the number of aliens.  A dead alien is hidden
+        in the sprite batch without touching the other aliens.
+        """
+        for (row, col) in self._bolts.strike(self._formation):
+            if self._filled:
+                self.alienhide(row, col)
 
     def shiphit(self):
         """
@@ -244,42 +582,26 @@ class Wave(object):
         removes the bolt from the list and sets _shot to True
         """
         if self._ship != None:
-            j = 0
-            while j < len(self._bolts):
-                if self._ship.collides(self._bolts[j]):
-                    del self._bolts[j]
-                    self._shot = True
-                else:
-                    j += 1
+            if self._bolts.collide(self._ship, False) > 0:
+                self._shot = True
 
-    # HELPER METHOD FOR MAKING A 2D LIST WITH ALIENS
-    def alienlist(self, rows, inrows):
+    # HELPER METHOD FOR PICKING THE IMAGE OF EACH ROW OF ALIENS
+    def alienimages(self, rows):
         """
-        creates a 2d list of aliens
+        returns a list with the image source of each row of aliens
 
-        Parameter alienimage: the alien object used in the list
-        Precondition: alienimage is a valid Alien object
+        The rows take the images in ALIEN_IMAGES two rows at a time, with one
+        row of the last image, and then start again.  The aliens themselves
+        are only cells of _formation, so no object is made per alien.
 
-        Parameter rows: the amount of rows in the list
-        Precondition: rows is an int > 1 and < 10
-
-        Parameter inrows: the amount of aliens in each row
-        Precondition: inrows is an int > 0
+        Parameter rows: the amount of rows of aliens
+        Precondition: rows is an int > 0
         """
-        biglist = []
+        images = []
         alienimage = 0
         sourceimg = ALIEN_IMAGES[0]
-        ypos = GAME_HEIGHT - ALIEN_CEILING - (ALIEN_HEIGHT/2) - \
-        ((rows-1) * (ALIEN_HEIGHT + ALIEN_V_SEP))
-        for n in range(rows):
-            xpos = ALIEN_H_SEP + (ALIEN_WIDTH/2)
-            smalllist = []
-            for n in range(inrows):
-                xpos = xpos + (ALIEN_WIDTH) + ALIEN_H_SEP
-                smalllist.append(Alien(x = xpos, y =  ypos, width = ALIEN_WIDTH,\
-                height = ALIEN_HEIGHT, source = sourceimg))
-            biglist.append(smalllist)
-            ypos = ypos + (ALIEN_HEIGHT + ALIEN_V_SEP)
+        for r in range(rows):
+            images.append(sourceimg)
             if alienimage >= len(ALIEN_IMAGES) - 1:
                 alienimage = 0
             else:
@@ -290,7 +612,7 @@ class Wave(object):
                 sourceimg = ALIEN_IMAGES[1]
             elif alienimage in (2.0, 2.5):
                 sourceimg = ALIEN_IMAGES[2]
-        return biglist
+        return images
 
     #HELPER METHOD FOR THE MOTION OF THE SHIP
     def shipmotion(self, input):
@@ -301,13 +623,15 @@ class Wave(object):
         Precondition: input is a valid GInput object
         """
         if self._ship != None:
+            config = self._config
             da = 0
             if input.is_key_down('left'):
-                da -= SHIP_MOVEMENT
-                self._ship.x = max(self._ship.x + da, SHIP_WIDTH/2)
+                da -= config.ship_movement
+                self._ship.x = max(self._ship.x + da, config.ship_half_width)
             if input.is_key_down('right'):
-                da += SHIP_MOVEMENT
-                self._ship.x = min(self._ship.x + da, GAME_WIDTH - SHIP_WIDTH/2)
+                da += config.ship_movement
+                self._ship.x = min(self._ship.x + da,
+                    GAME_WIDTH - config.ship_half_width)
 
     #HELPER METHOD TO DECIDE WHETHER THE SHIP CAN SHOOT
     def shipshoot(self, input):
@@ -317,14 +641,9 @@ class Wave(object):
         Parameter input: which button the player presses
         Precondition: input is a valid GInput object
         """
-        shoot = True
-        for bolt in self._bolts:
-            bolt.movingbolt()
-            if bolt.isPlayerBolt():
-                shoot = False
-        if shoot:
+        self._bolts.move()
+        if self._bolts.getPlayerCount() == 0:
             self.PlayerBolt(input)
-            shoot = False
 
     #HELPER METHOD THAT ALLOWS SHIP TO SHOOT
     def PlayerBolt(self, input):
@@ -336,56 +655,49 @@ class Wave(object):
         """
         if self._ship != None:
             if input.is_key_down('up') or input.is_key_down('spacebar'):
-                self._bolts.append(Bolt(self._ship.x, (self._ship.y + \
-                (ALIEN_HEIGHT/2) + (BOLT_HEIGHT/2)), BOLT_SPEED, True))
+                config = self._config
+                self._bolts.add(self._ship.x, (self._ship.y + \
+                config.alien_half_height + config.bolt_half_height),
+                config.bolt_speed, True)
 
     #HELPER METHOD FOR THE MOTION OF THE ALIENS
     def alienmotion(self, dt):
         """
         The helper method for moving the aliens
 
+        Every full alien step that has passed is taken (up to alien_max_steps),
+        and the time left over is kept for the next update.  Hence the aliens
+        march at the same speed no matter how often this method is called.
+
         Parameter dt: The time in seconds since last update
         Precondition: dt is a number (int or float)
         """
-        mostright = 0
-        mostleft = GAME_WIDTH
-        if self._time >= self._alienspeed:
-            for row in self._aliens:
-                for alien in row:
-                    if alien != None:
-                        if self._right:
-                            alien.x += ALIEN_H_WALK
-                            mostright = max(mostright, (alien.x + \
-                            (ALIEN_WIDTH/2)))
-                        else:
-                            alien.x -= ALIEN_H_WALK
-                            mostleft = min(mostleft, (alien.x - (ALIEN_WIDTH/2)))
-            if mostright > (GAME_WIDTH - ALIEN_H_SEP) or mostleft < ALIEN_H_SEP:
-                for row in self._aliens:
-                    for alien in row:
-                        if alien != None:
-                            if self._right:
-                                alien.x -= ALIEN_H_WALK
-                            else:
-                                alien.x += ALIEN_H_WALK
-                            alien.y -= ALIEN_V_SEP
-                self._right = not self._right
-            self._time = 0
+        interval = max(self._alienspeed, self._config.alien_min_speed)
+        self._time += dt
+        steps = 0
+        most = self._config.alien_max_steps
+        while self._time >= interval and steps < most:
+            self._formation.march()
+            self._time -= interval
             self._stepstaken +=1
-        else:
-            self._time += dt
+            steps += 1
+        if self._time >= interval:
+            self._time %= interval
 
     #HELPER METHOD THAT ADDS BOLTS FROM ALIENS
-    def EnemyBolt(self, alien):
+    def EnemyBolt(self, cell):
         """
         The helper method that appends bolts from aliens into _bolts
 
-        Parameter alien: which alien is doing the shooting
-        Precondition: input is a valid Alien object
+        Parameter cell: the (row, col) cell of the alien doing the shooting
+        Precondition: cell is a cell of a living alien in _formation, or None
         """
-        if alien != None:
-            self._bolts.append(Bolt(alien.x, alien.y - (ALIEN_HEIGHT/2) - \
-            (BOLT_HEIGHT/2), - BOLT_SPEED, False))
+        if cell != None:
+            x = self._formation.cellX(cell[1])
+            y = self._formation.cellY(cell[0])
+            config = self._config
+            self._bolts.add(x, y - config.alien_half_height - \
+            config.bolt_half_height, - config.bolt_speed, False)
 
 
     #HELPER METHOD TO DECIDE WHETHER IT IS TIME FOR THE ALIENS TO SHOOT OR NOT
@@ -393,60 +705,166 @@ class Wave(object):
         """
         decides if its time for the aliens to shoot
         """
-        if self._stepstaken == self._rates:
+        if self._stepstaken >= self._rates:
             self.EnemyBolt(self.chosenalien())
             self._stepstaken = 0
-            self._rates = random.randrange(1, BOLT_RATE+1)
+            self._rates = int(self._rng.integers(1, self._config.bolt_rate+1))
 
     #HELPER METHOD THAT CHOOSES THE SHOOTING ALIEN
     def chosenalien(self):
         """
         decides which alien will be the one shooting
+
+        The shooter policy picks a column and the formation keeps track of the
+        bottom alien in every column, so this never scans the grid.  It returns
+        the (row, col) cell of the shooting alien, or None if there are no
+        aliens left.
         """
-        bigvlist = []
-        i = 0
-        while i < ALIENS_IN_ROW:
-            column = []
-            for row in self._aliens:
-                if row[i] != None:
-                    column.append(row[i])
-            i += 1
-            bigvlist.append(column)
-        lowestaliens = []
-        for column in bigvlist:
-            if len(column) >= 1:
-                bottomalien = column[0]
-                for alien in column:
-                    if alien.y < bottomalien.y:
-                        bottomalien = alien.y
-                lowestaliens.append(bottomalien)
-            else:
-                del bigvlist[bigvlist.index(column)]
-        randomalien = lowestaliens[random.randrange(0, len(lowestaliens))]
-        return randomalien
+        shipx = None if self._ship is None else self._ship.x
+        col = self._shooter.choose(self._formation, shipx, self._rng)
+        if col is None:
+            return None
+        return (self._formation.getFront(col), col)
 
     #HELPER METHOD THAT DELETES ANY LASERS OUTSIDE THE WINDOW
     def lasergone(self):
         """
         deletes a laser once it makes it outside the window of the game
         """
-        i = 0
-        while i < len(self._bolts):
-            if self._bolts[i].y > GAME_HEIGHT or (self._bolts[i].y + \
-            (BOLT_HEIGHT/2)) < 0:
-                del self._bolts[i]
-            else:
-                i += 1
+        self._bolts.cull()
 
     def alienswonorlost(self):
         """
         sets _alienswon and _alienslost depending on whether aliens have won or
         lost
         """
-        self._alienslost = True
-        for row in self._aliens:
-            for alien in row:
-                if alien != None:
-                    self._alienslost = False
-                    if (alien.y - (ALIEN_HEIGHT/2)) <= DEFENSE_LINE:
-                        self._alienswon = True
+        self._alienslost = self._formation.getCount() == 0
+        if self._formation.getBottom() <= self._config.defense_line:
+            self._alienswon = True
+
+    #HELPER METHODS THAT DRAW THE ALIENS AND THE BOLTS
+    def aliendraw(self, view):
+        """
+        Draws every living alien as one sprite batch
+
+        The batch has one Mesh per alien image, no matter how many aliens
+        there are.  Its aliens sit at fixed offsets from cell (0,0), so a march
+        only moves the batch itself, and nothing is sent to the meshes again.
+
+        Parameter view: the window in which it will be drawed upon
+        Precondition: view is a valid GView object
+        """
+        if not self._filled:
+            self.alienfill()
+        (x, y) = self._formation.getOrigin()
+        self._batch.x = float(x)
+        self._batch.y = float(y)
+        self._batch.draw(view)
+
+    def alienfill(self):
+        """
+        Fills the sprite batch with every alien cell, hiding the dead ones
+
+        The cells are added row by row for each image in _sources, so the
+        quad of cell (row,col) is number rank*cols+col of its image, where
+        (source,rank) is _places[row].
+        """
+        config = self._config
+        cols = self._formation.getCols()
+        offsets = np.arange(cols) * config.alien_h_pitch
+        self._batch.clear()
+        for (source, rows) in self._sources:
+            self._batch.extend(np.tile(offsets, len(rows)),
+                np.repeat(rows * config.alien_v_pitch, cols),
+                config.alien_width, config.alien_height, source=source)
+        self._filled = True
+        for (row, col) in np.argwhere(~self._formation.getAliveView()):
+            self.alienhide(row, col)
+
+    def alienhide(self, row, col):
+        """
+        Hides the alien in cell (row,col) in the sprite batch
+
+        Parameter row: the row of the cell
+        Precondition: row is an int in 0..alien_rows-1
+
+        Parameter col: the column of the cell
+        Precondition: col is an int in 0..aliens_in_row-1
+        """
+        (source, rank) = self._places[row]
+        self._batch.hide(int(rank * self._formation.getCols() + col), source)
+
+    def boltdraw(self, view, alpha):
+        """
+        Draws every bolt in play
+
+        Parameter view: the window in which it will be drawed upon
+        Precondition: view is a valid GView object
+
+        Parameter alpha: how far the frame is between the last two updates
+        Precondition: alpha is a number in 0..1 (see GameApp.alpha)
+        """
+        self._bolts.draw(view, alpha)
+
+    #HELPER METHODS TO PACK A SNAPSHOT INTO BYTES
+    def _pack(self, state):
+        """
+        Returns a snapshot state packed into bytes
+
+        The bytes are the fixed fields (in the layout _SNAPSHOT), then the
+        generator state, the living cells (one bit each), and then the bolt
+        arrays.
+
+        Parameter state: the state to pack
+        Precondition: state is a tuple returned by snapshot
+        """
+        (formation, bolts, shipx, frame, animating, boomtime, time, rates,
+            stepstaken, shot, end, lives, alienslost, alienswon, alienspeed,
+            rng) = state
+        (fx, fy, right, alive, version) = formation
+        (x, y, vy, player) = bolts
+        assert rng['bit_generator'] == 'PCG64', 'cannot pack %s' % \
+        repr(rng['bit_generator'])
+        flags = (shot << 0) | (end << 1) | (alienslost << 2) | \
+        (alienswon << 3) | (animating << 4) | ((shipx is not None) << 5)
+        data = bytearray(_SNAPSHOT.pack(alienspeed, time, boomtime, rates,
+            stepstaken, lives, flags, 0 if shipx is None else shipx, frame,
+            fx, fy, right, version, alive.shape[0], alive.shape[1], len(x),
+            bool(rng['has_uint32']), rng['uinteger']))
+        data += rng['state']['state'].to_bytes(16, 'little')
+        data += rng['state']['inc'].to_bytes(16, 'little')
+        data += np.packbits(alive).tobytes()
+        data += x.tobytes() + y.tobytes() + vy.tobytes()
+        data += np.packbits(player).tobytes()
+        return bytes(data)
+
+    def _unpack(self, data):
+        """
+        Returns the snapshot state packed into data by _pack
+
+        Parameter data: the packed state
+        Precondition: data is a bytes object returned by _pack
+        """
+        (alienspeed, time, boomtime, rates, stepstaken, lives, flags, shipx,
+            frame, fx, fy, right, version, rows, cols, n, hasuint,
+            uinteger) = _SNAPSHOT.unpack_from(data)
+        pos = _SNAPSHOT.size
+        rng = {'bit_generator': 'PCG64', 'has_uint32': int(hasuint),
+            'uinteger': uinteger, 'state': {
+            'state': int.from_bytes(data[pos:pos+16], 'little'),
+            'inc': int.from_bytes(data[pos+16:pos+32], 'little')}}
+        pos += 32
+        size = (rows*cols + 7)//8
+        alive = np.unpackbits(np.frombuffer(data, np.uint8, size, pos),
+            count=rows*cols).astype(bool).reshape(rows, cols)
+        pos += size
+        arrays = []
+        for i in range(3):
+            arrays.append(np.frombuffer(data, np.float64, n, pos).copy())
+            pos += 8*n
+        player = np.unpackbits(np.frombuffer(data, np.uint8, (n + 7)//8, pos),
+            count=n).astype(bool)
+        return ((fx, fy, right, alive, version), tuple(arrays) + (player,),
+            shipx if flags & 32 else None, frame, bool(flags & 16), boomtime,
+            time, rates, stepstaken, bool(flags & 1), bool(flags & 2), lives,
+            bool(flags & 4), bool(flags & 8), alienspeed, rng)